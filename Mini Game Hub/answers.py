@@ -0,0 +1,127 @@
+import string
+import unicodedata
+from collections.abc import Iterable, Sequence
+
+
+# A stored answer can list several accepted answers: "7|seven".
+ALTERNATIVES = "|"
+# Punctuation becomes a space, so "New-York" and "new york" match.
+PUNCTUATION = str.maketrans({char: " " for char in string.punctuation + "“”‘’–—"})
+# Words dropped from the front of an answer: "The Nile" = "Nile".
+ARTICLES = {"the", "a", "an"}
+NUMBER_WORDS = {
+    word: value
+    for value, word in enumerate(
+        "zero one two three four five six seven eight nine ten eleven twelve"
+        " thirteen fourteen fifteen sixteen seventeen eighteen nineteen".split()
+    )
+}
+TENS_WORDS = {
+    word: value * 10
+    for value, word in enumerate(
+        "twenty thirty forty fifty sixty seventy eighty ninety".split(), 2
+    )
+}
+TENS_VALUES = {str(value) for value in TENS_WORDS.values()}
+
+
+def normalize(text: str) -> str:
+    # Lower-case words without accents, punctuation, leading articles or
+    # extra spaces, with number words written as digits:
+    # "  The Forty-Two! " -> "42", "Équateur" -> "equateur".
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    words = text.casefold().translate(PUNCTUATION).split()
+    if len(words) > 1 and words[0] in ARTICLES:
+        del words[0]
+    result: list[str] = []
+    for word in words:
+        if word in TENS_WORDS:
+            result.append(str(TENS_WORDS[word]))
+        elif word in NUMBER_WORDS:
+            value = NUMBER_WORDS[word]
+            # "twenty one" -> "21"
+            if 0 < value < 10 and result and result[-1] in TENS_VALUES:
+                result[-1] = str(int(result[-1]) + value)
+            else:
+                result.append(str(value))
+        else:
+            result.append(word)
+    return " ".join(result)
+
+
+def allowed_typos(answer: str) -> int:
+    # Edits accepted for a normalized answer. Numbers and short words must
+    # be exact ("7" is not "8", "cat" is not "car").
+    if any(char.isdigit() for char in answer) or len(answer) < 4:
+        return 0
+    return 1 if len(answer) < 8 else 2
+
+
+def within_distance(a: str, b: str, limit: int) -> bool:
+    # True if a can be turned into b with at most `limit` single-character
+    # inserts, deletes or changes. Only cells within `limit` of the
+    # diagonal are filled, and it gives up as soon as a whole row is over
+    # the limit, so the work is about len(a) * (2 * limit + 1) steps.
+    if abs(len(a) - len(b)) > limit:
+        return False
+    if a == b:
+        return True
+    if limit == 0:
+        return False
+    over = limit + 1
+    previous = [column if column <= limit else over for column in range(len(b) + 1)]
+    for row in range(1, len(a) + 1):
+        current = [over] * (len(b) + 1)
+        if row <= limit:
+            current[0] = row
+        first = max(1, row - limit)
+        last = min(len(b), row + limit)
+        char = a[row - 1]
+        for column in range(first, last + 1):
+            cell = min(
+                previous[column - 1] + (char != b[column - 1]),
+                previous[column] + 1,
+                current[column - 1] + 1,
+            )
+            current[column] = min(cell, over)
+        if min(current[first - 1:last + 1]) > limit:
+            return False
+        previous = current
+    return previous[-1] <= limit
+
+
+# The accepted answers to one question, normalized once when the question is
+# loaded. Responses are normalized once and then compared with a set lookup,
+# falling back to a bounded edit-distance check for small typos.
+class AnswerKey:
+    def __init__(self, answer: str) -> None:
+        self.accepted = {
+            normalize(option) for option in answer.split(ALTERNATIVES) if option.strip()
+        }
+        self._typos = [(option, allowed_typos(option)) for option in self.accepted]
+
+    def matches(self, response: str) -> bool:
+        response = normalize(response)
+        if response in self.accepted:
+            return True
+        return any(
+            limit and within_distance(response, option, limit)
+            for option, limit in self._typos
+        )
+
+
+def grade_sheets(keys: Sequence[AnswerKey], sheets: Iterable[Sequence[str]]) -> list[int]:
+    # Score for each answer sheet (one response per key, in order). The same
+    # response to the same question is only normalized and checked once.
+    verdicts: list[dict[str, bool]] = [{} for _ in keys]
+    scores = []
+    for sheet in sheets:
+        score = 0
+        for key, seen, response in zip(keys, verdicts, sheet):
+            verdict = seen.get(response)
+            if verdict is None:
+                verdict = seen[response] = key.matches(response)
+            score += verdict
+        scores.append(score)
+    return scores
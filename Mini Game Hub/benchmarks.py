@@ -0,0 +1,368 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+import tkinter as tk
+import tracemalloc
+from tkinter import ttk
+
+from answers import AnswerKey, grade_sheets
+from games import DiceRollGame, QuizGame
+from leaderboard import Leaderboard
+from main import GameHubApp
+from montecarlo import exact_sum_distribution, simulate
+from question_bank import QuestionBank, write_bank
+from replay import record_games, replay
+from server import GAMES, GameServer
+from simulator import STRATEGIES, attempt_summary, run_simulation
+
+
+def _timed(action) -> float:
+    # Run an action and return how long it took in milliseconds.
+    start = time.perf_counter()
+    action()
+    return (time.perf_counter() - start) * 1000
+
+
+def _widget_count(widget: tk.Misc) -> int:
+    # Number of widgets under (and including) a widget.
+    return 1 + sum(_widget_count(child) for child in widget.winfo_children())
+
+
+def bench_switch(switches: int) -> None:
+    # Time switching between game screens and check no widgets pile up.
+    try:
+        root = tk.Tk()
+    except tk.TclError as exc:
+        print(f"needs a display: {exc}")
+        return
+    app = GameHubApp(root)
+    shows = (app._show_guess_game, app._show_dice_game, app._show_quiz_game)
+    # Show every screen once so all of them are built before timing.
+    for show in shows:
+        show()
+    root.update()
+    widgets_before = _widget_count(root)
+
+    timings = []
+    for n in range(switches):
+        show = shows[n % len(shows)]
+        timings.append(_timed(lambda: (show(), root.update_idletasks())))
+    root.update()
+    widgets_after = _widget_count(root)
+    root.destroy()
+
+    timings.sort()
+    print(f"{switches:,} switches")
+    print(
+        f"median {timings[len(timings) // 2]:.3f} ms, "
+        f"p99 {timings[int(len(timings) * 0.99)]:.3f} ms, max {timings[-1]:.3f} ms"
+    )
+    print(f"widgets before {widgets_before}, after {widgets_after}")
+
+
+def bench_dice(rolls: int, clicks: int) -> None:
+    # Memory and speed of the roll store, then auto-click the Roll button.
+    random.seed(1)
+    tracemalloc.start()
+    values = [random.randint(1, 6) for _ in range(rolls)]
+    list_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del values
+
+    game = DiceRollGame()
+    tracemalloc.start()
+    ms = _timed(lambda: [game.roll() for _ in range(rolls)])
+    array_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{rolls:,} rolls: {rolls / ms * 1000:,.0f} rolls/s")
+    print(f"memory: list {list_bytes / 2**20:.1f} MiB, array {array_bytes / 2**20:.1f} MiB")
+    ms = _timed(lambda: [game.frequency(face) for face in range(1, 7)])
+    print(f"all six frequencies: {ms:.4f} ms")
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as exc:
+        print(f"skipping Roll button timings (needs a display): {exc}")
+        return
+    app = GameHubApp(root)
+    app._show_dice_game()
+    roll_button = next(
+        widget
+        for widget in app.screens["dice"].winfo_children()
+        if isinstance(widget, ttk.Button) and widget.cget("text") == "Roll"
+    )
+    timings = []
+    for _ in range(clicks):
+        timings.append(_timed(lambda: (roll_button.invoke(), root.update_idletasks())))
+    root.destroy()
+    print(
+        f"{clicks:,} clicks: first 100 avg {sum(timings[:100]) / 100:.3f} ms,"
+        f" last 100 avg {sum(timings[-100:]) / 100:.3f} ms"
+    )
+
+
+def bench_montecarlo(rolls: int, sides: int, dice: int) -> None:
+    # Chunked batch rolling vs one randint call per die.
+    rng = random.Random(1)
+    sample = min(rolls, 1_000_000)
+    ms = _timed(
+        lambda: [
+            sum(rng.randint(1, sides) for _ in range(dice)) for _ in range(sample)
+        ]
+    )
+    print(f"{dice}d{sides}, randint per die: {sample / ms * 1000:12,.0f} rolls/s")
+
+    stats = None
+
+    def run(count: int) -> None:
+        nonlocal stats
+        for stats in simulate(sides, dice, count, random.Random(1)):
+            pass
+
+    # Memory stays flat however many rolls there are: only counts are kept.
+    tracemalloc.start()
+    run(sample)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    ms = _timed(lambda: run(rolls))
+    print(
+        f"{dice}d{sides}, chunked batch:   {rolls / ms * 1000:12,.0f} rolls/s"
+        f"  ({rolls:,} rolls, peak memory {peak / 2**20:.1f} MiB)"
+    )
+    expected = exact_sum_distribution(sides, dice)
+    error = max(
+        abs(stats.sum_frequency(total) - chance)
+        for total, chance in enumerate(expected)
+    )
+    print(f"largest gap from the exact sum odds: {error:.5f}")
+
+
+def bench_strategies(games: int, high: int, workers: int | None) -> None:
+    # Games per second for each strategy, on one process and on a pool. The
+    # attempt counts must match exactly: batches are seeded, not workers.
+    for strategy in STRATEGIES:
+        single, single_s = run_simulation(strategy, games, 1, high, seed=1, workers=1)
+        pooled, pooled_s = run_simulation(
+            strategy, games, 1, high, seed=1, workers=workers
+        )
+        print(
+            f"{strategy:8} 1 process {games / single_s:10,.0f} games/s,"
+            f" pool {games / pooled_s:10,.0f} games/s,"
+            f" mean attempts {attempt_summary(pooled)['mean']:.3f},"
+            f" same results: {single == pooled}"
+        )
+
+
+def _fake_questions(count: int) -> list[tuple[str, int, str, str]]:
+    # Made-up questions spread over 20 categories and 5 difficulties.
+    rng = random.Random(1)
+    return [
+        (f"category {rng.randrange(20)}", rng.randint(1, 5),
+         f"Question number {n}: what is {n} plus {n}?", str(n * 2))
+        for n in range(count)
+    ]
+
+
+def bench_bank(sizes: list[int], fetches: int) -> None:
+    # Open time, memory and fetch speed should not grow with the bank.
+    work = tempfile.mkdtemp()
+    for size in sizes:
+        path = os.path.join(work, f"bank{size}.bin")
+        write_bank(path, _fake_questions(size))
+        tracemalloc.start()
+        start = time.perf_counter()
+        bank = QuestionBank(path)
+        quiz = QuizGame(bank, category="category 3", difficulty=2, rng=random.Random(1))
+        open_ms = (time.perf_counter() - start) * 1000
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        rng = random.Random(2)
+        numbers = [rng.randrange(size) for _ in range(fetches)]
+        fetch_ms = _timed(lambda: [bank.question(n) for n in numbers])
+        draw_ms = _timed(quiz.reset)
+        print(
+            f"{size:>10,} questions ({os.path.getsize(path) / 2**20:6.1f} MiB):"
+            f" open + first quiz {open_ms:6.2f} ms, {memory / 1024:5.1f} KiB,"
+            f" fetch {fetch_ms / fetches * 1000:5.2f} us, next quiz {draw_ms:5.3f} ms"
+        )
+        bank.close()
+        os.remove(path)
+
+
+def _misspell(rng: random.Random, answer: str) -> str:
+    # The kind of answer a student might type for `answer`.
+    kind = rng.randrange(4)
+    if kind == 0 and len(answer) > 4:
+        spot = rng.randrange(len(answer))
+        return answer[:spot] + answer[spot + 1:]
+    if kind == 1:
+        return f"  {answer.upper()}! "
+    if kind == 2:
+        return rng.choice(["no idea", "Paris", "42"])
+    return answer
+
+
+def bench_grading(sheets: int, questions: int) -> None:
+    # Per-answer latency of the fuzzy check, then batch grading throughput.
+    rng = random.Random(1)
+    answers = [
+        rng.choice(["Mount Kilimanjaro|Kilimanjaro", "seven|7", "São Paulo",
+                    "The Pacific Ocean", "photosynthesis", "Mars"])
+        for _ in range(questions)
+    ]
+    keys = [AnswerKey(answer) for answer in answers]
+    sample_answers = [answer.split("|")[0] for answer in answers]
+    responses = [
+        [_misspell(rng, answer) for answer in sample_answers] for _ in range(sheets)
+    ]
+    timings = sorted(
+        _timed(lambda: keys[n].matches(sheet[n]))
+        for sheet in responses[:2_000]
+        for n in range(questions)
+    )
+    print(
+        f"one answer: median {timings[len(timings) // 2] * 1000:.1f} us,"
+        f" p99 {timings[int(len(timings) * 0.99)] * 1000:.1f} us,"
+        f" max {timings[-1] * 1000:.1f} us"
+    )
+    ms = _timed(lambda: grade_sheets(keys, responses))
+    print(
+        f"{sheets:,} sheets x {questions} answers: {ms:.0f} ms"
+        f" ({sheets * questions / ms * 1000:,.0f} answers/s)"
+    )
+
+
+def bench_sessions(sessions: int) -> None:
+    # Memory per server session and the cost of commands and idle eviction,
+    # without any network in the way (`main.py load` measures that).
+    lines = [f"NEW {GAMES[n % 3]}" for n in range(sessions)]
+    tracemalloc.start()
+    server = GameServer(idle_timeout=60)
+    for line in lines:
+        server.dispatch(line, 0)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    server = GameServer(idle_timeout=60)
+    ms = _timed(lambda: [server.dispatch(line, 0) for line in lines])
+    print(f"{sessions:,} sessions: {memory / sessions:,.0f} bytes each, created in {ms:.0f} ms")
+    commands = [f"ROLL {n}" for n in range(2, sessions, 3)]
+    ms = _timed(lambda: [server.dispatch(line, 30) for line in commands])
+    print(f"{len(commands):,} ROLL commands: {ms / len(commands) * 1000:.2f} us each")
+    ms = _timed(lambda: server.evict_idle(70))
+    print(f"evicted {server.evicted:,} idle sessions in {ms:.1f} ms, {len(server.sessions):,} left")
+
+
+def bench_leaderboard(results: int) -> None:
+    # Recording cost, top-10 query time, and start-up load from the snapshot
+    # compared with replaying the whole log.
+    work = tempfile.mkdtemp()
+    log_path = os.path.join(work, "leaderboard.log")
+    snapshot_path = os.path.join(work, "leaderboard.json")
+    board = Leaderboard(log_path, snapshot_path, snapshot_every=results + 1)
+    rng = random.Random(1)
+    ms = _timed(
+        lambda: [
+            board.record("guess", f"player {n % 500}", rng.randint(1, 20))
+            for n in range(results)
+        ]
+    )
+    print(f"{results:,} results recorded: {ms / results * 1000:.1f} us each")
+    ms = _timed(lambda: [board.top("guess") for _ in range(1_000)])
+    print(f"top 10 query: {ms:.1f} us (average {board.stats['guess'].average():.2f} attempts)")
+    board.close()
+    print(
+        f"log {os.path.getsize(log_path) / 2**20:.1f} MiB,"
+        f" snapshot {os.path.getsize(snapshot_path):,} bytes"
+    )
+    ms = _timed(lambda: Leaderboard(log_path, snapshot_path).load())
+    print(f"load from snapshot: {ms:.2f} ms")
+    os.remove(snapshot_path)
+    ms = _timed(lambda: Leaderboard(log_path, snapshot_path).load())
+    print(f"load by replaying the log: {ms:.0f} ms")
+
+
+def bench_replay(games: int) -> None:
+    # Record games of every kind into a replay log, then replay and check it.
+    path = os.path.join(tempfile.mkdtemp(), "games.replay")
+    ms = _timed(lambda: record_games(path, games, seed=1))
+    size = os.path.getsize(path)
+    report = replay(path)
+    print(
+        f"{games * 3:,} games, {report.records:,} records: recorded in {ms:.0f} ms,"
+        f" {size / 2**20:.1f} MiB ({size / report.records:.1f} bytes/record)"
+    )
+    print(
+        f"replayed in {report.seconds * 1000:.0f} ms"
+        f" ({report.records / report.seconds:,.0f} records/s),"
+        f" {report.mismatch_count} mismatches"
+    )
+    os.remove(path)
+
+
+def main() -> None:
+    # Pick a benchmark from the command line and run it.
+    parser = argparse.ArgumentParser(description="Mini Game Hub benchmarks")
+    sub = parser.add_subparsers(dest="name", required=True)
+
+    switch = sub.add_parser("switch", help="game screen switch latency")
+    switch.add_argument("--switches", type=int, default=10_000)
+
+    dice = sub.add_parser("dice", help="roll storage and Roll button speed")
+    dice.add_argument("--rolls", type=int, default=1_000_000)
+    dice.add_argument("--clicks", type=int, default=5_000)
+
+    monte = sub.add_parser("montecarlo", help="batch dice simulation speed")
+    monte.add_argument("--rolls", type=int, default=10_000_000)
+    monte.add_argument("--sides", type=int, default=6)
+    monte.add_argument("--dice", type=int, default=2)
+
+    strategies = sub.add_parser("strategies", help="Guess the Number simulator speed")
+    strategies.add_argument("--games", type=int, default=200_000)
+    strategies.add_argument("--high", type=int, default=2**63)
+    strategies.add_argument("--workers", type=int, default=None)
+
+    bank = sub.add_parser("bank", help="question bank open and fetch speed")
+    bank.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    bank.add_argument("--fetches", type=int, default=100_000)
+
+    grading = sub.add_parser("grading", help="answer matching and batch grading")
+    grading.add_argument("--sheets", type=int, default=100_000)
+    grading.add_argument("--questions", type=int, default=10)
+
+    sessions = sub.add_parser("sessions", help="game server session memory and eviction")
+    sessions.add_argument("--sessions", type=int, default=30_000)
+
+    board = sub.add_parser("leaderboard", help="leaderboard record, query and load speed")
+    board.add_argument("--results", type=int, default=1_000_000)
+
+    replay_bench = sub.add_parser("replay", help="replay log size and replay speed")
+    replay_bench.add_argument("--games", type=int, default=20_000)
+
+    args = parser.parse_args()
+    if args.name == "switch":
+        bench_switch(args.switches)
+    elif args.name == "dice":
+        bench_dice(args.rolls, args.clicks)
+    elif args.name == "montecarlo":
+        bench_montecarlo(args.rolls, args.sides, args.dice)
+    elif args.name == "strategies":
+        bench_strategies(args.games, args.high, args.workers)
+    elif args.name == "bank":
+        bench_bank(args.sizes, args.fetches)
+    elif args.name == "grading":
+        bench_grading(args.sheets, args.questions)
+    elif args.name == "sessions":
+        bench_sessions(args.sessions)
+    elif args.name == "leaderboard":
+        bench_leaderboard(args.results)
+    elif args.name == "replay":
+        bench_replay(args.games)
+
+
+if __name__ == "__main__":
+    # Run benchmarks only when executed directly.
+    main()
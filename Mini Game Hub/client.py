@@ -0,0 +1,154 @@
+import socket
+from collections.abc import Callable
+
+from games import DiceRollGame, GuessTheNumberGame, QuizGame
+from server import UNKNOWN_SESSION
+
+
+# The server answered a command with "ERR ...".
+class ServerError(Exception):
+    pass
+
+
+# Blocking connection to a GameServer: send a line, wait for its reply.
+class GameClient:
+    def __init__(self, host: str, port: int, timeout: float = 5.0) -> None:
+        self.socket = socket.create_connection((host, port), timeout=timeout)
+        self._replies = self.socket.makefile("rb")
+
+    def request(self, line: str) -> str:
+        # Send one command and return the reply without its "OK ".
+        self.socket.sendall(line.encode() + b"\n")
+        reply = self._replies.readline().decode().rstrip("\n")
+        if not reply:
+            raise ConnectionError("the game server closed the connection")
+        if reply.startswith("ERR"):
+            raise ServerError(reply)
+        return reply[3:]
+
+    def close(self) -> None:
+        self._replies.close()
+        self.socket.close()
+
+
+# One game session on the server. If the server dropped it for being idle,
+# call() opens a fresh session and runs the command again there.
+class RemoteSession:
+    def __init__(self, client: GameClient, kind: str, options: str = "") -> None:
+        self.client = client
+        self.kind = kind
+        self.options = options
+        self.id = ""
+        # Set by the owning game to clear its own state after a restart.
+        self.on_restart: Callable[[], None] | None = None
+
+    def end(self) -> None:
+        # Tell the server this session is finished, so it does not sit there
+        # until it is dropped for being idle.
+        if not self.id:
+            return
+        try:
+            self.client.request(f"END {self.id}")
+        except ServerError:
+            # Already ended or dropped by the server.
+            pass
+        self.id = ""
+
+    def open(self) -> str:
+        # Start a new session; return the rest of the NEW reply.
+        reply = self.client.request(f"NEW {self.kind} {self.options}".rstrip())
+        self.id, _, info = reply.partition(" ")
+        return info
+
+    def call(self, command: str, argument: str = "") -> str:
+        line = f"{command} {self.id} {argument}".rstrip()
+        try:
+            return self.client.request(line)
+        except ServerError as exc:
+            if str(exc) != UNKNOWN_SESSION:
+                raise
+        self.open()
+        if self.on_restart:
+            self.on_restart()
+        return self.client.request(f"{command} {self.id} {argument}".rstrip())
+
+
+# The games below keep the same attributes and methods as the local ones, so
+# GameHubApp can use either. Moves are made on the server; only what the
+# screens show (attempts, guesses, rolls, score) is kept here.
+class RemoteGuessGame(GuessTheNumberGame):
+    def __init__(self, client: GameClient, low: int = 1, high: int = 20) -> None:
+        self.remote = RemoteSession(client, "guess", f"{low} {high}")
+        self.remote.on_restart = self._clear
+        super().__init__(low, high)
+
+    def _clear(self) -> None:
+        self.attempts = 0
+        self.guesses: list[int] = []
+
+    def reset(self, secret: int | None = None) -> None:
+        # The server picks the secret; `secret` is not used.
+        self.secret = None
+        self.remote.end()
+        self.remote.open()
+        self._clear()
+
+    def make_guess(self, guess: int) -> str:
+        attempts, hint = self.remote.call("GUESS", str(guess)).split(" ", 1)
+        self.attempts = int(attempts)
+        self.guesses.append(guess)
+        return hint
+
+
+class RemoteDiceGame(DiceRollGame):
+    def __init__(self, client: GameClient) -> None:
+        self.remote = RemoteSession(client, "dice")
+        self.remote.open()
+        super().__init__()
+
+    def roll(self) -> int:
+        value = int(self.remote.call("ROLL"))
+        self.rolls.append(value)
+        self.counts[value] += 1
+        return value
+
+    def reset(self) -> None:
+        super().reset()
+        self.remote.call("RESET")
+
+
+class RemoteQuizGame(QuizGame):
+    def __init__(self, client: GameClient) -> None:
+        self.remote = RemoteSession(client, "quiz")
+        self.remote.on_restart = self._clear
+        self._total = 0
+        self._question: str | None = None
+        super().__init__()
+
+    def _clear(self) -> None:
+        self.index = 0
+        self.score = 0
+        self.answers.clear()
+        self._question = None
+
+    @property
+    def total(self) -> int:
+        return self._total
+
+    def reset(self) -> None:
+        self.remote.end()
+        self._total = int(self.remote.open())
+        self._clear()
+
+    def current_question(self) -> str:
+        if self._question is None:
+            self._question = self.remote.call("QUESTION")
+        return self._question
+
+    def answer(self, response: str) -> bool:
+        verdict, score = self.remote.call("ANSWER", response).split()
+        self.score = int(score)
+        self.answers.append(response)
+        self.index += 1
+        self._question = None
+        return verdict == "correct"
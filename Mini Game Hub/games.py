@@ -0,0 +1,159 @@
+import random
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+
+from answers import AnswerKey, grade_sheets
+from question_bank import QuestionBank
+
+
+# Hints returned by GuessTheNumberGame.make_guess.
+TOO_LOW = "Too low!"
+TOO_HIGH = "Too high!"
+CORRECT = "Correct!"
+
+
+# Game logic for guessing a hidden number.
+class GuessTheNumberGame:
+    def __init__(
+        self, low: int = 1, high: int = 20, rng: random.Random | None = None
+    ) -> None:
+        # Initialize game state. The secret is drawn from low..high inclusive.
+        self.low = low
+        self.high = high
+        self.rng = rng or random.Random()
+        self.reset()
+
+    def reset(self, secret: int | None = None) -> None:
+        # Pick a new secret (or use the one given) and clear attempts/guesses.
+        self.secret = self.rng.randint(self.low, self.high) if secret is None else secret
+        self.attempts = 0
+        self.guesses: list[int] = []
+
+    def make_guess(self, guess: int) -> str:
+        # Record the guess and return a hint.
+        self.attempts += 1
+        self.guesses.append(guess)
+        if guess < self.secret:
+            return TOO_LOW
+        if guess > self.secret:
+            return TOO_HIGH
+        return CORRECT
+
+
+# Game logic for rolling a die.
+class DiceRollGame:
+    def __init__(self, rng: random.Random | None = None) -> None:
+        # Track roll history, one byte per roll. Rolls come from this game's
+        # own generator, so a seeded game always rolls the same faces.
+        self.rng = rng or random.Random()
+        self.rolls = array("B")
+        # counts[face] = how many times that face came up (index 0 unused).
+        self.counts = [0] * 7
+
+    def roll(self) -> int:
+        # Roll a six-sided die and store the result.
+        value = self.rng.randint(1, 6)
+        self.rolls.append(value)
+        self.counts[value] += 1
+        return value
+
+    def frequency(self, face: int) -> float:
+        # Share of all rolls that came up as this face.
+        return self.counts[face] / len(self.rolls) if self.rolls else 0.0
+
+    def reset(self) -> None:
+        # Forget every roll.
+        self.rolls = array("B")
+        self.counts = [0] * 7
+
+
+# Questions used when no question bank is given.
+DEFAULT_QUESTIONS = [
+    ("What is the capital of France?", "Paris"),
+    ("How many continents are there?", "7"),
+    ("What planet is known as the Red Planet?", "Mars"),
+]
+# Their answer keys, built once and shared by every QuizGame without a bank.
+DEFAULT_KEYS = [AnswerKey(answer) for _, answer in DEFAULT_QUESTIONS]
+# Questions per quiz when playing from a question bank.
+QUIZ_LENGTH = 10
+
+
+# Game logic for a short quiz. With a QuestionBank, each quiz is QUIZ_LENGTH
+# questions drawn at random from the category/difficulty filter; no question
+# comes back until every matching one has been asked.
+class QuizGame:
+    def __init__(
+        self,
+        bank: QuestionBank | None = None,
+        length: int = QUIZ_LENGTH,
+        category: str | None = None,
+        difficulty: int | None = None,
+        rng: random.Random | None = None,
+    ) -> None:
+        # Store question/answer pairs and progress.
+        self.bank = bank
+        self.category = category
+        self.difficulty = difficulty
+        self.rng = rng or random.Random()
+        self.length = length
+        if bank is not None:
+            self.length = min(length, bank.matching(category, difficulty))
+            if not self.length:
+                raise ValueError("no questions in the bank match that filter")
+        self._draws: Iterator[int] = iter(())
+        self.questions: list[tuple[str, str]] = []
+        self.answers: list[str] = []
+        self.reset()
+
+    def _draw_questions(self) -> list[tuple[str, str]]:
+        # Fetch the next `length` questions from the bank, starting a new
+        # shuffled round when the current one runs out.
+        numbers: list[int] = []
+        while len(numbers) < self.length:
+            number = next(self._draws, None)
+            if number is None:
+                self._draws = self.bank.sample(self.rng, self.category, self.difficulty)
+            elif number not in numbers:
+                numbers.append(number)
+        return [self.bank.question(number) for number in numbers]
+
+    def current_question(self) -> str:
+        # Return the current question prompt.
+        return self.questions[self.index][0]
+
+    def answer(self, response: str) -> bool:
+        # Check the response and update score/progress.
+        is_correct = self.keys[self.index].matches(response)
+        self.answers.append(response)
+        if is_correct:
+            self.score += 1
+        self.index += 1
+        return is_correct
+
+    @property
+    def total(self) -> int:
+        # Number of questions in this quiz.
+        return len(self.questions)
+
+    def has_more(self) -> bool:
+        # True if there are unanswered questions.
+        return self.index < self.total
+
+    def grade_many(self, sheets: Iterable[Sequence[str]]) -> list[int]:
+        # Scores for many answer sheets to the current quiz at once, e.g. a
+        # whole class. Does not change this game's own score or progress.
+        return grade_sheets(self.keys, sheets)
+
+    def reset(self) -> None:
+        # Restart the quiz, with new questions when playing from a bank.
+        # Accepted answers, normalized once per quiz instead of per response.
+        if self.bank is None:
+            self.questions = DEFAULT_QUESTIONS
+            self.keys = DEFAULT_KEYS
+        else:
+            self.questions = self._draw_questions()
+            self.keys = [AnswerKey(answer) for _, answer in self.questions]
+        self.index = 0
+        self.score = 0
+        self.answers.clear()
@@ -0,0 +1,69 @@
+import tkinter as tk
+from collections import deque
+from collections.abc import Sequence
+
+
+# Only this many of the newest values stay on screen.
+HISTORY_LIMIT = 200
+
+
+# Read-only Text that shows a growing list of values, such as rolls.
+# New values are appended at the end instead of redrawing the whole list, and
+# once `limit` values are shown the oldest one is deleted for each new one.
+class HistoryView:
+    def __init__(
+        self,
+        parent: tk.Misc,
+        prefix: str,
+        empty_text: str,
+        limit: int = HISTORY_LIMIT,
+        height: int = 6,
+    ) -> None:
+        self.prefix = prefix
+        self.empty_text = empty_text
+        self.limit = limit
+        # How many values of the model have been shown so far.
+        self.shown = 0
+        # Character lengths of the visible values, oldest first (the ring).
+        self._lengths: deque[int] = deque()
+        self.text = tk.Text(parent, height=height, wrap="word")
+        self.clear()
+
+    def grid(self, **options) -> None:
+        self.text.grid(**options)
+
+    def clear(self) -> None:
+        # Show the empty message and forget every value.
+        self.shown = 0
+        self._lengths.clear()
+        self._replace(self.empty_text)
+
+    def sync(self, values: Sequence) -> None:
+        # Append any values the model has that are not shown yet.
+        if len(values) < self.shown:
+            self.clear()
+        for value in values[max(self.shown, len(values) - self.limit):]:
+            self.append(str(value))
+        self.shown = len(values)
+
+    def append(self, item: str) -> None:
+        # Add one value at the end, dropping the oldest if the view is full.
+        self.text.configure(state="normal")
+        if not self._lengths:
+            self.text.delete("1.0", tk.END)
+            self.text.insert(tk.END, self.prefix + item)
+        else:
+            self.text.insert("end-1c", ", " + item)
+        self._lengths.append(len(item))
+        self.shown += 1
+        if len(self._lengths) > self.limit:
+            # Remove the oldest value and the ", " after it.
+            start = f"1.0 + {len(self.prefix)} chars"
+            self.text.delete(start, f"{start} + {self._lengths.popleft() + 2} chars")
+        self.text.configure(state="disabled")
+
+    def _replace(self, content: str) -> None:
+        self.text.configure(state="normal")
+        self.text.delete("1.0", tk.END)
+        self.text.insert(tk.END, content)
+        self.text.configure(state="disabled")
@@ -0,0 +1,202 @@
+import heapq
+import json
+import os
+import time
+
+
+# Best results kept per game.
+TOP_K = 10
+# Write a fresh snapshot after this many new results (and on close).
+SNAPSHOT_EVERY = 100
+# For each game, whether a lower score is better (guess: fewer attempts).
+LOWER_IS_BETTER = {"guess": True, "quiz": False}
+# Games whose length varies (a bank quiz has 10 questions, the built-in one
+# 3). They are ranked by the percentage right, so every length is compared
+# fairly on one board.
+PERCENT_GAMES = {"quiz"}
+
+
+# Running totals for one game, updated per result instead of recomputed.
+class GameStats:
+    __slots__ = ("games", "total", "best", "worst")
+
+    def __init__(self, games: int = 0, total: int = 0, best=None, worst=None) -> None:
+        self.games = games
+        self.total = total
+        self.best: int | None = best
+        self.worst: int | None = worst
+
+    def add(self, score: int, lower_is_better: bool) -> None:
+        self.games += 1
+        self.total += score
+        better, worse = (min, max) if lower_is_better else (max, min)
+        self.best = score if self.best is None else better(self.best, score)
+        self.worst = score if self.worst is None else worse(self.worst, score)
+
+    def average(self) -> float:
+        return self.total / self.games if self.games else 0.0
+
+    def to_list(self) -> list:
+        return [self.games, self.total, self.best, self.worst]
+
+
+# Every finished game, kept in an append-only log of JSON lines, plus a
+# small snapshot of the top-k heaps and running stats. Loading reads the
+# snapshot and replays only the log lines written after it, so start-up time
+# does not grow with the number of games ever played.
+class Leaderboard:
+    def __init__(
+        self,
+        log_path: str,
+        snapshot_path: str,
+        k: int = TOP_K,
+        snapshot_every: int = SNAPSHOT_EVERY,
+    ) -> None:
+        self.log_path = log_path
+        self.snapshot_path = snapshot_path
+        self.k = k
+        self.snapshot_every = snapshot_every
+        # Results recorded so far; also the tie-breaker (earlier ranks higher).
+        self.seq = 0
+        # Per game, a min-heap of (rank key, -seq, player) holding the best k:
+        # the worst of them sits at [0] and is dropped when a better one comes.
+        self.heaps: dict[str, list[tuple[int, int, str]]] = {
+            game: [] for game in LOWER_IS_BETTER
+        }
+        self.stats = {game: GameStats() for game in LOWER_IS_BETTER}
+        # Log size covered by the snapshot; replay starts here.
+        self._offset = 0
+        self._since_snapshot = 0
+        self._handle = None
+
+    def load(self) -> None:
+        # Read the snapshot, then any results logged after it.
+        snapshot = None
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, "r", encoding="utf-8") as handle:
+                    snapshot = json.load(handle)
+            except ValueError:
+                # A damaged snapshot: rebuild everything from the log.
+                snapshot = None
+        if snapshot is not None:
+            self.seq = snapshot["seq"]
+            self._offset = snapshot["offset"]
+            for game, saved in snapshot["games"].items():
+                if game in LOWER_IS_BETTER and saved["k"] == self.k:
+                    self.heaps[game] = [tuple(entry) for entry in saved["heap"]]
+                    heapq.heapify(self.heaps[game])
+                    self.stats[game] = GameStats(*saved["stats"])
+                else:
+                    # Saved with another k: rebuild from the whole log.
+                    self._reset()
+                    break
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, "rb") as handle:
+            if handle.seek(0, os.SEEK_END) < self._offset:
+                # The log was replaced: the snapshot no longer matches it.
+                self._reset()
+            handle.seek(self._offset)
+            good_bytes = self._offset
+            for line in handle:
+                # A crash can leave a half-written last line.
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    result = json.loads(line)
+                except ValueError:
+                    break
+                good_bytes += len(line)
+                score = result["score"]
+                if "out_of" in result:
+                    score = percent(score, result["out_of"])
+                self._add(result["game"], result["player"], score)
+        if os.path.getsize(self.log_path) > good_bytes:
+            with open(self.log_path, "r+b") as handle:
+                handle.truncate(good_bytes)
+        self._since_snapshot = self.seq
+
+    def _reset(self) -> None:
+        self.seq = 0
+        self._offset = 0
+        self.heaps = {game: [] for game in LOWER_IS_BETTER}
+        self.stats = {game: GameStats() for game in LOWER_IS_BETTER}
+
+    def _add(self, game: str, player: str, score: int) -> None:
+        # Update the heap and stats of one game: O(log k).
+        self.seq += 1
+        lower_is_better = LOWER_IS_BETTER[game]
+        self.stats[game].add(score, lower_is_better)
+        entry = (-score if lower_is_better else score, -self.seq, player)
+        heap = self.heaps[game]
+        if len(heap) < self.k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    def record(
+        self, game: str, player: str, score: int, out_of: int | None = None
+    ) -> None:
+        # Save one finished game and add it to the board. Games in
+        # PERCENT_GAMES need `out_of`, the number of questions asked.
+        if game not in LOWER_IS_BETTER:
+            raise ValueError(f"no leaderboard for {game!r}")
+        if game in PERCENT_GAMES and not (out_of and 0 <= score <= out_of):
+            raise ValueError(f"{game} scores need the number of questions asked")
+        if self._handle is None:
+            self._handle = open(self.log_path, "ab")
+        line = {"game": game, "player": player, "score": score, "time": int(time.time())}
+        if game in PERCENT_GAMES:
+            line["out_of"] = out_of
+            score = percent(score, out_of)
+        self._handle.write(json.dumps(line).encode() + b"\n")
+        self._handle.flush()
+        self._add(game, player, score)
+        if self.seq - self._since_snapshot >= self.snapshot_every:
+            self.write_snapshot()
+
+    def top(self, game: str) -> list[tuple[str, int]]:
+        # (player, score) of the best k results, best first. Sorts only the
+        # k heap entries, never the full history. Scores of PERCENT_GAMES
+        # are percentages.
+        lower_is_better = LOWER_IS_BETTER[game]
+        return [
+            (player, -key if lower_is_better else key)
+            for key, _, player in sorted(self.heaps[game], reverse=True)
+        ]
+
+    def write_snapshot(self) -> None:
+        # Save heaps and stats with the log size they cover (atomically).
+        if self._handle is not None:
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+        offset = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        snapshot = {
+            "seq": self.seq,
+            "offset": offset,
+            "games": {
+                game: {"k": self.k, "heap": heap, "stats": self.stats[game].to_list()}
+                for game, heap in self.heaps.items()
+            },
+        }
+        temp_path = self.snapshot_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(snapshot, handle, separators=(",", ":"))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        self._offset = offset
+        self._since_snapshot = self.seq
+
+    def close(self) -> None:
+        if self.seq != self._since_snapshot:
+            self.write_snapshot()
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+def percent(score: int, out_of: int) -> int:
+    # Whole-number percentage of questions answered right.
+    return round(100 * score / out_of)
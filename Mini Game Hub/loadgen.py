@@ -0,0 +1,119 @@
+import asyncio
+import random
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from server import GAMES
+from streams import stream
+
+
+async def _request(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, line: str
+) -> str:
+    writer.write(line.encode() + b"\n")
+    return (await reader.readline()).decode().rstrip("\n")
+
+
+async def _player(
+    host: str,
+    port: int,
+    sessions: int,
+    requests: int,
+    rng: random.Random,
+    latencies: list[float],
+) -> None:
+    # One connection that plays `sessions` games, `requests` commands in all,
+    # waiting for each reply before sending the next command.
+    reader, writer = await asyncio.open_connection(host, port)
+    # [kind, session id, next command is a RESET]
+    games = []
+    for n in range(sessions):
+        kind = GAMES[n % len(GAMES)]
+        reply = await _request(reader, writer, f"NEW {kind}")
+        games.append([kind, reply.split()[1], False])
+    for n in range(requests):
+        game = games[n % sessions]
+        kind, session_id, restart = game
+        if restart:
+            line = f"RESET {session_id}"
+        elif kind == "guess":
+            line = f"GUESS {session_id} {rng.randint(1, 20)}"
+        elif kind == "dice":
+            line = f"ROLL {session_id}"
+        else:
+            line = f"ANSWER {session_id} {rng.choice(['Paris', '7', 'Mars', 'no idea'])}"
+        start = time.perf_counter()
+        reply = await _request(reader, writer, line)
+        latencies.append(time.perf_counter() - start)
+        # Start over once a number is guessed or the quiz is done.
+        game[2] = "Correct!" in reply or reply == "ERR quiz finished"
+    writer.close()
+    await writer.wait_closed()
+
+
+async def _run(
+    host: str, port: int, connections: int, sessions: int, requests: int, seed: int
+) -> tuple[list[float], float]:
+    latencies: list[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _player(
+                host,
+                port,
+                max(1, _share(sessions, connections, n)),
+                _share(requests, connections, n),
+                stream(seed, "load", n),
+                latencies,
+            )
+            for n in range(connections)
+        )
+    )
+    return latencies, time.perf_counter() - start
+
+
+def _share(total: int, parts: int, n: int) -> int:
+    # Part n of `total` split as evenly as possible into `parts` parts.
+    return total // parts + (n < total % parts)
+
+
+def start_local_server(port: int) -> subprocess.Popen:
+    # Run `main.py serve` in its own process and wait until it accepts
+    # connections, so the load and the server do not share one event loop.
+    main = Path(__file__).with_name("main.py")
+    process = subprocess.Popen([sys.executable, str(main), "serve", "--port", str(port)])
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port)).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise OSError(f"the local server did not start on port {port}")
+
+
+def run_load(
+    host: str, port: int, connections: int, sessions: int, requests: int, seed: int = 0
+) -> str:
+    # Drive the server and return a report of requests/s and latency.
+    for name, value in (
+        ("connections", connections), ("sessions", sessions), ("requests", requests)
+    ):
+        if value < 1:
+            raise ValueError(f"{name} must be at least 1, not {value}")
+    latencies, seconds = asyncio.run(_run(host, port, connections, sessions, requests, seed))
+    latencies.sort()
+    done = len(latencies)
+    if not done:
+        return f"{connections} connections, {sessions:,} sessions: no requests completed"
+    return (
+        f"{connections} connections, {sessions:,} sessions, {done:,} requests"
+        f" in {seconds:.2f} s: {done / seconds:,.0f} requests/s\n"
+        f"latency: median {latencies[done // 2] * 1000:.2f} ms,"
+        f" p99 {latencies[int(done * 0.99)] * 1000:.2f} ms,"
+        f" max {latencies[-1] * 1000:.2f} ms"
+    )
@@ -1,92 +1,84 @@
-import random
+import argparse
+import asyncio
+import sys
 import tkinter as tk
+from collections.abc import Callable
 from tkinter import messagebox, ttk
 
-
-# Game logic for guessing a hidden number.
-class GuessTheNumberGame:
-    def __init__(self) -> None:
-        # Initialize game state.
-        self.reset()
-
-    def reset(self) -> None:
-        # Pick a new secret and clear attempts/guesses.
-        self.secret = random.randint(1, 20)
-        self.attempts = 0
-        self.guesses: list[int] = []
-
-    def make_guess(self, guess: int) -> str:
-        # Record the guess and return a hint.
-        self.attempts += 1
-        self.guesses.append(guess)
-        if guess < self.secret:
-            return "Too low!"
-        if guess > self.secret:
-            return "Too high!"
-        return "Correct!"
-
-
-# Game logic for rolling a die.
-class DiceRollGame:
-    def __init__(self) -> None:
-        # Track roll history.
-        self.rolls: list[int] = []
-
-    def roll(self) -> int:
-        # Roll a six-sided die and store the result.
-        value = random.randint(1, 6)
-        self.rolls.append(value)
-        return value
-
-
-# Game logic for a short quiz.
-class QuizGame:
-    def __init__(self) -> None:
-        # Store question/answer pairs and progress.
-        self.questions = [
-            ("What is the capital of France?", "Paris"),
-            ("How many continents are there?", "7"),
-            ("What planet is known as the Red Planet?", "Mars"),
-        ]
-        self.index = 0
-        self.score = 0
-        self.answers: list[str] = []
-
-    def current_question(self) -> str:
-        # Return the current question prompt.
-        return self.questions[self.index][0]
-
-    def answer(self, response: str) -> bool:
-        # Check the response and update score/progress.
-        correct = self.questions[self.index][1].lower()
-        is_correct = response.strip().lower() == correct
-        self.answers.append(response)
-        if is_correct:
-            self.score += 1
-        self.index += 1
-        return is_correct
-
-    def has_more(self) -> bool:
-        # True if there are unanswered questions.
-        return self.index < len(self.questions)
-
-    def reset(self) -> None:
-        # Restart the quiz.
-        self.index = 0
-        self.score = 0
-        self.answers.clear()
+from client import GameClient, RemoteDiceGame, RemoteGuessGame, RemoteQuizGame, ServerError
+from games import CORRECT, DiceRollGame, GuessTheNumberGame, QuizGame
+from history_view import HistoryView
+from leaderboard import LOWER_IS_BETTER, PERCENT_GAMES, Leaderboard
+from loadgen import run_load, start_local_server
+from montecarlo import DiceStats, SimulationWorker
+from question_bank import QuestionBank, read_csv, write_bank
+from replay import (
+    RecordedDiceGame,
+    RecordedGuessGame,
+    RecordedQuizGame,
+    ReplayWriter,
+    record_games,
+    replay,
+)
+from server import DEFAULT_HOST, DEFAULT_PORT, IDLE_TIMEOUT, GameServer
+from simulator import SECRETS, STRATEGIES, format_report, parse_bound, run_simulation
+from streams import derive_seed, fresh_seed, stream
+
+
+# The simulation chart never draws more bars than this.
+CHART_BARS = 120
+# Finished games (append-only) and the snapshot the leaderboard loads from.
+LEADERBOARD_LOG = "leaderboard.log"
+LEADERBOARD_SNAPSHOT = "leaderboard.json"
+# What a move on a game server can raise: an ERR reply, or a dropped or
+# timed-out connection (ConnectionError and socket.timeout are OSErrors).
+REMOTE_ERRORS = (ServerError, OSError)
+
+
+def show_remote_error(exc: Exception) -> None:
+    # Tell the player a move on the game server failed.
+    messagebox.showerror("Game Server", f"Game server error: {exc}")
+
+
+def remote_safe(action: Callable[[], None]) -> Callable[[], None]:
+    # Wrap a button command so a game server failure is shown in a message
+    # box instead of escaping into Tk's callback handler.
+    def run() -> None:
+        try:
+            action()
+        except REMOTE_ERRORS as exc:
+            show_remote_error(exc)
+
+    return run
 
 
 # Main GUI application for the mini game hub.
 class GameHubApp:
-    def __init__(self, root: tk.Tk) -> None:
-        # Store root window and set up games.
+    def __init__(
+        self,
+        root: tk.Tk,
+        quiz_game: QuizGame | None = None,
+        guess_game: GuessTheNumberGame | None = None,
+        dice_game: DiceRollGame | None = None,
+        leaderboard: Leaderboard | None = None,
+    ) -> None:
+        # Store root window and set up games. Pass games to play from a
+        # question bank or on a game server instead of the local defaults.
         self.root = root
         self.root.title("Mini Game Hub")
 
-        self.guess_game = GuessTheNumberGame()
-        self.dice_game = DiceRollGame()
-        self.quiz_game = QuizGame()
+        self.guess_game = guess_game or GuessTheNumberGame()
+        self.dice_game = dice_game or DiceRollGame()
+        self.quiz_game = quiz_game or QuizGame()
+        self.leaderboard = leaderboard or Leaderboard(LEADERBOARD_LOG, LEADERBOARD_SNAPSHOT)
+        try:
+            self.leaderboard.load()
+        except (OSError, ValueError, KeyError) as exc:
+            messagebox.showwarning("Leaderboard", f"Could not load the leaderboard: {exc}")
+        self.player = tk.StringVar(value="Player")
+        # Each game screen is built the first time it is shown, then kept and
+        # raised on top when picked again.
+        self.screens: dict[str, ttk.Frame] = {}
 
         # Build UI and show the default game.
         self._build_ui()
@@ -113,6 +105,13 @@ class GameHubApp:
         ttk.Button(menu_frame, text="Quiz Game", command=self._show_quiz_game).grid(
             row=0, column=2, padx=4
         )
+        ttk.Button(menu_frame, text="Leaderboard", command=self._show_leaderboard).grid(
+            row=0, column=3, padx=4
+        )
+        ttk.Label(menu_frame, text="Player:").grid(row=1, column=0, sticky="e", pady=(6, 0))
+        ttk.Entry(menu_frame, textvariable=self.player, width=16).grid(
+            row=1, column=1, sticky="w", padx=4, pady=(6, 0)
+        )
 
         # Container where the active game UI is shown.
         self.game_frame = ttk.Frame(main, padding=10)
@@ -120,20 +119,58 @@ class GameHubApp:
         self.game_frame.columnconfigure(0, weight=1)
         self.game_frame.rowconfigure(0, weight=1)
 
-    def _clear_game_frame(self) -> None:
-        # Remove all widgets in the game frame.
-        for widget in self.game_frame.winfo_children():
-            widget.destroy()
+    def _show_screen(self, name: str, build: Callable[[], ttk.Frame]) -> None:
+        # Raise a cached game screen, building it on first use. Building a
+        # remote game's screen asks the server for its first state.
+        frame = self.screens.get(name)
+        if frame is None:
+            try:
+                frame = build()
+            except REMOTE_ERRORS as exc:
+                show_remote_error(exc)
+                return
+            frame.grid(row=0, column=0, sticky="nsew")
+            self.screens[name] = frame
+        frame.tkraise()
 
     def _show_guess_game(self) -> None:
-        # Build the Guess the Number UI.
-        self._clear_game_frame()
+        self._show_screen("guess", self._build_guess_game)
 
+    def _show_dice_game(self) -> None:
+        self._show_screen("dice", self._build_dice_game)
+
+    def _show_quiz_game(self) -> None:
+        self._show_screen("quiz", self._build_quiz_game)
+
+    def _show_leaderboard(self) -> None:
+        self._show_screen("leaderboard", self._build_leaderboard)
+        self._refresh_leaderboard()
+
+    def _record(self, game: str, score: int, out_of: int | None = None) -> None:
+        # Add a finished game to the leaderboard under the current player.
+        player = self.player.get().strip() or "Player"
+        try:
+            self.leaderboard.record(game, player, score, out_of)
+        except OSError:
+            messagebox.showerror("Leaderboard", "Could not save this result.")
+
+    def close(self) -> None:
+        # Save the leaderboard snapshot before the window closes.
+        try:
+            self.leaderboard.close()
+        except OSError:
+            messagebox.showerror("Leaderboard", "Could not save the leaderboard.")
+        self.root.destroy()
+
+    def _build_guess_game(self) -> ttk.Frame:
+        # Build the Guess the Number UI.
         frame = ttk.LabelFrame(self.game_frame, text="Guess the Number", padding=10)
-        frame.grid(row=0, column=0, sticky="nsew")
         frame.columnconfigure(1, weight=1)
 
-        ttk.Label(frame, text="Guess a number (1-20):").grid(row=0, column=0, sticky="w")
+        game = self.guess_game
+        ttk.Label(frame, text=f"Guess a number ({game.low}-{game.high}):").grid(
+            row=0, column=0, sticky="w"
+        )
         guess_entry = ttk.Entry(frame, width=10)
         guess_entry.grid(row=0, column=1, sticky="w", padx=6)
 
@@ -142,8 +179,11 @@ class GameHubApp:
 
         attempts_label = ttk.Label(frame, text="Attempts: 0")
         attempts_label.grid(row=2, column=0, columnspan=3, sticky="w")
+        # Whether this game's win has gone on the leaderboard already.
+        recorded = False
 
         def submit_guess() -> None:
+            nonlocal recorded
             # Validate input and submit a guess.
             value = guess_entry.get().strip()
             try:
@@ -152,14 +192,19 @@ class GameHubApp:
                 messagebox.showerror("Invalid Guess", "Enter a whole number.")
                 return
 
-            if guess < 1 or guess > 20:
-                messagebox.showerror("Invalid Guess", "Pick a number from 1 to 20.")
+            if guess < game.low or guess > game.high:
+                messagebox.showerror(
+                    "Invalid Guess", f"Pick a number from {game.low} to {game.high}."
+                )
                 return
 
             message = self.guess_game.make_guess(guess)
             result_label.config(text=message)
             attempts_label.config(text=f"Attempts: {self.guess_game.attempts}")
-            if message == "Correct!":
+            if message == CORRECT:
+                if not recorded:
+                    self._record("guess", self.guess_game.attempts)
+                    recorded = True
                 messagebox.showinfo(
                     "You Win",
                     f"Correct in {self.guess_game.attempts} attempts!",
@@ -167,34 +212,29 @@ class GameHubApp:
 
         def reset_game() -> None:
             # Reset the guessing game UI state.
+            nonlocal recorded
+            recorded = False
             self.guess_game.reset()
             result_label.config(text="Make a guess!")
             attempts_label.config(text="Attempts: 0")
             guess_entry.delete(0, tk.END)
+            # The new game's guesses start over, so the shown ones must go
+            # even if the old game had no more guesses than the new one.
+            history.clear()
 
-        ttk.Button(frame, text="Guess", command=submit_guess).grid(
+        ttk.Button(frame, text="Guess", command=remote_safe(submit_guess)).grid(
             row=0, column=2, sticky="e"
         )
-        ttk.Button(frame, text="Reset Game", command=reset_game).grid(
+        ttk.Button(frame, text="Reset Game", command=remote_safe(reset_game)).grid(
             row=3, column=0, pady=6, sticky="w"
         )
 
-        history_text = tk.Text(frame, height=6, wrap="word")
-        history_text.grid(row=4, column=0, columnspan=3, sticky="nsew", pady=6)
-        history_text.configure(state="disabled")
+        history = HistoryView(frame, "Guesses: ", "No guesses yet.")
+        history.grid(row=4, column=0, columnspan=3, sticky="nsew", pady=6)
 
         def update_history() -> None:
-            # Refresh the guess history box.
-            history_text.configure(state="normal")
-            history_text.delete("1.0", tk.END)
-            if self.guess_game.guesses:
-                history_text.insert(
-                    tk.END,
-                    "Guesses: " + ", ".join(str(g) for g in self.guess_game.guesses),
-                )
-            else:
-                history_text.insert(tk.END, "No guesses yet.")
-            history_text.configure(state="disabled")
+            # Add guesses made since the last update to the history box.
+            history.sync(self.guess_game.guesses)
 
         def submit_and_update() -> None:
             # Combine guess submission with history refresh.
@@ -206,22 +246,20 @@ class GameHubApp:
             reset_game()
             update_history()
 
-        ttk.Button(frame, text="Guess + Track", command=submit_and_update).grid(
-            row=0, column=3, sticky="e", padx=6
-        )
-        ttk.Button(frame, text="Reset + Clear", command=reset_and_update).grid(
+        ttk.Button(
+            frame, text="Guess + Track", command=remote_safe(submit_and_update)
+        ).grid(row=0, column=3, sticky="e", padx=6)
+        ttk.Button(frame, text="Reset + Clear", command=remote_safe(reset_and_update)).grid(
             row=3, column=1, pady=6, sticky="w"
         )
 
         # Initialize history display.
         update_history()
+        return frame
 
-    def _show_dice_game(self) -> None:
+    def _build_dice_game(self) -> ttk.Frame:
         # Build the Dice Roll UI.
-        self._clear_game_frame()
-
         frame = ttk.LabelFrame(self.game_frame, text="Dice Roll", padding=10)
-        frame.grid(row=0, column=0, sticky="nsew")
         frame.columnconfigure(0, weight=1)
 
         result_label = ttk.Label(frame, text="Roll the dice!")
@@ -230,43 +268,146 @@ class GameHubApp:
         roll_count = ttk.Label(frame, text="Rolls: 0")
         roll_count.grid(row=1, column=0, sticky="w", pady=4)
 
-        history_text = tk.Text(frame, height=6, wrap="word")
-        history_text.grid(row=2, column=0, sticky="nsew", pady=6)
-        history_text.configure(state="disabled")
+        counts_label = ttk.Label(frame, text="")
+        counts_label.grid(row=4, column=0, sticky="w", pady=4)
+
+        history = HistoryView(frame, "History: ", "History: none yet.")
+        history.grid(row=2, column=0, sticky="nsew", pady=6)
+
+        def update_counts() -> None:
+            # Show how often each face came up (six numbers, however many rolls).
+            counts_label.config(
+                text="   ".join(
+                    f"{face}: {self.dice_game.counts[face]}"
+                    f" ({self.dice_game.frequency(face):.0%})"
+                    for face in range(1, 7)
+                )
+            )
 
         def roll_dice() -> None:
             # Roll and update the UI.
             value = self.dice_game.roll()
             result_label.config(text=f"You rolled a {value}!")
             roll_count.config(text=f"Rolls: {len(self.dice_game.rolls)}")
-            history_text.configure(state="normal")
-            history_text.delete("1.0", tk.END)
-            history_text.insert(
-                tk.END, "History: " + ", ".join(str(r) for r in self.dice_game.rolls)
-            )
-            history_text.configure(state="disabled")
+            history.sync(self.dice_game.rolls)
+            update_counts()
 
         def reset_dice() -> None:
             # Clear history and reset UI.
-            self.dice_game.rolls.clear()
+            self.dice_game.reset()
             result_label.config(text="Roll the dice!")
             roll_count.config(text="Rolls: 0")
-            history_text.configure(state="normal")
-            history_text.delete("1.0", tk.END)
-            history_text.insert(tk.END, "History: none yet.")
-            history_text.configure(state="disabled")
+            history.clear()
+            update_counts()
 
-        ttk.Button(frame, text="Roll", command=roll_dice).grid(row=3, column=0, sticky="w")
-        ttk.Button(frame, text="Reset", command=reset_dice).grid(
+        ttk.Button(frame, text="Roll", command=remote_safe(roll_dice)).grid(
+            row=3, column=0, sticky="w"
+        )
+        ttk.Button(frame, text="Reset", command=remote_safe(reset_dice)).grid(
             row=3, column=0, sticky="e"
         )
+        update_counts()
+        self._build_simulation_panel(frame).grid(row=5, column=0, sticky="ew", pady=6)
+        return frame
+
+    def _build_simulation_panel(self, parent: ttk.Frame) -> ttk.Frame:
+        # Roll many dice on a background thread and chart the sums as they come in.
+        panel = ttk.LabelFrame(parent, text="Simulation", padding=8)
+        settings = ttk.Frame(panel)
+        settings.grid(row=0, column=0, sticky="w")
+        entries = {}
+        for column, (label, default) in enumerate(
+            (("Sides", "6"), ("Dice", "2"), ("Rolls", "1000000"))
+        ):
+            ttk.Label(settings, text=f"{label}:").grid(
+                row=0, column=column * 2, sticky="w"
+            )
+            entry = ttk.Entry(settings, width=10 if label == "Rolls" else 4)
+            entry.insert(0, default)
+            entry.grid(row=0, column=column * 2 + 1, sticky="w", padx=(2, 8))
+            entries[label] = entry
+
+        status_label = ttk.Label(panel, text="Press Start to roll.")
+        status_label.grid(row=2, column=0, sticky="w", pady=4)
+        chart = tk.Canvas(panel, width=420, height=140, background="white")
+        chart.grid(row=3, column=0, sticky="ew")
+
+        worker: SimulationWorker | None = None
+
+        def draw(stats: DiceStats) -> None:
+            # Bars are the rolled share of each sum; red ticks are the exact odds.
+            # Wide ranges of sums are grouped so there are at most CHART_BARS bars.
+            chart.delete("all")
+            expected = worker.expected
+            width = max(chart.winfo_width(), 420)
+            height = int(chart.cget("height"))
+            totals = range(stats.dice, len(expected))
+            group = -(-len(totals) // CHART_BARS)
+            bars = range(0, len(totals), group)
+            peak = max(expected) * group * 1.2
+            bar_width = width / len(bars)
+            for position, first in enumerate(bars):
+                group_totals = totals[first:first + group]
+                rolled = sum(stats.sum_frequency(total) for total in group_totals)
+                exact = sum(expected[total] for total in group_totals)
+                x = position * bar_width
+                top = height - rolled / peak * (height - 10)
+                chart.create_rectangle(
+                    x + 1, top, x + bar_width - 1, height, fill="#4a7ebb", width=0
+                )
+                mark = height - exact / peak * (height - 10)
+                chart.create_line(x, mark, x + bar_width, mark, fill="red", width=2)
+            status_label.config(
+                text=f"Rolled {stats.rolls:,} of {worker.total_rolls:,}"
+                f" — average sum {stats.mean():.3f}"
+                f" (exact {stats.dice * (stats.sides + 1) / 2:.3f})"
+            )
 
-    def _show_quiz_game(self) -> None:
-        # Build the Quiz UI.
-        self._clear_game_frame()
+        def poll() -> None:
+            # Show the newest histograms; keep polling while the worker runs.
+            if worker is None:
+                return
+            stats = worker.latest()
+            if stats is not None:
+                draw(stats)
+            if worker.running():
+                self.root.after(100, poll)
+            else:
+                start_button.state(["!disabled"])
+
+        def start() -> None:
+            # Check the settings and start a new background simulation.
+            nonlocal worker
+            try:
+                sides, dice, rolls = (
+                    int(entries[key].get().replace(",", ""))
+                    for key in ("Sides", "Dice", "Rolls")
+                )
+            except ValueError:
+                messagebox.showerror("Invalid Settings", "Enter whole numbers.")
+                return
+            try:
+                worker = SimulationWorker(sides, dice, rolls)
+            except ValueError as exc:
+                messagebox.showerror("Invalid Settings", str(exc))
+                return
+            start_button.state(["disabled"])
+            status_label.config(text="Rolling…")
+            poll()
+
+        def stop() -> None:
+            # Let the worker finish its current chunk, then stop.
+            if worker is not None:
+                worker.stop()
 
+        start_button = ttk.Button(settings, text="Start", command=start)
+        start_button.grid(row=0, column=6, padx=4)
+        ttk.Button(settings, text="Stop", command=stop).grid(row=0, column=7)
+        return panel
+
+    def _build_quiz_game(self) -> ttk.Frame:
+        # Build the Quiz UI.
         frame = ttk.LabelFrame(self.game_frame, text="Quiz Game", padding=10)
-        frame.grid(row=0, column=0, sticky="nsew")
         frame.columnconfigure(0, weight=1)
 
         question_label = ttk.Label(frame, text=self.quiz_game.current_question())
@@ -295,16 +436,17 @@ class GameHubApp:
             correct = self.quiz_game.answer(response)
             feedback_label.config(text="Correct!" if correct else "Not quite.")
             score_label.config(
-                text=f"Score: {self.quiz_game.score}/{len(self.quiz_game.questions)}"
+                text=f"Score: {self.quiz_game.score}/{self.quiz_game.total}"
             )
             answer_entry.delete(0, tk.END)
 
             if self.quiz_game.has_more():
                 question_label.config(text=self.quiz_game.current_question())
             else:
+                self._record("quiz", self.quiz_game.score, self.quiz_game.total)
                 messagebox.showinfo(
                     "Quiz Complete",
-                    f"Final score: {self.quiz_game.score}/{len(self.quiz_game.questions)}",
+                    f"Final score: {self.quiz_game.score}/{self.quiz_game.total}",
                 )
 
         def reset_quiz() -> None:
@@ -315,20 +457,262 @@ class GameHubApp:
             score_label.config(text="Score: 0")
             answer_entry.delete(0, tk.END)
 
-        ttk.Button(frame, text="Submit", command=submit_answer).grid(
+        ttk.Button(frame, text="Submit", command=remote_safe(submit_answer)).grid(
             row=4, column=0, sticky="w"
         )
-        ttk.Button(frame, text="Reset Quiz", command=reset_quiz).grid(
+        ttk.Button(frame, text="Reset Quiz", command=remote_safe(reset_quiz)).grid(
             row=4, column=0, sticky="e"
         )
+        return frame
+
+    def _build_leaderboard(self) -> ttk.Frame:
+        # Build the leaderboard UI: stats and the best results of each game.
+        frame = ttk.LabelFrame(self.game_frame, text="Leaderboard", padding=10)
+        titles = {"guess": "Guess the Number (fewest attempts)", "quiz": "Quiz Game (highest % right)"}
+        self._board_views: dict[str, tuple[ttk.Label, ttk.Treeview]] = {}
+        for column, game in enumerate(LOWER_IS_BETTER):
+            frame.columnconfigure(column, weight=1)
+            ttk.Label(frame, text=titles[game]).grid(row=0, column=column, sticky="w", padx=4)
+            stats_label = ttk.Label(frame, text="")
+            stats_label.grid(row=1, column=column, sticky="w", padx=4, pady=4)
+            tree = ttk.Treeview(
+                frame, columns=("rank", "player", "score"), show="headings", height=10
+            )
+            for name, heading, width in (
+                ("rank", "#", 30), ("player", "Player", 120), ("score", "Score", 60)
+            ):
+                tree.heading(name, text=heading)
+                tree.column(name, width=width, anchor="w" if name == "player" else "e")
+            tree.grid(row=2, column=column, sticky="nsew", padx=4)
+            self._board_views[game] = (stats_label, tree)
+        return frame
+
+    def _refresh_leaderboard(self) -> None:
+        # Fill the leaderboard from the top-k heaps and running stats.
+        for game, (stats_label, tree) in self._board_views.items():
+            stats = self.leaderboard.stats[game]
+            unit = "%" if game in PERCENT_GAMES else ""
+            if stats.games:
+                stats_label.config(
+                    text=f"Games: {stats.games}  Average: {stats.average():.2f}{unit}"
+                    f"  Best: {stats.best}{unit}  Worst: {stats.worst}{unit}"
+                )
+            else:
+                stats_label.config(text="No games yet.")
+            tree.delete(*tree.get_children())
+            for rank, (player, score) in enumerate(self.leaderboard.top(game), 1):
+                tree.insert("", tk.END, values=(rank, player, f"{score}{unit}"))
+
+
+def positive_int(text: str) -> int:
+    # argparse type for counts that must be at least 1.
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+def main(argv: list[str] | None = None) -> None:
+    # Open the window, or run a headless command (`simulate`, `build-bank`,
+    # `serve`, `load`, `record`, `replay`).
+    parser = argparse.ArgumentParser(description="Mini Game Hub")
+    parser.add_argument(
+        "--server", metavar="HOST:PORT", help="play on a game server started with `serve`"
+    )
+    parser.add_argument("--bank", help="draw quiz questions from this question bank")
+    parser.add_argument("--category", help="only ask questions from this category")
+    parser.add_argument("--difficulty", type=int, help="only ask questions of this difficulty")
+    parser.add_argument(
+        "--seed", dest="game_seed", type=int,
+        help="seed the games (or the server) so they play the same every time",
+    )
+    parser.add_argument(
+        "--record", metavar="LOG", help="save every move to a replay log (local games only)"
+    )
+    sub = parser.add_subparsers(dest="command")
+    build_bank = sub.add_parser(
+        "build-bank", help="turn a CSV of questions into a question bank file"
+    )
+    build_bank.add_argument("csv", help="columns: category, difficulty, question, answer")
+    build_bank.add_argument("out")
+    simulate = sub.add_parser(
+        "simulate", help="let guessing strategies play many games of Guess the Number"
+    )
+    simulate.add_argument(
+        "--strategy", choices=[*STRATEGIES, "all"], default="all"
+    )
+    simulate.add_argument("--games", type=positive_int, default=1_000_000)
+    simulate.add_argument("--low", type=parse_bound, default=1)
+    simulate.add_argument(
+        "--high", type=parse_bound, default=20, help="top of the range, e.g. 1000 or 2**63"
+    )
+    simulate.add_argument("--secrets", choices=SECRETS, default="uniform")
+    simulate.add_argument("--seed", type=int, default=0)
+    simulate.add_argument(
+        "--workers", type=positive_int, default=None,
+        help="processes to use (default: all cores)",
+    )
+    serve = sub.add_parser("serve", help="host games for many players over TCP")
+    serve.add_argument("--host", default=DEFAULT_HOST)
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument(
+        "--idle-timeout", type=float, default=IDLE_TIMEOUT,
+        help="seconds before an unused session is dropped",
+    )
+    load = sub.add_parser("load", help="measure a game server with many simulated players")
+    load.add_argument("--host", default=DEFAULT_HOST)
+    load.add_argument("--port", type=int, default=DEFAULT_PORT)
+    load.add_argument("--connections", type=positive_int, default=100)
+    load.add_argument("--sessions", type=positive_int, default=20_000)
+    load.add_argument("--requests", type=positive_int, default=200_000)
+    load.add_argument("--seed", type=int, default=0)
+    load.add_argument(
+        "--spawn", action="store_true", help="start a local server for the test"
+    )
+    record = sub.add_parser("record", help="play many games headlessly into a replay log")
+    record.add_argument("log")
+    record.add_argument("--games", type=positive_int, default=10_000, help="games of each kind")
+    record.add_argument("--seed", type=int, default=0)
+    replay_cmd = sub.add_parser(
+        "replay", help="re-run a replay log and check every outcome still matches"
+    )
+    replay_cmd.add_argument("log")
+    args = parser.parse_args(argv)
+
+    if args.command == "simulate":
+        strategies = list(STRATEGIES) if args.strategy == "all" else [args.strategy]
+        for strategy in strategies:
+            try:
+                attempts, seconds = run_simulation(
+                    strategy, args.games, args.low, args.high,
+                    args.secrets, args.seed, args.workers,
+                )
+            except ValueError as exc:
+                print(f"Simulation failed: {exc}", file=sys.stderr)
+                sys.exit(1)
+            print(format_report(strategy, attempts, seconds))
+        return
+    if args.command == "build-bank":
+        try:
+            count = write_bank(args.out, read_csv(args.csv))
+        except (OSError, KeyError, ValueError) as exc:
+            print(f"Could not build the bank: {exc}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Wrote {count:,} questions to {args.out}.")
+        return
+
+    if args.command == "load":
+        server = start_local_server(args.port) if args.spawn else None
+        try:
+            print(
+                run_load(
+                    args.host, args.port, args.connections,
+                    args.sessions, args.requests, args.seed,
+                )
+            )
+        except (OSError, ValueError) as exc:
+            print(f"Load test failed: {exc}", file=sys.stderr)
+            sys.exit(1)
+        finally:
+            if server:
+                server.terminate()
+        return
+
+    if args.command == "record":
+        try:
+            size = record_games(args.log, args.games, args.seed)
+        except OSError as exc:
+            print(f"Could not record: {exc}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Recorded {args.games * 3:,} games to {args.log} ({size:,} bytes).")
+        return
+
+    bank = None
+    if args.bank:
+        try:
+            bank = QuestionBank(args.bank)
+        except (OSError, ValueError) as exc:
+            print(f"Could not open the question bank: {exc}", file=sys.stderr)
+            sys.exit(1)
+
+    if args.command == "replay":
+        try:
+            report = replay(args.log, bank)
+        except (OSError, ValueError) as exc:
+            print(f"Replay failed: {exc}", file=sys.stderr)
+            sys.exit(1)
+        print(
+            f"{report.games:,} games, {report.records:,} records in {report.seconds:.2f} s"
+            f" ({report.records / max(report.seconds, 1e-9):,.0f} records/s)"
+        )
+        if report.truncated:
+            print("The log ends part-way through a record; the rest was replayed.")
+        for message in report.mismatches:
+            print(message)
+        print(f"{report.mismatch_count:,} outcomes differ from the log.")
+        sys.exit(1 if report.mismatch_count else 0)
+
+    if args.command == "serve":
+        print(f"Serving games on {args.host}:{args.port}")
+        rng = None if args.game_seed is None else stream(args.game_seed, "server")
+        try:
+            server = GameServer(bank, args.idle_timeout, rng)
+            asyncio.run(server.serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.server and args.record:
+        parser.error("--record only works with local games, not --server")
+    games = {}
+    log = None
+    seed = args.game_seed
+    if args.record and seed is None:
+        seed = fresh_seed()
+    try:
+        if args.record:
+            log = ReplayWriter(args.record)
+            print(f"Recording to {args.record} with seed {seed}")
+            games = {
+                "guess_game": RecordedGuessGame(log, derive_seed(seed, "guess")),
+                "dice_game": RecordedDiceGame(log, derive_seed(seed, "dice")),
+                "quiz_game": RecordedQuizGame(
+                    log, derive_seed(seed, "quiz"), bank, args.category, args.difficulty
+                ),
+            }
+        elif args.server:
+            host, _, port = args.server.rpartition(":")
+            client = GameClient(host or DEFAULT_HOST, int(port))
+            games = {
+                "guess_game": RemoteGuessGame(client),
+                "dice_game": RemoteDiceGame(client),
+                "quiz_game": RemoteQuizGame(client),
+            }
+        elif seed is not None:
+            games = {
+                "guess_game": GuessTheNumberGame(rng=stream(seed, "guess")),
+                "dice_game": DiceRollGame(stream(seed, "dice")),
+                "quiz_game": QuizGame(
+                    bank, category=args.category, difficulty=args.difficulty,
+                    rng=stream(seed, "quiz"),
+                ),
+            }
+        elif bank:
+            games["quiz_game"] = QuizGame(
+                bank, category=args.category, difficulty=args.difficulty
+            )
+    except (OSError, ValueError, ServerError) as exc:
+        print(f"Could not start the games: {exc}", file=sys.stderr)
+        sys.exit(1)
 
-
-def main() -> None:
     # Create the window and start the app.
     root = tk.Tk()
-    app = GameHubApp(root)
+    app = GameHubApp(root, **games)
+    root.protocol("WM_DELETE_WINDOW", app.close)
     root.minsize(560, 520)
     root.mainloop()
+    if log:
+        log.close()
 
 
 if __name__ == "__main__":
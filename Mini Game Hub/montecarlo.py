@@ -0,0 +1,156 @@
+import random
+import threading
+from collections import Counter
+from collections.abc import Iterator
+
+# Rolls generated per chunk; small enough that each chunk takes a few ms.
+CHUNK_ROLLS = 100_000
+MAX_SIDES = 255
+MAX_DICE = 50
+MAX_ROLLS = 100_000_000
+
+
+def face_table(sides: int) -> tuple[bytes, bytes]:
+    # Translate table turning a random byte into a face 1..sides, plus the
+    # bytes to drop so every face stays equally likely (rejection sampling).
+    usable = 256 - 256 % sides
+    table = bytes(value % sides + 1 if value < usable else 0 for value in range(256))
+    return table, bytes(range(usable, 256))
+
+
+def random_faces(rng: random.Random, sides: int, count: int) -> bytes:
+    # Exactly `count` fair die faces, one per byte.
+    table, rejected = face_table(sides)
+    faces = b""
+    while len(faces) < count:
+        # Ask for a few extra bytes to cover the ones that get dropped.
+        need = count - len(faces)
+        raw = rng.randbytes(need + need * len(rejected) // 256 + 16)
+        faces += raw.translate(table, rejected)
+    return faces[:count]
+
+
+def exact_sum_distribution(sides: int, dice: int) -> list[float]:
+    # probabilities[total] of the sum of `dice` fair dice. Each extra die
+    # averages a sliding window of `sides` entries, kept as a running sum.
+    probabilities = [1.0]
+    for _ in range(dice):
+        rolled = [0.0] * (len(probabilities) + sides)
+        window = 0.0
+        for total in range(1, len(rolled)):
+            if total - 1 < len(probabilities):
+                window += probabilities[total - 1]
+            if total - 1 - sides >= 0:
+                window -= probabilities[total - 1 - sides]
+            rolled[total] = window / sides
+        probabilities = rolled
+    return probabilities
+
+
+# Running histograms of a dice simulation; individual rolls are not kept.
+class DiceStats:
+    def __init__(self, sides: int, dice: int) -> None:
+        self.sides = sides
+        self.dice = dice
+        # Number of rolls so far (each roll throws `dice` dice).
+        self.rolls = 0
+        # face_counts[face] over every die thrown; sum_counts[total] per roll.
+        self.face_counts = [0] * (sides + 1)
+        self.sum_counts = [0] * (sides * dice + 1)
+
+    def add(self, faces: bytes) -> None:
+        # Count a chunk of faces, `dice` consecutive faces per roll.
+        for face in range(1, self.sides + 1):
+            self.face_counts[face] += faces.count(face)
+        if self.dice == 1:
+            for face in range(1, self.sides + 1):
+                self.sum_counts[face] = self.face_counts[face]
+        else:
+            totals = Counter(map(sum, zip(*[iter(faces)] * self.dice)))
+            for total, count in totals.items():
+                self.sum_counts[total] += count
+        self.rolls += len(faces) // self.dice
+
+    def sum_frequency(self, total: int) -> float:
+        return self.sum_counts[total] / self.rolls if self.rolls else 0.0
+
+    def mean(self) -> float:
+        # Average sum per roll.
+        if not self.rolls:
+            return 0.0
+        return sum(total * count for total, count in enumerate(self.sum_counts)) / self.rolls
+
+    def copy(self) -> "DiceStats":
+        stats = DiceStats(self.sides, self.dice)
+        stats.rolls = self.rolls
+        stats.face_counts = self.face_counts.copy()
+        stats.sum_counts = self.sum_counts.copy()
+        return stats
+
+
+def simulate(
+    sides: int,
+    dice: int,
+    rolls: int,
+    rng: random.Random | None = None,
+    chunk_rolls: int = CHUNK_ROLLS,
+) -> Iterator[DiceStats]:
+    # Roll `dice` dice with `sides` sides, `rolls` times, in chunks. Yields
+    # the same running DiceStats after every chunk. Bad settings raise
+    # ValueError straight away, before any rolling starts.
+    if not 2 <= sides <= MAX_SIDES:
+        raise ValueError(f"sides must be from 2 to {MAX_SIDES}")
+    if not 1 <= dice <= MAX_DICE:
+        raise ValueError(f"dice must be from 1 to {MAX_DICE}")
+    if not 1 <= rolls <= MAX_ROLLS:
+        raise ValueError(f"rolls must be from 1 to {MAX_ROLLS:,}")
+    return _simulate_chunks(sides, dice, rolls, rng or random.Random(), chunk_rolls)
+
+
+def _simulate_chunks(
+    sides: int, dice: int, rolls: int, rng: random.Random, chunk_rolls: int
+) -> Iterator[DiceStats]:
+    stats = DiceStats(sides, dice)
+    while stats.rolls < rolls:
+        batch = min(chunk_rolls, rolls - stats.rolls)
+        stats.add(random_faces(rng, sides, batch * dice))
+        yield stats
+
+
+# Runs simulate() on a background thread. The UI thread polls latest() for a
+# copy of the newest histograms, so it never waits on the simulation.
+class SimulationWorker:
+    def __init__(
+        self, sides: int, dice: int, rolls: int, rng: random.Random | None = None
+    ) -> None:
+        self.total_rolls = rolls
+        self._chunks = simulate(sides, dice, rolls, rng)
+        self._sides = sides
+        self._dice = dice
+        # Exact odds of each sum, worked out on the thread before rolling.
+        self.expected: list[float] = []
+        self._lock = threading.Lock()
+        self._latest: DiceStats | None = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        self.expected = exact_sum_distribution(self._sides, self._dice)
+        for stats in self._chunks:
+            snapshot = stats.copy()
+            with self._lock:
+                self._latest = snapshot
+            if self._stop.is_set():
+                return
+
+    def latest(self) -> DiceStats | None:
+        with self._lock:
+            return self._latest
+
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def stop(self) -> None:
+        # Ask the worker to finish after its current chunk.
+        self._stop.set()
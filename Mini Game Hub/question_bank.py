@@ -0,0 +1,163 @@
+import bisect
+import csv
+import mmap
+import random
+import struct
+from collections.abc import Iterable, Iterator
+
+
+# File header: magic bytes, number of questions, categories, groups.
+HEADER = struct.Struct("<8sIHH")
+MAGIC = b"QUIZBNK1"
+# Length of one category name, followed by its UTF-8 bytes.
+NAME_LENGTH = struct.Struct("<H")
+# One group = all questions of a category and difficulty: category number,
+# difficulty, first question number, number of questions.
+GROUP = struct.Struct("<HBxII")
+# The offset index holds count + 1 of these; question i is stored between
+# offsets i and i + 1 of the data block.
+OFFSET = struct.Struct("<I")
+OFFSET_PAIR = struct.Struct("<II")
+# Separates the question from the answer inside a record.
+SEPARATOR = b"\0"
+MAX_DIFFICULTY = 255
+
+
+def write_bank(path: str, questions: Iterable[tuple[str, int, str, str]]) -> int:
+    # Write (category, difficulty, question, answer) rows as a bank file and
+    # return how many were written. Rows are grouped by category and
+    # difficulty, so a filter always covers whole runs of question numbers.
+    groups: dict[tuple[str, int], list[bytes]] = {}
+    for category, difficulty, question, answer in questions:
+        if not 0 <= difficulty <= MAX_DIFFICULTY:
+            raise ValueError(f"difficulty must be from 0 to {MAX_DIFFICULTY}")
+        record = question.encode() + SEPARATOR + answer.encode()
+        if record.count(SEPARATOR) != 1:
+            raise ValueError("questions and answers cannot contain NUL characters")
+        groups.setdefault((category, difficulty), []).append(record)
+
+    categories = sorted({category for category, _ in groups})
+    category_numbers = {name: number for number, name in enumerate(categories)}
+    keys = sorted(groups, key=lambda key: (category_numbers[key[0]], key[1]))
+    count = sum(len(records) for records in groups.values())
+
+    with open(path, "wb") as handle:
+        handle.write(HEADER.pack(MAGIC, count, len(categories), len(keys)))
+        for name in categories:
+            encoded = name.encode()
+            handle.write(NAME_LENGTH.pack(len(encoded)) + encoded)
+        first = 0
+        for key in keys:
+            size = len(groups[key])
+            handle.write(GROUP.pack(category_numbers[key[0]], key[1], first, size))
+            first += size
+        offset = 0
+        for key in keys:
+            for record in groups[key]:
+                handle.write(OFFSET.pack(offset))
+                offset += len(record)
+        handle.write(OFFSET.pack(offset))
+        for key in keys:
+            handle.writelines(groups[key])
+    return count
+
+
+def read_csv(path: str) -> Iterator[tuple[str, int, str, str]]:
+    # Rows of a CSV file with category, difficulty, question, answer columns.
+    with open(path, newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            yield row["category"], int(row["difficulty"]), row["question"], row["answer"]
+
+
+def sample_positions(rng: random.Random, total: int) -> Iterator[int]:
+    # Every number in 0..total-1 once, in random order, without building the
+    # full list: a Fisher-Yates shuffle that only remembers the swaps made so
+    # far, so memory grows with the draws, not with `total`.
+    swapped: dict[int, int] = {}
+    for drawn in range(total):
+        pick = rng.randrange(drawn, total)
+        yield swapped.get(pick, pick)
+        swapped[pick] = swapped.pop(drawn, drawn)
+
+
+# Read-only, memory-mapped question bank. Opening it reads only the header,
+# the category names and the group table; each question is decoded from the
+# map when asked for, so start-up time and memory do not grow with the bank.
+class QuestionBank:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, category_count, group_count = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a question bank file")
+        position = HEADER.size
+        self.categories: list[str] = []
+        for _ in range(category_count):
+            (length,) = NAME_LENGTH.unpack_from(self._map, position)
+            position += NAME_LENGTH.size
+            self.categories.append(self._map[position:position + length].decode())
+            position += length
+        # (category, difficulty, first question number, number of questions)
+        self.groups: list[tuple[str, int, int, int]] = []
+        for _ in range(group_count):
+            category, difficulty, first, size = GROUP.unpack_from(self._map, position)
+            self.groups.append((self.categories[category], difficulty, first, size))
+            position += GROUP.size
+        self._index_start = position
+        self._data_start = position + (self.count + 1) * OFFSET.size
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def question(self, number: int) -> tuple[str, str]:
+        # (question, answer) for one question number, read straight from the map.
+        if not 0 <= number < self.count:
+            raise IndexError(f"question {number} is not in the bank")
+        start, end = OFFSET_PAIR.unpack_from(
+            self._map, self._index_start + number * OFFSET.size
+        )
+        record = self._map[self._data_start + start:self._data_start + end]
+        question, answer = record.split(SEPARATOR)
+        return question.decode(), answer.decode()
+
+    def difficulties(self) -> list[int]:
+        return sorted({difficulty for _, difficulty, _, _ in self.groups})
+
+    def ranges(
+        self, category: str | None = None, difficulty: int | None = None
+    ) -> list[range]:
+        # Question numbers matching the filter, as one range per group.
+        return [
+            range(first, first + size)
+            for group_category, group_difficulty, first, size in self.groups
+            if category in (None, group_category)
+            and difficulty in (None, group_difficulty)
+        ]
+
+    def matching(self, category: str | None = None, difficulty: int | None = None) -> int:
+        # How many questions match the filter.
+        return sum(len(numbers) for numbers in self.ranges(category, difficulty))
+
+    def sample(
+        self,
+        rng: random.Random,
+        category: str | None = None,
+        difficulty: int | None = None,
+    ) -> Iterator[int]:
+        # Question numbers matching the filter in random order, each once.
+        ranges = self.ranges(category, difficulty)
+        # Position (in the filtered list) of the first question of each range.
+        starts = []
+        total = 0
+        for numbers in ranges:
+            starts.append(total)
+            total += len(numbers)
+        for position in sample_positions(rng, total):
+            group = bisect.bisect_right(starts, position) - 1
+            yield ranges[group][position - starts[group]]
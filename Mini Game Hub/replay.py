@@ -0,0 +1,273 @@
+import random
+import struct
+import time
+from typing import BinaryIO
+
+from games import CORRECT, TOO_HIGH, TOO_LOW, DiceRollGame, GuessTheNumberGame, QuizGame
+from question_bank import QuestionBank
+from simulator import BinarySearchStrategy
+from streams import derive_seed, stream
+
+
+# File header: magic bytes and format version.
+HEADER = struct.Struct("<8sH")
+MAGIC = b"GAMELOG1"
+VERSION = 1
+# Every record starts with its type and the game it belongs to, so many
+# games can be interleaved in one log.
+RECORD = struct.Struct("<BI")
+NEW_GUESS, NEW_DICE, NEW_QUIZ, GUESS, ROLL, ANSWER, RESET = range(1, 8)
+# Record payloads after RECORD:
+#   NEW_GUESS  seed, low, high
+#   NEW_DICE   seed
+#   NEW_QUIZ   seed, difficulty (-1 = any), category length, then category
+#   GUESS      guess, hint code
+#   ROLL       face
+#   ANSWER     correct (0/1), answer length, then the answer text
+#   RESET      nothing
+NEW_GUESS_DATA = struct.Struct("<QQQ")
+SEED_DATA = struct.Struct("<Q")
+NEW_QUIZ_DATA = struct.Struct("<QhH")
+GUESS_DATA = struct.Struct("<QB")
+ROLL_DATA = struct.Struct("<B")
+ANSWER_DATA = struct.Struct("<BH")
+HINT_CODES = {TOO_LOW: 0, TOO_HIGH: 1, CORRECT: 2}
+# Mismatches kept in a ReplayReport for printing (all are counted).
+MISMATCH_LIMIT = 20
+
+
+def engine_rng(seed: int) -> random.Random:
+    # The generator a recorded engine plays with; replay builds the same one.
+    return stream(seed, "engine")
+
+
+# Writes the binary replay log. Buffered; call flush() or close() to save.
+class ReplayWriter:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._handle: BinaryIO = open(path, "wb")
+        self._handle.write(HEADER.pack(MAGIC, VERSION))
+        self.next_game = 0
+
+    def new_game(self) -> int:
+        self.next_game += 1
+        return self.next_game
+
+    def write(self, kind: int, game: int, data: bytes = b"") -> None:
+        self._handle.write(RECORD.pack(kind, game) + data)
+
+    def flush(self) -> None:
+        self._handle.flush()
+
+    def size(self) -> int:
+        # Bytes written so far.
+        return self._handle.tell()
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+# The games below play exactly like the normal ones, with a seeded
+# generator, and write each action and its outcome to a ReplayWriter.
+class RecordedGuessGame(GuessTheNumberGame):
+    def __init__(self, log: ReplayWriter, seed: int, low: int = 1, high: int = 20) -> None:
+        self.log = log
+        self.game_id = log.new_game()
+        self._recording = False
+        log.write(NEW_GUESS, self.game_id, NEW_GUESS_DATA.pack(seed, low, high))
+        super().__init__(low, high, engine_rng(seed))
+        self._recording = True
+
+    def reset(self, secret: int | None = None) -> None:
+        super().reset(secret)
+        if self._recording:
+            self.log.write(RESET, self.game_id)
+
+    def make_guess(self, guess: int) -> str:
+        hint = super().make_guess(guess)
+        self.log.write(GUESS, self.game_id, GUESS_DATA.pack(guess, HINT_CODES[hint]))
+        return hint
+
+
+class RecordedDiceGame(DiceRollGame):
+    def __init__(self, log: ReplayWriter, seed: int) -> None:
+        self.log = log
+        self.game_id = log.new_game()
+        log.write(NEW_DICE, self.game_id, SEED_DATA.pack(seed))
+        super().__init__(engine_rng(seed))
+
+    def roll(self) -> int:
+        value = super().roll()
+        self.log.write(ROLL, self.game_id, ROLL_DATA.pack(value))
+        return value
+
+    def reset(self) -> None:
+        super().reset()
+        self.log.write(RESET, self.game_id)
+
+
+class RecordedQuizGame(QuizGame):
+    def __init__(
+        self,
+        log: ReplayWriter,
+        seed: int,
+        bank: QuestionBank | None = None,
+        category: str | None = None,
+        difficulty: int | None = None,
+    ) -> None:
+        self.log = log
+        self.game_id = log.new_game()
+        self._recording = False
+        name = (category or "").encode()
+        log.write(
+            NEW_QUIZ,
+            self.game_id,
+            NEW_QUIZ_DATA.pack(seed, -1 if difficulty is None else difficulty, len(name))
+            + name,
+        )
+        super().__init__(
+            bank, category=category, difficulty=difficulty, rng=engine_rng(seed)
+        )
+        self._recording = True
+
+    def answer(self, response: str) -> bool:
+        correct = super().answer(response)
+        text = response.encode()
+        self.log.write(ANSWER, self.game_id, ANSWER_DATA.pack(correct, len(text)) + text)
+        return correct
+
+    def reset(self) -> None:
+        super().reset()
+        if self._recording:
+            self.log.write(RESET, self.game_id)
+
+
+# Result of replaying a log: how many records, how many outcomes differed
+# from the recording, the first few differences, and the time taken.
+class ReplayReport:
+    def __init__(self) -> None:
+        self.records = 0
+        self.games = 0
+        self.mismatch_count = 0
+        # True if the log ended part-way through a record (a crash while
+        # recording); everything before it was still replayed.
+        self.truncated = False
+        self.mismatches: list[str] = []
+        self.seconds = 0.0
+
+    def mismatch(self, message: str) -> None:
+        self.mismatch_count += 1
+        if len(self.mismatches) < MISMATCH_LIMIT:
+            self.mismatches.append(message)
+
+
+def replay(path: str, bank: QuestionBank | None = None) -> ReplayReport:
+    # Re-run every recorded game without a window and check each outcome
+    # against the one in the log. Quizzes that used a bank need that bank.
+    with open(path, "rb") as handle:
+        data = handle.read()
+    report = ReplayReport()
+    magic, version = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a replay log this version can read")
+    hints = {code: hint for hint, code in HINT_CODES.items()}
+    games: dict[int, GuessTheNumberGame | DiceRollGame | QuizGame] = {}
+    start = time.perf_counter()
+    position = HEADER.size
+    end = len(data)
+    try:
+        while position < end:
+            kind, game_id = RECORD.unpack_from(data, position)
+            position += RECORD.size
+            report.records += 1
+            if kind == GUESS:
+                guess, code = GUESS_DATA.unpack_from(data, position)
+                position += GUESS_DATA.size
+                if code not in hints:
+                    raise ValueError(
+                        f"{path}: record {report.records} (game {game_id})"
+                        f" has unknown hint code {code}"
+                    )
+                hint = games[game_id].make_guess(guess)
+                if hint != hints[code]:
+                    report.mismatch(
+                        f"record {report.records} (game {game_id}): guess {guess}"
+                        f" gave {hint!r}, log has {hints[code]!r}"
+                    )
+            elif kind == ROLL:
+                (face,) = ROLL_DATA.unpack_from(data, position)
+                position += ROLL_DATA.size
+                value = games[game_id].roll()
+                if value != face:
+                    report.mismatch(
+                        f"record {report.records} (game {game_id}): rolled {value},"
+                        f" log has {face}"
+                    )
+            elif kind == ANSWER:
+                correct, length = ANSWER_DATA.unpack_from(data, position)
+                position += ANSWER_DATA.size
+                if position + length > end:
+                    raise struct.error("answer text cut short")
+                response = data[position:position + length].decode()
+                position += length
+                verdict = games[game_id].answer(response)
+                if verdict != bool(correct):
+                    report.mismatch(
+                        f"record {report.records} (game {game_id}): answer {response!r}"
+                        f" marked {verdict}, log has {bool(correct)}"
+                    )
+            elif kind == RESET:
+                games[game_id].reset()
+            elif kind == NEW_GUESS:
+                seed, low, high = NEW_GUESS_DATA.unpack_from(data, position)
+                position += NEW_GUESS_DATA.size
+                games[game_id] = GuessTheNumberGame(low, high, engine_rng(seed))
+                report.games += 1
+            elif kind == NEW_DICE:
+                (seed,) = SEED_DATA.unpack_from(data, position)
+                position += SEED_DATA.size
+                games[game_id] = DiceRollGame(engine_rng(seed))
+                report.games += 1
+            elif kind == NEW_QUIZ:
+                seed, difficulty, length = NEW_QUIZ_DATA.unpack_from(data, position)
+                position += NEW_QUIZ_DATA.size
+                category = data[position:position + length].decode() or None
+                position += length
+                games[game_id] = QuizGame(
+                    bank,
+                    category=category,
+                    difficulty=None if difficulty < 0 else difficulty,
+                    rng=engine_rng(seed),
+                )
+                report.games += 1
+            else:
+                raise ValueError(f"unknown record type {kind} at byte {position - RECORD.size}")
+    except struct.error:
+        report.truncated = True
+    except KeyError as exc:
+        raise ValueError(f"{path}: record for game {exc} before the game started") from None
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def record_games(path: str, games: int, seed: int) -> int:
+    # Play `games` games of each kind headlessly and record them: binary
+    # search for Guess the Number, 10 rolls per dice game, and quizzes
+    # answered from a fixed list. Returns the log size in bytes.
+    log = ReplayWriter(path)
+    answers = stream(seed, "answers")
+    player = BinarySearchStrategy(stream(seed, "player"))
+    for n in range(games):
+        guess_game = RecordedGuessGame(log, derive_seed(seed, "guess", n), 1, 1000)
+        player.start(guess_game.low, guess_game.high)
+        while (hint := guess_game.make_guess(guess := player.next_guess())) != CORRECT:
+            player.feedback(guess, hint)
+        dice_game = RecordedDiceGame(log, derive_seed(seed, "dice", n))
+        for _ in range(10):
+            dice_game.roll()
+        quiz_game = RecordedQuizGame(log, derive_seed(seed, "quiz", n))
+        while quiz_game.has_more():
+            quiz_game.answer(answers.choice(["Paris", "seven", "Mars", "Pariss", "no idea"]))
+    size = log.size()
+    log.close()
+    return size
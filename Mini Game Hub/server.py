@@ -0,0 +1,191 @@
+import asyncio
+import random
+import time
+from collections import OrderedDict
+
+from games import DiceRollGame, GuessTheNumberGame, QuizGame
+from question_bank import QuestionBank
+from simulator import MAX_HIGH
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Sessions unused for this many seconds are dropped.
+IDLE_TIMEOUT = 300.0
+# How often the server looks for idle sessions.
+EVICT_INTERVAL = 5.0
+GAMES = ("guess", "dice", "quiz")
+# Moves one session may make before it must be reset. Sessions reuse the
+# local games, which keep every guess and roll, so without a limit one busy
+# client could grow a session without end. Halving 1..2**63 takes at most
+# 64 guesses; rolls are one byte each.
+MAX_GUESSES = 200
+MAX_ROLLS = 10_000
+# Reply to any command naming a session the server does not have (never
+# created, ended, or dropped for being idle).
+UNKNOWN_SESSION = "ERR unknown session"
+
+
+# One player's game on the server. __slots__ keeps each one to a few fields
+# with no per-object dict, since the server may hold tens of thousands.
+class Session:
+    __slots__ = ("kind", "game", "last_used")
+
+    def __init__(
+        self, kind: str, game: GuessTheNumberGame | DiceRollGame | QuizGame, now: float
+    ) -> None:
+        self.kind = kind
+        self.game = game
+        self.last_used = now
+
+
+# Holds every session and answers protocol lines. One line in, one line out:
+#   NEW guess [low high]  -> OK <id> <low> <high>
+#   NEW dice              -> OK <id>
+#   NEW quiz              -> OK <id> <questions>
+#   GUESS <id> <number>   -> OK <attempts> <hint>
+#   ROLL <id>             -> OK <face>
+#   QUESTION <id>         -> OK <question>
+#   ANSWER <id> <text>    -> OK correct|wrong <score>
+#   RESET <id>            -> OK
+#   END <id>              -> OK
+#   STATS                 -> OK sessions=<n> requests=<n> evicted=<n>
+# Errors come back as "ERR <message>", including a GUESS or ROLL past the
+# session's move limit (MAX_GUESSES, MAX_ROLLS) until it is RESET.
+class GameServer:
+    def __init__(
+        self,
+        bank: QuestionBank | None = None,
+        idle_timeout: float = IDLE_TIMEOUT,
+        rng: random.Random | None = None,
+    ) -> None:
+        self.bank = bank
+        self.idle_timeout = idle_timeout
+        # Shared by every game, so a session does not carry its own generator.
+        self.rng = rng or random.Random()
+        # Least recently used first: eviction only looks at the front.
+        self.sessions: OrderedDict[int, Session] = OrderedDict()
+        self.next_id = 1
+        self.requests = 0
+        self.evicted = 0
+
+    def dispatch(self, line: str, now: float) -> str:
+        # Run one command line and return the reply line (without "\n").
+        self.requests += 1
+        parts = line.split(maxsplit=2)
+        if not parts:
+            return "ERR empty command"
+        command = parts[0].upper()
+        try:
+            if command == "NEW":
+                return self._new(parts[1:], now)
+            if command == "STATS":
+                return (
+                    f"OK sessions={len(self.sessions)} requests={self.requests}"
+                    f" evicted={self.evicted}"
+                )
+            if len(parts) < 2:
+                return f"ERR {command} needs a session id"
+            session_id = int(parts[1])
+            session = self.sessions.get(session_id)
+            if session is None:
+                return UNKNOWN_SESSION
+            session.last_used = now
+            self.sessions.move_to_end(session_id)
+            argument = parts[2] if len(parts) > 2 else ""
+            return self._play(session_id, session, command, argument)
+        except ValueError as exc:
+            return f"ERR {exc}"
+        except Exception as exc:
+            # Anything else a malformed command trips over still gets a
+            # reply, so the connection and the other sessions carry on.
+            return f"ERR bad {command} command: {exc!r}"
+
+    def _new(self, args: list[str], now: float) -> str:
+        # Start a session and reply with its id.
+        kind = args[0].lower() if args else ""
+        session_id = self.next_id
+        if kind == "guess":
+            low, high = (int(value) for value in args[1].split()) if len(args) > 1 else (1, 20)
+            if not low <= high <= MAX_HIGH:
+                raise ValueError("range must satisfy low <= high <= 2**63")
+            game = GuessTheNumberGame(low, high, self.rng)
+            reply = f"OK {session_id} {low} {high}"
+        elif kind == "dice":
+            game = DiceRollGame(self.rng)
+            reply = f"OK {session_id}"
+        elif kind == "quiz":
+            game = QuizGame(self.bank, rng=self.rng)
+            reply = f"OK {session_id} {game.total}"
+        else:
+            raise ValueError(f"game must be one of {', '.join(GAMES)}")
+        self.next_id += 1
+        self.sessions[session_id] = Session(kind, game, now)
+        return reply
+
+    def _play(self, session_id: int, session: Session, command: str, argument: str) -> str:
+        game = session.game
+        if command == "END":
+            del self.sessions[session_id]
+            return "OK"
+        if command == "RESET":
+            game.reset()
+            return "OK"
+        if command == "GUESS" and session.kind == "guess":
+            if game.attempts >= MAX_GUESSES:
+                return f"ERR no more than {MAX_GUESSES} guesses per game"
+            hint = game.make_guess(int(argument))
+            return f"OK {game.attempts} {hint}"
+        if command == "ROLL" and session.kind == "dice":
+            if len(game.rolls) >= MAX_ROLLS:
+                return f"ERR no more than {MAX_ROLLS} rolls before a reset"
+            return f"OK {game.roll()}"
+        if command in ("QUESTION", "ANSWER") and session.kind == "quiz":
+            if not game.has_more():
+                return "ERR quiz finished"
+            if command == "QUESTION":
+                return f"OK {game.current_question()}"
+            verdict = "correct" if game.answer(argument) else "wrong"
+            return f"OK {verdict} {game.score}"
+        return f"ERR {command} is not a {session.kind} command"
+
+    def evict_idle(self, now: float) -> int:
+        # Drop sessions idle for longer than idle_timeout; return how many.
+        dropped = 0
+        while self.sessions:
+            oldest = next(iter(self.sessions.values()))
+            if now - oldest.last_used < self.idle_timeout:
+                break
+            self.sessions.popitem(last=False)
+            dropped += 1
+        self.evicted += dropped
+        return dropped
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        # Serve one connection until the client hangs up.
+        try:
+            while line := await reader.readline():
+                reply = self.dispatch(line.decode(errors="replace").strip(), time.monotonic())
+                writer.write(reply.encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _evict_forever(self) -> None:
+        while True:
+            await asyncio.sleep(EVICT_INTERVAL)
+            self.evict_idle(time.monotonic())
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        # Accept connections until cancelled.
+        server = await asyncio.start_server(self._handle, host, port)
+        evictor = asyncio.create_task(self._evict_forever())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            evictor.cancel()
@@ -0,0 +1,211 @@
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from games import CORRECT, TOO_HIGH, TOO_LOW, GuessTheNumberGame
+from streams import stream
+
+# Games played by one worker task. Fixed, so results do not depend on how
+# many processes there are.
+BATCH_SIZE = 10_000
+# Largest allowed top of the range.
+MAX_HIGH = 2**63
+# Buckets the learned strategy uses to remember where secrets fell.
+LEARNED_BUCKETS = 64
+
+
+# Guesses the middle of the numbers still possible (at most log2(n) + 1 tries).
+class BinarySearchStrategy:
+    def __init__(self, rng: random.Random) -> None:
+        self.rng = rng
+        self.low = self.high = 0
+
+    def start(self, low: int, high: int) -> None:
+        # A new game: every number in low..high is possible.
+        self.low = low
+        self.high = high
+
+    def next_guess(self) -> int:
+        return (self.low + self.high) // 2
+
+    def feedback(self, guess: int, hint: str) -> None:
+        # Narrow the possible range using the game's hint.
+        if hint == TOO_LOW:
+            self.low = guess + 1
+        elif hint == TOO_HIGH:
+            self.high = guess - 1
+
+    def finish(self, secret: int) -> None:
+        # Called with the secret once a game is won.
+        pass
+
+
+# Guesses any number still possible, picked at random.
+class RandomStrategy(BinarySearchStrategy):
+    def next_guess(self) -> int:
+        return self.rng.randint(self.low, self.high)
+
+
+# Remembers where past secrets fell and guesses the point that splits the
+# remembered secrets still possible in half. With evenly spread secrets it
+# plays like binary search; with lopsided ones it needs fewer guesses.
+class LearnedStrategy(BinarySearchStrategy):
+    def __init__(self, rng: random.Random) -> None:
+        super().__init__(rng)
+        # Every bucket starts at 1 so unseen areas are still guessed.
+        self.weights = [1.0] * LEARNED_BUCKETS
+        self.range_low = self.range_high = 0
+        self.bucket_size = 1
+
+    def start(self, low: int, high: int) -> None:
+        if (low, high) != (self.range_low, self.range_high):
+            self.range_low, self.range_high = low, high
+            self.bucket_size = -(-(high - low + 1) // LEARNED_BUCKETS)
+            self.weights = [1.0] * LEARNED_BUCKETS
+        super().start(low, high)
+
+    def next_guess(self) -> int:
+        # Weighted median of the remembered secrets inside low..high.
+        if self.high - self.low < self.bucket_size:
+            # Fewer numbers left than one bucket holds: the counts say little
+            # more, so just halve (this keeps most guesses cheap).
+            return (self.low + self.high) // 2
+        size = self.bucket_size
+        first = (self.low - self.range_low) // size
+        last = (self.high - self.range_low) // size
+        # Only the two end buckets can be partly ruled out already.
+        weights = self.weights[first:last + 1]
+        weights[0] *= (self.range_low + (first + 1) * size - self.low) / size
+        weights[-1] *= (self.high - self.range_low - last * size + 1) / size
+        half = sum(weights) / 2
+        for bucket, weight in enumerate(weights, first):
+            if weight >= half:
+                bucket_low = max(self.low, self.range_low + bucket * size)
+                bucket_high = min(self.high, self.range_low + (bucket + 1) * size - 1)
+                offset = int((bucket_high - bucket_low) * half / weight)
+                return min(bucket_low + offset, bucket_high)
+            half -= weight
+        return self.high
+
+    def finish(self, secret: int) -> None:
+        self.weights[(secret - self.range_low) // self.bucket_size] += 1
+
+
+STRATEGIES = {
+    "binary": BinarySearchStrategy,
+    "random": RandomStrategy,
+    "learned": LearnedStrategy,
+}
+SECRETS = ("uniform", "skewed")
+
+
+def pick_secret(rng: random.Random, low: int, high: int, secrets: str) -> int:
+    # "uniform" = any number equally likely; "skewed" = mostly near the low end.
+    if secrets == "skewed":
+        return low + int((high - low) * rng.random() ** 3)
+    return rng.randint(low, high)
+
+
+def play_batch(
+    strategy: str, low: int, high: int, secrets: str, games: int, seed: int, batch: int
+) -> Counter:
+    # Play `games` games with one strategy; return how many took each number
+    # of attempts. Every batch has its own seeds, so reruns match exactly.
+    rng = stream(seed, batch, "secrets")
+    game = GuessTheNumberGame(low, high, rng)
+    player = STRATEGIES[strategy](stream(seed, batch, "player"))
+    attempts: Counter = Counter()
+    for _ in range(games):
+        game.reset(pick_secret(rng, low, high, secrets))
+        player.start(low, high)
+        while True:
+            guess = player.next_guess()
+            hint = game.make_guess(guess)
+            if hint == CORRECT:
+                break
+            player.feedback(guess, hint)
+        player.finish(game.secret)
+        attempts[game.attempts] += 1
+    return attempts
+
+
+def run_simulation(
+    strategy: str,
+    games: int,
+    low: int = 1,
+    high: int = 20,
+    secrets: str = "uniform",
+    seed: int = 0,
+    workers: int | None = None,
+) -> tuple[Counter, float]:
+    # Play every game across a process pool; return (attempt counts, seconds).
+    if strategy not in STRATEGIES:
+        raise ValueError(f"unknown strategy {strategy!r}")
+    if secrets not in SECRETS:
+        raise ValueError(f"unknown secret spread {secrets!r}")
+    if not low <= high <= MAX_HIGH:
+        raise ValueError("range must satisfy low <= high <= 2**63")
+    if games < 1:
+        raise ValueError(f"games must be at least 1, not {games}")
+    if workers is not None and workers < 1:
+        raise ValueError(f"workers must be at least 1, not {workers}")
+    sizes = [BATCH_SIZE] * (games // BATCH_SIZE)
+    if games % BATCH_SIZE:
+        sizes.append(games % BATCH_SIZE)
+    jobs = [
+        (strategy, low, high, secrets, size, seed, batch)
+        for batch, size in enumerate(sizes)
+    ]
+
+    start = time.perf_counter()
+    attempts: Counter = Counter()
+    if workers == 1:
+        for job in jobs:
+            attempts.update(play_batch(*job))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for counts in pool.map(play_batch, *zip(*jobs)):
+                attempts.update(counts)
+    return attempts, time.perf_counter() - start
+
+
+def attempt_summary(attempts: Counter) -> dict[str, float]:
+    # Mean, median, 99th percentile and worst number of attempts.
+    games = sum(attempts.values())
+    summary = {"mean": sum(n * count for n, count in attempts.items()) / games}
+    seen = 0
+    for n in sorted(attempts):
+        seen += attempts[n]
+        if "median" not in summary and seen * 2 >= games:
+            summary["median"] = n
+        if seen * 100 >= games * 99:
+            summary["p99"] = n
+            break
+    summary["max"] = max(attempts)
+    return summary
+
+
+def format_report(strategy: str, attempts: Counter, seconds: float) -> str:
+    # Text summary plus a bar per number of attempts.
+    games = sum(attempts.values())
+    summary = attempt_summary(attempts)
+    lines = [
+        f"{strategy}: {games:,} games in {seconds:.2f} s"
+        f" ({games / seconds:,.0f} games/s)",
+        f"attempts: mean {summary['mean']:.3f}, median {summary['median']},"
+        f" p99 {summary['p99']}, max {summary['max']}",
+    ]
+    widest = max(attempts.values())
+    for n in sorted(attempts):
+        bar = "#" * max(1, round(40 * attempts[n] / widest))
+        lines.append(f"{n:4} {attempts[n] / games:7.2%} {bar}")
+    return "\n".join(lines)
+
+
+def parse_bound(text: str) -> int:
+    # An integer, also written as a power of two: "2**63" or "2^63".
+    for power in ("**", "^"):
+        if text.startswith("2" + power):
+            return 2 ** int(text[len(power) + 1:])
+    return int(text)
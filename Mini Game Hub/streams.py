@@ -0,0 +1,26 @@
+import hashlib
+import random
+
+
+def derive_seed(seed: int, *path: int | str) -> int:
+    # A 64-bit seed for the stream named by `path` under `seed`. Hashing
+    # keeps streams independent: (1, 2) and (12,) or (2, 1) share nothing.
+    key = repr((seed, *path)).encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def stream(seed: int, *path: int | str) -> random.Random:
+    # Its own generator for one engine, batch or worker, e.g.
+    # stream(42, "dice") or stream(42, batch, "secrets"). The same seed and
+    # path always give the same numbers, whatever else is drawn elsewhere.
+    return random.Random(derive_seed(seed, *path))
+
+
+def split(seed: int, count: int, *path: int | str) -> list[random.Random]:
+    # `count` independent generators, one per parallel worker.
+    return [stream(seed, *path, n) for n in range(count)]
+
+
+def fresh_seed() -> int:
+    # A new random seed, for runs that should still be reproducible later.
+    return random.SystemRandom().getrandbits(63)
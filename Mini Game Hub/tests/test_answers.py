@@ -0,0 +1,42 @@
+from answers import AnswerKey, allowed_typos, grade_sheets, normalize, within_distance
+
+
+def test_normalize_drops_case_accents_punctuation_and_articles():
+    assert normalize("  The Forty-Two! ") == "42"
+    assert normalize("Équateur") == "equateur"
+    assert normalize("New-York") == normalize("new york")
+    assert normalize("twenty one") == "21"
+    # A lone article is kept: it is the whole answer.
+    assert normalize("The") == "the"
+
+
+def test_edit_distance_is_bounded():
+    assert within_distance("paris", "pariss", 1)
+    assert within_distance("kitten", "sitting", 3)
+    assert not within_distance("kitten", "sitting", 2)
+    assert not within_distance("abc", "abcdef", 2)
+    assert within_distance("same", "same", 0)
+    assert not within_distance("same", "sane", 0)
+
+
+def test_typos_depend_on_answer_length_and_digits():
+    assert allowed_typos("cat") == 0
+    assert allowed_typos("paris") == 1
+    assert allowed_typos("jupiter moon") == 2
+    assert allowed_typos("1984") == 0
+
+
+def test_answer_keys_accept_alternatives_and_small_typos():
+    key = AnswerKey("7|seven")
+    assert key.matches("Seven") and key.matches("7")
+    assert not key.matches("8")
+    paris = AnswerKey("Paris")
+    assert paris.matches("pariss") and paris.matches("  PARIS.")
+    assert not paris.matches("London")
+    assert not AnswerKey("cat").matches("car")
+
+
+def test_grade_sheets_scores_every_sheet():
+    keys = [AnswerKey("Paris"), AnswerKey("7|seven"), AnswerKey("Mars")]
+    sheets = [["paris", "seven", "mars"], ["Paris", "8", "Venus"], ["x", "7", "Mars"]]
+    assert grade_sheets(keys, sheets) == [3, 1, 2]
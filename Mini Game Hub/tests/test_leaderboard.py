@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from leaderboard import Leaderboard
+
+
+def _board(tmp_path, **options) -> Leaderboard:
+    return Leaderboard(
+        str(tmp_path / "leaderboard.log"), str(tmp_path / "leaderboard.json"), **options
+    )
+
+
+def test_top_results_keep_the_best_k_with_earlier_ties_first(tmp_path):
+    board = _board(tmp_path, k=3)
+    for player, attempts in [("a", 5), ("b", 3), ("c", 9), ("d", 3), ("e", 4)]:
+        board.record("guess", player, attempts)
+    assert board.top("guess") == [("b", 3), ("d", 3), ("e", 4)]
+    stats = board.stats["guess"]
+    assert (stats.games, stats.best, stats.worst, stats.average()) == (5, 3, 9, 4.8)
+    board.close()
+
+
+def test_quiz_lengths_are_ranked_by_percentage(tmp_path):
+    board = _board(tmp_path)
+    board.record("quiz", "bank", 8, out_of=10)
+    board.record("quiz", "short", 3, out_of=3)
+    board.record("quiz", "half", 5, out_of=10)
+    assert board.top("quiz") == [("short", 100), ("bank", 80), ("half", 50)]
+    with pytest.raises(ValueError):
+        board.record("quiz", "x", 4)
+    with pytest.raises(ValueError):
+        board.record("quiz", "x", 4, out_of=3)
+    board.close()
+    last = (tmp_path / "leaderboard.log").read_text().splitlines()[-1]
+    assert (json.loads(last)["score"], json.loads(last)["out_of"]) == (5, 10)
+
+
+def test_loading_uses_the_snapshot_and_replays_newer_lines(tmp_path):
+    board = _board(tmp_path, snapshot_every=2)
+    board.record("guess", "a", 6)
+    board.record("quiz", "b", 2, out_of=3)
+    board.record("guess", "c", 2)
+    board._handle.close()
+    # A crash part-way through a line leaves a damaged tail.
+    with open(tmp_path / "leaderboard.log", "ab") as handle:
+        handle.write(b'{"game": "guess", "pl')
+
+    loaded = _board(tmp_path)
+    loaded.load()
+    assert loaded.top("guess") == [("c", 2), ("a", 6)]
+    assert loaded.top("quiz") == [("b", 67)]
+    assert loaded.seq == 3
+    assert (tmp_path / "leaderboard.log").read_bytes().endswith(b"}\n")
+
+    (tmp_path / "leaderboard.json").unlink()
+    rebuilt = _board(tmp_path)
+    rebuilt.load()
+    assert rebuilt.top("quiz") == loaded.top("quiz")
+    assert rebuilt.stats["guess"].to_list() == loaded.stats["guess"].to_list()
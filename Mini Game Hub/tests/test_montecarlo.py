@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from montecarlo import DiceStats, exact_sum_distribution, random_faces, simulate
+
+
+def test_faces_are_in_range_and_every_face_appears():
+    faces = random_faces(random.Random(1), 6, 60_000)
+    assert len(faces) == 60_000
+    assert set(faces) == {1, 2, 3, 4, 5, 6}
+    # Rejection sampling keeps each face near 1/6.
+    assert all(abs(faces.count(face) / 60_000 - 1 / 6) < 0.01 for face in range(1, 7))
+
+
+def test_exact_distribution_of_two_dice():
+    probabilities = exact_sum_distribution(6, 2)
+    assert sum(probabilities) == pytest.approx(1.0)
+    assert probabilities[7] == pytest.approx(6 / 36)
+    assert probabilities[2] == pytest.approx(1 / 36)
+    assert probabilities[12] == pytest.approx(1 / 36)
+
+
+def test_sums_are_counted_per_roll():
+    stats = DiceStats(6, 2)
+    stats.add(bytes([1, 1, 6, 6, 3, 4]))
+    assert stats.rolls == 3
+    assert stats.sum_counts[2] == stats.sum_counts[12] == stats.sum_counts[7] == 1
+    assert stats.face_counts[6] == 2
+    assert stats.mean() == 7.0
+
+
+def test_chunks_add_up_to_the_requested_rolls():
+    chunks = list(simulate(6, 3, 2_500, random.Random(2), chunk_rolls=1_000))
+    stats = chunks[-1]
+    assert stats.rolls == 2_500
+    assert sum(stats.sum_counts) == 2_500
+    assert sum(stats.face_counts) == 7_500
+    with pytest.raises(ValueError):
+        simulate(1, 1, 10)
+    with pytest.raises(ValueError):
+        simulate(6, 1, 0)
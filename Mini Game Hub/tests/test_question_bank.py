@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from games import QuizGame
+from question_bank import QuestionBank, sample_positions, write_bank
+
+QUESTIONS = [
+    ("Science", 2, "Closest planet to the sun?", "Mercury"),
+    ("Geography", 1, "Capital of France?", "Paris"),
+    ("Science", 1, "H2O is?", "Water"),
+    ("Geography", 2, "Longest river?", "The Nile"),
+    ("Science", 1, "Planet with rings?", "Saturn"),
+]
+
+
+@pytest.fixture
+def bank(tmp_path):
+    path = str(tmp_path / "quiz.bank")
+    assert write_bank(path, QUESTIONS) == len(QUESTIONS)
+    bank = QuestionBank(path)
+    yield bank
+    bank.close()
+
+
+def test_bank_groups_questions_by_category_and_difficulty(bank):
+    assert len(bank) == 5
+    assert bank.categories == ["Geography", "Science"]
+    assert bank.difficulties() == [1, 2]
+    assert bank.matching("Science") == 3
+    assert bank.matching(difficulty=1) == 3
+    assert bank.matching("Science", 1) == 2
+    stored = {bank.question(number) for number in range(len(bank))}
+    assert stored == {(question, answer) for _, _, question, answer in QUESTIONS}
+    with pytest.raises(IndexError):
+        bank.question(5)
+
+
+def test_samples_cover_each_matching_question_once(bank):
+    numbers = list(bank.sample(random.Random(3), "Science"))
+    assert sorted(numbers) == sorted(n for r in bank.ranges("Science") for n in r)
+    assert sorted(sample_positions(random.Random(4), 1000)) == list(range(1000))
+
+
+def test_quiz_draws_from_the_bank(bank):
+    game = QuizGame(bank, length=10, category="Geography", rng=random.Random(5))
+    assert game.total == 2
+    questions = {game.current_question()}
+    game.answer("paris" if "France" in game.current_question() else "nile")
+    questions.add(game.current_question())
+    game.answer("paris" if "France" in game.current_question() else "nile")
+    assert questions == {"Capital of France?", "Longest river?"}
+    assert game.score == 2 and not game.has_more()
+    with pytest.raises(ValueError):
+        QuizGame(bank, category="History")
+
+
+def test_bad_rows_and_files_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        write_bank(str(tmp_path / "a.bank"), [("X", 300, "Q", "A")])
+    with pytest.raises(ValueError):
+        write_bank(str(tmp_path / "b.bank"), [("X", 1, "Q\0", "A")])
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"NOTABANK" + bytes(8))
+    with pytest.raises(ValueError):
+        QuestionBank(str(other))
@@ -0,0 +1,96 @@
+import pytest
+
+from games import CORRECT
+from main import main
+from replay import (
+    HEADER,
+    RecordedDiceGame,
+    RecordedGuessGame,
+    RecordedQuizGame,
+    ReplayWriter,
+    record_games,
+    replay,
+)
+from streams import derive_seed, split, stream
+
+
+def test_recorded_games_replay_without_mismatches(tmp_path):
+    path = str(tmp_path / "games.replay")
+    size = record_games(path, 20, seed=7)
+    report = replay(path)
+    assert size > HEADER.size
+    assert report.games == 60
+    assert report.mismatch_count == 0 and not report.truncated
+
+
+def test_interleaved_games_and_resets_round_trip(tmp_path):
+    path = str(tmp_path / "games.replay")
+    log = ReplayWriter(path)
+    guess = RecordedGuessGame(log, seed=1, low=1, high=50)
+    dice = RecordedDiceGame(log, seed=2)
+    quiz = RecordedQuizGame(log, seed=3)
+    dice.roll()
+    guess.make_guess(25)
+    quiz.answer("Paris")
+    guess.reset()
+    dice.roll()
+    low, high = 1, 50
+    while guess.make_guess(middle := (low + high) // 2) != CORRECT:
+        low, high = (middle + 1, high) if middle < guess.secret else (low, middle - 1)
+    dice.reset()
+    dice.roll()
+    log.close()
+
+    report = replay(path)
+    # Three new games, three rolls, the first guess, one answer, two resets
+    # and the second game's guesses.
+    assert (report.games, report.records) == (3, 10 + guess.attempts)
+    assert report.mismatch_count == 0
+
+
+def test_changed_outcomes_and_cut_logs_are_reported(tmp_path):
+    path = tmp_path / "games.replay"
+    log = ReplayWriter(str(path))
+    dice = RecordedDiceGame(log, seed=4)
+    for _ in range(5):
+        dice.roll()
+    log.close()
+    data = bytearray(path.read_bytes())
+    path.write_bytes(bytes(data[:-1]))
+    report = replay(str(path))
+    assert report.truncated and report.mismatch_count == 0
+
+    # The last byte is the face of the last roll; change it.
+    data[-1] = data[-1] % 6 + 1
+    path.write_bytes(bytes(data))
+    report = replay(str(path))
+    assert report.mismatch_count == 1 and "rolled" in report.mismatches[0]
+
+    path.write_bytes(b"NOTALOG!" + bytes(2))
+    with pytest.raises(ValueError):
+        replay(str(path))
+
+
+def test_unknown_hint_codes_and_bad_game_counts_are_rejected(tmp_path):
+    path = tmp_path / "games.replay"
+    log = ReplayWriter(str(path))
+    RecordedGuessGame(log, seed=5).make_guess(10)
+    log.close()
+    data = bytearray(path.read_bytes())
+    # The last byte is the hint code of the guess.
+    data[-1] = 9
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="unknown hint code 9"):
+        replay(str(path))
+
+    for games in ("0", "-3"):
+        with pytest.raises(SystemExit):
+            main(["record", str(path), "--games", games])
+
+
+def test_streams_are_independent_and_repeatable():
+    assert stream(1, "dice").random() == stream(1, "dice").random()
+    assert derive_seed(1, 2) != derive_seed(12)
+    assert derive_seed(1, 2, 3) != derive_seed(1, 3, 2)
+    first, second = split(5, 2, "worker")
+    assert first.random() != second.random()
@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+from client import ServerError
+from main import GameHubApp
+
+
+# Stands in for a ttk.Frame: remembers how it was placed and raised, and any
+# state a game screen would keep in its widgets.
+class FakeFrame:
+    def __init__(self) -> None:
+        self.raised = 0
+        self.placed = 0
+        self.entry = ""
+
+    def grid(self, **options) -> None:
+        self.placed += 1
+
+    def tkraise(self) -> None:
+        self.raised += 1
+
+
+def show(app, name, build) -> None:
+    GameHubApp._show_screen(app, name, build)
+
+
+def test_a_screen_is_built_once_and_raised_with_its_state_on_later_visits():
+    app = SimpleNamespace(screens={})
+    built = []
+
+    def build() -> FakeFrame:
+        built.append(FakeFrame())
+        return built[-1]
+
+    show(app, "guess", build)
+    guess = app.screens["guess"]
+    guess.entry = "12"
+    show(app, "dice", build)
+    show(app, "guess", build)
+    assert len(built) == 2
+    assert app.screens["guess"] is guess and guess.entry == "12"
+    assert (guess.placed, guess.raised) == (1, 2)
+
+
+def test_a_screen_that_failed_to_build_is_built_again_next_time(monkeypatch):
+    shown = []
+    monkeypatch.setattr("main.messagebox.showerror", lambda title, text: shown.append(text))
+    app = SimpleNamespace(screens={})
+
+    def refused() -> FakeFrame:
+        raise ServerError("ERR quiz finished")
+
+    show(app, "quiz", refused)
+    assert app.screens == {} and shown == ["Game server error: ERR quiz finished"]
+    show(app, "quiz", FakeFrame)
+    assert app.screens["quiz"].raised == 1
@@ -0,0 +1,134 @@
+import asyncio
+import random
+import socket
+import threading
+
+import pytest
+
+import main
+import server
+from client import GameClient, RemoteDiceGame, RemoteGuessGame, RemoteQuizGame
+from games import CORRECT
+from loadgen import run_load
+from server import UNKNOWN_SESSION, GameServer
+
+
+@pytest.fixture
+def server_port():
+    # A GameServer on a free local port, running on its own thread.
+    game_server = GameServer(rng=random.Random(1))
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(
+        asyncio.start_server(game_server._handle, "127.0.0.1", 0)
+    )
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield game_server, server.sockets[0].getsockname()[1]
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    server.close()
+    loop.run_until_complete(server.wait_closed())
+    loop.close()
+
+
+def test_dispatch_plays_a_guess_game_and_ends_it():
+    server = GameServer(rng=random.Random(2))
+    session_id, low, high = server.dispatch("NEW guess 1 8", 0.0).split()[1:]
+    assert (low, high) == ("1", "8")
+    low, high = 1, 8
+    while True:
+        guess = (low + high) // 2
+        _, attempts, hint = server.dispatch(f"GUESS {session_id} {guess}", 1.0).split(" ", 2)
+        if hint == CORRECT:
+            break
+        low, high = (guess + 1, high) if "low" in hint else (low, guess - 1)
+    assert int(attempts) <= 4
+    assert server.dispatch(f"END {session_id}", 2.0) == "OK"
+    assert server.dispatch(f"ROLL {session_id}", 3.0) == UNKNOWN_SESSION
+
+
+@pytest.mark.parametrize(
+    "line",
+    ["", "NEW", "NEW chess", "NEW guess 5", "NEW guess 9 1", "GUESS x 1", "ROLL"],
+)
+def test_bad_commands_get_an_error_reply(line):
+    server = GameServer()
+    server.dispatch("NEW guess", 0.0)
+    assert server.dispatch(line, 0.0).startswith("ERR")
+    assert server.dispatch("GUESS 1", 0.0).startswith("ERR")
+    assert server.dispatch("STATS", 0.0).startswith("OK sessions=1")
+
+
+def test_sessions_stop_taking_moves_at_the_limit_until_reset(monkeypatch):
+    monkeypatch.setattr(server, "MAX_GUESSES", 2)
+    monkeypatch.setattr(server, "MAX_ROLLS", 3)
+    game_server = GameServer(rng=random.Random(3))
+    game_server.dispatch("NEW guess 1 1000", 0.0)
+    game_server.dispatch("NEW dice", 0.0)
+    assert game_server.dispatch("GUESS 1 0", 0.0).startswith("OK 1 ")
+    assert game_server.dispatch("GUESS 1 0", 0.0).startswith("OK 2 ")
+    assert game_server.dispatch("GUESS 1 0", 0.0).startswith("ERR")
+    assert game_server.sessions[1].game.guesses == [0, 0]
+    for _ in range(3):
+        assert game_server.dispatch("ROLL 2", 0.0).startswith("OK")
+    assert game_server.dispatch("ROLL 2", 0.0).startswith("ERR")
+    assert len(game_server.sessions[2].game.rolls) == 3
+    assert game_server.dispatch("RESET 2", 0.0) == "OK"
+    assert game_server.dispatch("ROLL 2", 0.0).startswith("OK")
+
+
+def test_remote_failures_in_the_window_show_an_error(monkeypatch, server_port):
+    shown = []
+    monkeypatch.setattr(main.messagebox, "showerror", lambda title, text: shown.append(text))
+    monkeypatch.setattr(server, "MAX_ROLLS", 1)
+    _, port = server_port
+    client = GameClient("127.0.0.1", port)
+    dice = RemoteDiceGame(client)
+    main.remote_safe(dice.roll)()
+    main.remote_safe(dice.roll)()
+    assert len(dice.rolls) == 1 and "no more than 1 rolls" in shown[0]
+
+    def time_out() -> None:
+        raise socket.timeout("timed out")
+
+    main.remote_safe(time_out)()
+    assert shown[1] == "Game server error: timed out"
+    # A move on a connection that is gone fails the same way.
+    client.close()
+    main.remote_safe(dice.roll)()
+    assert len(shown) == 3 and len(dice.rolls) == 1
+
+
+def test_idle_sessions_are_evicted_oldest_first():
+    server = GameServer(idle_timeout=10.0)
+    server.dispatch("NEW dice", 0.0)
+    server.dispatch("NEW dice", 5.0)
+    server.dispatch("ROLL 1", 8.0)
+    assert server.evict_idle(16.0) == 1
+    assert list(server.sessions) == [1]
+
+
+def test_resetting_a_remote_game_ends_its_old_session(server_port):
+    game_server, port = server_port
+    client = GameClient("127.0.0.1", port)
+    guess = RemoteGuessGame(client, 1, 20)
+    quiz = RemoteQuizGame(client)
+    old = {guess.remote.id, quiz.remote.id}
+    guess.reset()
+    quiz.reset()
+    assert len(game_server.sessions) == 2
+    assert old.isdisjoint(str(session_id) for session_id in game_server.sessions)
+    assert quiz.total == 3 and quiz.current_question()
+    # A session the server dropped is reopened on the next move.
+    game_server.sessions.clear()
+    guess.make_guess(10)
+    assert guess.attempts == 1 and len(game_server.sessions) == 1
+    client.close()
+
+
+def test_load_with_fewer_requests_than_connections(server_port):
+    _, port = server_port
+    report = run_load("127.0.0.1", port, connections=4, sessions=3, requests=2)
+    assert "2 requests" in report
+    with pytest.raises(ValueError):
+        run_load("127.0.0.1", port, connections=0, sessions=1, requests=1)
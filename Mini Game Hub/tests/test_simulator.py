@@ -0,0 +1,40 @@
+import argparse
+import sys
+from collections import Counter
+
+import pytest
+
+import simulator
+from main import positive_int
+from simulator import BATCH_SIZE, attempt_summary, parse_bound, run_simulation
+
+
+def test_binary_search_never_needs_more_than_log2_guesses():
+    attempts, _ = run_simulation("binary", 2_000, 1, 1000, workers=1)
+    assert sum(attempts.values()) == 2_000
+    assert max(attempts) <= 10
+
+
+def test_results_do_not_depend_on_the_number_of_workers(monkeypatch):
+    # Worker processes get play_batch by module name; another app's conftest
+    # may have dropped this module from sys.modules during a root-level run.
+    monkeypatch.setitem(sys.modules, "simulator", simulator)
+    games = BATCH_SIZE + 500
+    one, _ = run_simulation("learned", games, 1, 500, "skewed", seed=3, workers=1)
+    two, _ = run_simulation("learned", games, 1, 500, "skewed", seed=3, workers=2)
+    assert one == two
+
+
+@pytest.mark.parametrize("games", [0, -5])
+def test_game_counts_below_one_are_rejected(games):
+    with pytest.raises(ValueError, match="games must be at least 1"):
+        run_simulation("binary", games, workers=1)
+    with pytest.raises(argparse.ArgumentTypeError):
+        positive_int(str(games))
+
+
+def test_attempt_summary_and_bounds():
+    summary = attempt_summary(Counter({1: 50, 2: 49, 7: 1}))
+    assert summary == {"mean": 1.55, "median": 1, "p99": 2, "max": 7}
+    assert parse_bound("2**63") == parse_bound("2^63") == 2**63
+    assert parse_bound("1000") == 1000
@@ -0,0 +1,73 @@
+import threading
+import time
+from collections.abc import Callable
+
+
+# Background thread that runs save jobs so the UI thread never waits on disk.
+# Only the newest submitted snapshot is kept: if several arrive while the
+# worker is busy, the older ones are skipped.
+class AutoSaver:
+    def __init__(self, save: Callable[[object], None]) -> None:
+        self._save = save
+        self._condition = threading.Condition()
+        self._pending: tuple[object, int] | None = None
+        self._busy = False
+        self._stopping = False
+        # Finished saves as (tag, seconds, error) for the UI thread to collect.
+        self._results: list[tuple[int, float, Exception | None]] = []
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, data: object, tag: int) -> None:
+        # Queue a snapshot, replacing any snapshot not yet started.
+        with self._condition:
+            self._pending = (data, tag)
+            self._condition.notify_all()
+
+    def results(self) -> list[tuple[int, float, Exception | None]]:
+        # Return and clear the saves finished since the last call.
+        with self._condition:
+            finished, self._results = self._results, []
+        return finished
+
+    def flush(self) -> None:
+        # Block until every submitted snapshot has been written.
+        with self._condition:
+            while self._pending is not None or self._busy:
+                self._condition.wait()
+
+    def close(self) -> None:
+        # Finish pending work and stop the worker thread.
+        self.flush()
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._pending is None and not self._stopping:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                data, tag = self._pending
+                self._pending = None
+                self._busy = True
+
+            start = time.perf_counter()
+            error = None
+            try:
+                self._save(data)
+            except Exception as exc:
+                # Any failure (disk or serialisation) is reported, and the
+                # worker keeps running for the next snapshot.
+                error = exc
+            finally:
+                # Always mark the job done, or flush() and close() would wait
+                # forever.
+                seconds = time.perf_counter() - start
+                with self._condition:
+                    self._busy = False
+                    self._results.append((tag, seconds, error))
+                    self._condition.notify_all()
@@ -0,0 +1,358 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tkinter as tk
+import tracemalloc
+from datetime import date, timedelta
+from functools import partial
+
+from database import HabitDatabase
+from history import HEADER, HISTORY_WEEKS, OLD_MAGIC, POPCOUNT, HistoryStore, day_index
+from journal import HabitJournal, write_atomic
+from main import (
+    DATA_FILE,
+    DAY_BITS,
+    DAYS,
+    LOG_FILE,
+    Habit,
+    HabitTrackerApp,
+    apply_loaded,
+    date_for_day,
+)
+
+# Child process for the startup benchmark: opens the app in the current
+# directory and prints wall-clock times for first paint and full load.
+STARTUP_SCRIPT = """
+import sys, time, tkinter as tk
+sys.path.insert(0, sys.argv[1])
+from main import HabitTrackerApp
+root = tk.Tk()
+app = HabitTrackerApp(root)
+root.update()
+print("paint", time.time(), flush=True)
+while not app.loaded:
+    root.update()
+    time.sleep(0.005)
+print("loaded", time.time(), flush=True)
+app.close()
+"""
+
+
+def _timed(action) -> float:
+    # Run an action and return how long it took in milliseconds.
+    start = time.perf_counter()
+    action()
+    return (time.perf_counter() - start) * 1000
+
+
+# The original list-of-day-names habit, kept here for comparison.
+class ListHabit:
+    def __init__(self, name: str, weekly_goal: int) -> None:
+        self.name = name
+        self.weekly_goal = weekly_goal
+        self.completions: list[str] = []
+
+    def mark_complete(self, day: str) -> None:
+        if day not in self.completions:
+            self.completions.append(day)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "weekly_goal": self.weekly_goal,
+            "completions": self.completions,
+        }
+
+
+def bench_habits(count: int, marks: int) -> None:
+    # Compare memory, marking speed and JSON size of the two habit models.
+    rng = random.Random(1)
+    days = [rng.choice(DAYS) for _ in range(marks)]
+    picks = [rng.randrange(count) for _ in range(marks)]
+    print(f"{count:,} habits, {marks:,} mark_complete calls")
+    for label, cls in (("day-name list", ListHabit), ("bitmask", Habit)):
+        tracemalloc.start()
+        habits = [cls(f"Habit {n}", 5) for n in range(count)]
+        for n in range(count):
+            habits[n].mark_complete(DAYS[n % 7])
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        def mark_all(habits: list) -> None:
+            for index, day in zip(picks, days):
+                habits[index].mark_complete(day)
+
+        ms = _timed(partial(mark_all, habits))
+        size = len(json.dumps([habit.to_dict() for habit in habits]))
+        print(
+            f"{label:>14}: {memory / 2**20:8.1f} MiB  "
+            f"{marks / ms * 1000:12,.0f} marks/s  JSON {size / 2**20:7.1f} MiB"
+        )
+        del habits
+
+
+def bench_history(count: int, years: int) -> None:
+    # Time the History window queries on years of random completions.
+    today = date.today()
+    weeks = day_index(today) // 7 + 1
+    first_week = max(weeks - years * 52, 0)
+    rng = random.Random(1)
+    # Each habit is done on a random ~70% of days.
+    bits = bytes(
+        sum(1 << bit for bit in range(7) if rng.random() < 0.7) for _ in range(4096)
+    )
+    path = os.path.join(tempfile.mkdtemp(), "bench.history")
+    # Written in the old row layout, so opening it times the one-off
+    # conversion that works out each row's first week and longest streak.
+    with open(path, "wb") as handle:
+        handle.write(HEADER.pack(OLD_MAGIC, HISTORY_WEEKS, count))
+        for row in range(count):
+            data = bytearray(HISTORY_WEEKS)
+            for week in range(first_week, weeks):
+                data[week] = bits[(row * 7919 + week) % len(bits)]
+            handle.write(data)
+    print(f"{count:,} habits x {years} years of history")
+
+    start = time.perf_counter()
+    store = HistoryStore(path)
+    ms = (time.perf_counter() - start) * 1000
+    print(f"convert old file:     {ms:8.1f} ms")
+    ms = _timed(lambda: [store.longest_streak(row) for row in range(count)])
+    print(f"longest streaks:      {ms:8.1f} ms")
+    ms = _timed(
+        lambda: [
+            (store.current_streak(row, today), store.rolling_rate(row, today))
+            for row in range(count)
+        ]
+    )
+    print(f"streaks + 4-week rate:{ms:8.1f} ms")
+    ms = _timed(lambda: store.weekly_rates(today, years * 52))
+    print(f"weekly rates:         {ms:8.1f} ms ({years * 52} weeks)")
+    ms = _timed(lambda: store.monthly_rates(today, years * 12))
+    print(f"monthly rates:        {ms:8.1f} ms ({years * 12} months)")
+
+    marks = [
+        (rng.randrange(count), today - timedelta(days=rng.randrange(years * 365)))
+        for _ in range(100_000)
+    ]
+    ms = _timed(lambda: [store.mark(row, when) for row, when in marks])
+    print(f"mark + streak update: {len(marks) / ms * 1000:8,.0f} marks/s")
+    store.close()
+    os.remove(path)
+
+
+def bench_startup(count: int, legacy: bool) -> None:
+    # Launch the app on a large habits.json and time first paint and full load.
+    folder = os.path.dirname(os.path.abspath(__file__))
+    work = tempfile.mkdtemp()
+    rng = random.Random(1)
+    names = [f"Habit {n}" for n in range(count)]
+    goals = [rng.randint(1, 7) for _ in range(count)]
+    masks = [rng.randrange(128) for _ in range(count)]
+    if legacy:
+        # The one-dict-per-habit layout, which has to be parsed in one go.
+        data: object = {
+            "seq": 0,
+            "habits": [
+                {"name": name, "weekly_goal": goal, "mask": mask}
+                for name, goal, mask in zip(names, goals, masks)
+            ],
+        }
+    else:
+        journal = HabitJournal(
+            os.path.join(work, DATA_FILE), os.path.join(work, LOG_FILE)
+        )
+        data = journal.snapshot(names, goals, masks)
+    write_atomic(os.path.join(work, DATA_FILE), data)
+    layout = "one dict per habit" if legacy else "columns"
+    print(f"{count:,} habits ({layout})")
+
+    start = time.time()
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT, folder],
+        cwd=work,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        print(result.stderr.strip())
+        return
+    for line in result.stdout.splitlines():
+        label, stamp = line.split()
+        print(f"launch to {label:>6}: {(float(stamp) - start) * 1000:8.0f} ms")
+
+
+def bench_interactions(count: int) -> None:
+    # Time mark_complete and add_habit in a live window with many habits.
+    work = tempfile.mkdtemp()
+    journal = HabitJournal(os.path.join(work, DATA_FILE), os.path.join(work, LOG_FILE))
+    names = [f"Habit {n}" for n in range(count)]
+    write_atomic(journal.snapshot_path, journal.snapshot(names, [5] * count, [0] * count))
+
+    # The old duplicate check scanned every habit; the index is one lookup.
+    lowered = [name.lower() for name in names]
+    index = set(lowered)
+    ms = _timed(lambda: any(name == "habit x" for name in lowered))
+    print(f"{count:,} habits; duplicate check: scan {ms:.2f} ms", end="")
+    ms = _timed(lambda: "habit x" in index)
+    print(f", index {ms:.4f} ms")
+
+    os.chdir(work)
+    try:
+        root = tk.Tk()
+    except tk.TclError as exc:
+        print(f"skipping window timings: {exc}")
+        return
+    app = HabitTrackerApp(root)
+    while not app.loaded:
+        root.update()
+    root.update()
+
+    rng = random.Random(1)
+    timings = []
+    for _ in range(200):
+        row = rng.randrange(count)
+        app.habit_listbox.selection_clear(0, tk.END)
+        app.habit_listbox.selection_set(row)
+        app.day_var.set(rng.choice(DAYS))
+        timings.append(_timed(lambda: (app.mark_complete(), root.update_idletasks())))
+    timings.sort()
+    print(f"mark_complete: median {timings[100]:.2f} ms, max {timings[-1]:.2f} ms")
+
+    timings = []
+    for n in range(100):
+        app.habit_entry.insert(0, f"New habit {n}")
+        app.goal_entry.insert(0, "3")
+        timings.append(_timed(lambda: (app.add_habit(), root.update_idletasks())))
+    timings.sort()
+    print(f"add_habit:     median {timings[50]:.2f} ms, max {timings[-1]:.2f} ms")
+    app.close()
+
+
+def bench_storage(count: int, marks: int) -> None:
+    # Compare the JSON journal and the SQLite database: writes, load, queries.
+    work = tempfile.mkdtemp()
+    rng = random.Random(1)
+    monday = date_for_day(DAYS[0], date.today())
+    names = [f"Habit {n}" for n in range(count)]
+    adds = [{"op": "add", "name": name, "goal": rng.randint(1, 7)} for name in names]
+    completes = []
+    for _ in range(marks):
+        day = rng.randrange(7)
+        completes.append({
+            "op": "complete",
+            "name": rng.choice(names),
+            "day": DAYS[day],
+            "date": (monday + timedelta(days=day)).isoformat(),
+        })
+    print(f"{count:,} habits, {marks:,} completions")
+    # With JSON the week summary reads the history file, so fill one in.
+    history = HistoryStore(os.path.join(work, "habits.history"))
+    history.ensure_rows(count)
+    rows = {name: row for row, name in enumerate(names)}
+    for event in completes:
+        history.mark(rows[event["name"]], date.fromisoformat(event["date"]))
+
+    def journal_store() -> HabitJournal:
+        return HabitJournal(os.path.join(work, DATA_FILE), os.path.join(work, LOG_FILE))
+
+    def database_store() -> HabitDatabase:
+        # Bulk writes, so use big transactions like a migration would.
+        return HabitDatabase(os.path.join(work, "habits.db"), batch_size=50_000)
+
+    for label, open_store in (("JSON", journal_store), ("SQLite", database_store)):
+        store = open_store()
+
+        def write() -> None:
+            for event in adds + completes:
+                store.append(event)
+            store.sync()
+            if store.snapshots:
+                # The JSON app folds the log into a snapshot after a burst.
+                habits: list[Habit] = []
+                apply_loaded(habits, {}, [], adds + completes)
+                write_atomic(
+                    store.snapshot_path,
+                    store.snapshot(
+                        [habit.name for habit in habits],
+                        [habit.weekly_goal for habit in habits],
+                        [habit.mask for habit in habits],
+                    ),
+                )
+                store.truncate_log()
+
+        write_ms = _timed(write)
+        store.close()
+
+        store = open_store()
+        loaded: list[Habit] = []
+
+        def load() -> None:
+            names, goals = store.load_index()
+            loaded.extend(Habit(name, goal) for name, goal in zip(names, goals))
+            apply_loaded(loaded, {}, *store.load_rest())
+
+        def query() -> None:
+            if isinstance(store, HabitDatabase):
+                store.below_goal(monday)
+                store.day_counts(monday)
+            else:
+                masks = history.week_masks(monday)
+                [h for h, mask in zip(loaded, masks) if POPCOUNT[mask] < h.weekly_goal]
+                [sum(1 for mask in masks if mask & DAY_BITS[day]) for day in DAYS]
+
+        load_ms = _timed(load)
+        query_ms = _timed(query)
+        store.close()
+        print(
+            f"{label:>7}: write {write_ms:8.1f} ms  load {load_ms:8.1f} ms"
+            f"  below-goal + per-day counts {query_ms:7.1f} ms"
+        )
+    history.close()
+
+
+def main() -> None:
+    # Pick a benchmark from the command line and run it.
+    parser = argparse.ArgumentParser(description="Habit tracker benchmarks")
+    sub = parser.add_subparsers(dest="name", required=True)
+
+    habits = sub.add_parser("habits", help="habit memory and mark_complete speed")
+    habits.add_argument("--count", type=int, default=1_000_000)
+    habits.add_argument("--marks", type=int, default=1_000_000)
+
+    history = sub.add_parser("history", help="streak and completion-rate queries")
+    history.add_argument("--count", type=int, default=1_000)
+    history.add_argument("--years", type=int, default=10)
+
+    startup = sub.add_parser("startup", help="process launch to first paint")
+    startup.add_argument("--count", type=int, default=200_000)
+    startup.add_argument("--legacy", action="store_true")
+
+    interact = sub.add_parser("interact", help="mark_complete/add_habit latency")
+    interact.add_argument("--count", type=int, default=50_000)
+
+    storage = sub.add_parser("storage", help="JSON journal vs SQLite database")
+    storage.add_argument("--count", type=int, default=50_000)
+    storage.add_argument("--marks", type=int, default=200_000)
+
+    args = parser.parse_args()
+    if args.name == "habits":
+        bench_habits(args.count, args.marks)
+    elif args.name == "history":
+        bench_history(args.count, args.years)
+    elif args.name == "startup":
+        bench_startup(args.count, args.legacy)
+    elif args.name == "interact":
+        bench_interactions(args.count)
+    elif args.name == "storage":
+        bench_storage(args.count, args.marks)
+
+
+if __name__ == "__main__":
+    # Run benchmarks only when executed directly.
+    main()
@@ -0,0 +1,165 @@
+import sqlite3
+from collections.abc import Iterable
+from datetime import date, timedelta
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS habits (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL UNIQUE,
+    weekly_goal INTEGER NOT NULL,
+    mask INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS completions (
+    habit_id INTEGER NOT NULL REFERENCES habits(id),
+    day TEXT NOT NULL,
+    PRIMARY KEY (habit_id, day)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS completions_by_day ON completions(day, habit_id);
+"""
+
+
+# SQLite file that stores habits and dated completions. It offers the same
+# load_index/load_rest/append/sync/close calls as HabitJournal, so the app
+# can use either one. New habits are written at once so SQLite can assign
+# their ids; other changes queue up and are written in one transaction.
+class HabitDatabase:
+    # Every change is a row update, so no JSON snapshots are needed.
+    snapshots = False
+
+    def __init__(self, path: str, batch_size: int = 1000) -> None:
+        # Open the database in WAL mode and create tables if needed.
+        self.path = path
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        # The app checks these against each other to decide on snapshots.
+        self.seq = 0
+        self.snapshot_seq = 0
+        # Lower-case habit name -> row id.
+        self._ids: dict[str, int] = {}
+        # Changes waiting for the next flush: whether a weekly reset
+        # happened, mask bits to add per habit id, and completions.
+        self._reset = False
+        self._masks: dict[int, int] = {}
+        self._completions: list[tuple[int, str]] = []
+
+    def load_index(self) -> tuple[list[str], list[int]]:
+        # Habit names and goals in the order they were added.
+        self.flush()
+        rows = self.connection.execute(
+            "SELECT id, name, weekly_goal FROM habits ORDER BY id"
+        ).fetchall()
+        self._ids = {name.lower(): habit_id for habit_id, name, _ in rows}
+        return [row[1] for row in rows], [row[2] for row in rows]
+
+    def load_rest(self) -> tuple[list, list[dict]]:
+        # This week's masks, in load_index() order. Runs on the loader
+        # thread, so it uses its own connection.
+        connection = sqlite3.connect(self.path)
+        try:
+            rows = connection.execute("SELECT mask FROM habits ORDER BY id")
+            return [mask for (mask,) in rows], []
+        finally:
+            connection.close()
+
+    def append(self, event: dict) -> None:
+        # Queue one change made in the app.
+        op = event["op"]
+        if op == "add":
+            with self.connection:
+                cursor = self.connection.execute(
+                    "INSERT INTO habits (name, name_key, weekly_goal) VALUES (?, ?, ?)",
+                    (event["name"], event["name"].lower(), event["goal"]),
+                )
+            self._ids[event["name"].lower()] = cursor.lastrowid
+        elif op == "complete":
+            habit_id = self._ids[event["name"].lower()]
+            bit = 1 << date.fromisoformat(event["date"]).weekday()
+            self._masks[habit_id] = self._masks.get(habit_id, 0) | bit
+            self._completions.append((habit_id, event["date"]))
+        elif op == "reset":
+            # Bits queued before the reset would be cleared anyway.
+            self._reset = True
+            self._masks.clear()
+        if len(self._completions) >= self.batch_size:
+            self.flush()
+
+    def add_habits(
+        self, habits: Iterable[tuple[str, int, int]], completions: Iterable[tuple[int, str]]
+    ) -> None:
+        # Bulk insert (name, goal, mask) rows and (habit position, ISO day)
+        # completions, for migrating from habits.json.
+        self.flush()
+        ids = []
+        with self.connection:
+            for name, goal, mask in habits:
+                cursor = self.connection.execute(
+                    "INSERT INTO habits (name, name_key, weekly_goal, mask)"
+                    " VALUES (?, ?, ?, ?)",
+                    (name, name.lower(), goal, mask),
+                )
+                ids.append(cursor.lastrowid)
+                self._ids[name.lower()] = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO completions (habit_id, day) VALUES (?, ?)",
+                ((ids[row], day) for row, day in completions),
+            )
+
+    def flush(self) -> None:
+        # Write every queued change in a single transaction, the reset
+        # before the mask bits that came after it.
+        if not (self._reset or self._masks or self._completions):
+            return
+        with self.connection:
+            if self._reset:
+                self.connection.execute("UPDATE habits SET mask = 0")
+            self.connection.executemany(
+                "UPDATE habits SET mask = mask | ? WHERE id = ?",
+                [(bits, habit_id) for habit_id, bits in self._masks.items()],
+            )
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO completions (habit_id, day) VALUES (?, ?)",
+                self._completions,
+            )
+        self._reset = False
+        self._masks.clear()
+        self._completions.clear()
+
+    def sync(self) -> None:
+        self.flush()
+
+    def close(self) -> None:
+        # Save anything pending and close the file.
+        self.flush()
+        self.connection.close()
+
+    def below_goal(self, monday: date) -> list[tuple[str, int, int]]:
+        # (name, goal, days done) for habits short of their goal that week.
+        self.flush()
+        return self.connection.execute(
+            "SELECT habits.name, habits.weekly_goal, COUNT(completions.day)"
+            " FROM habits LEFT JOIN completions"
+            " ON completions.habit_id = habits.id"
+            " AND completions.day BETWEEN ? AND ?"
+            " GROUP BY habits.id"
+            " HAVING COUNT(completions.day) < habits.weekly_goal"
+            " ORDER BY habits.id",
+            (monday.isoformat(), (monday + timedelta(days=6)).isoformat()),
+        ).fetchall()
+
+    def day_counts(self, monday: date) -> list[int]:
+        # Number of habits completed on each day of that week, Monday first.
+        self.flush()
+        rows = self.connection.execute(
+            "SELECT day, COUNT(*) FROM completions"
+            " WHERE day BETWEEN ? AND ? GROUP BY day",
+            (monday.isoformat(), (monday + timedelta(days=6)).isoformat()),
+        )
+        counts = [0] * 7
+        for day, count in rows:
+            counts[(date.fromisoformat(day) - monday).days] = count
+        return counts
@@ -0,0 +1,271 @@
+import calendar
+import mmap
+import os
+import struct
+from bisect import bisect_right
+from collections.abc import Iterator
+from datetime import date, timedelta
+
+
+# History starts on this Monday and covers this many weeks (about 30 years).
+HISTORY_START = date(2016, 1, 4)
+HISTORY_WEEKS = 1566
+# File header: magic bytes, weeks per row, number of rows.
+HEADER = struct.Struct("<8sII")
+MAGIC = b"HABHIST2"
+# Files from before rows had a ROW_HEADER; they are converted when opened.
+OLD_MAGIC = b"HABHIST1"
+# Stored in front of each row's week bytes: the habit's first week (rates
+# start there) and its longest streak (kept up to date by mark()), so
+# neither needs a scan of the row.
+ROW_HEADER = struct.Struct("<II")
+# Number of set bits in each byte value, for counting with bytes.translate.
+POPCOUNT = bytes(bin(value).count("1") for value in range(256))
+# A week's mask spelled out as seven "0"/"1" characters, Monday first.
+DAY_CHARS = tuple(
+    "".join("1" if value >> bit & 1 else "0" for bit in range(7))
+    for value in range(256)
+)
+
+
+def day_index(when: date) -> int:
+    # Days since HISTORY_START.
+    return (when - HISTORY_START).days
+
+
+def longest_run(weeks: bytes) -> int:
+    # Longest run of completed days in a row's week bytes. Spell the row out
+    # one character per day; runs are the pieces between the "0" days.
+    days = "".join(map(DAY_CHARS.__getitem__, weeks.strip(b"\0")))
+    return max(map(len, days.split("0")))
+
+
+# Memory-mapped file with one row per habit: a ROW_HEADER, then one byte per
+# week. Each byte is a 7-bit mask of completed days, the same layout as
+# Habit.mask.
+class HistoryStore:
+    def __init__(
+        self, path: str, weeks: int = HISTORY_WEEKS, today: date | None = None
+    ) -> None:
+        # `today` is the first week of rows added now (and of empty rows in
+        # an old file being converted); it defaults to the real date.
+        self.path = path
+        self.weeks = weeks
+        self.today = today
+        if not os.path.exists(path):
+            with open(path, "wb") as handle:
+                handle.write(HEADER.pack(MAGIC, weeks, 0))
+        else:
+            with open(path, "rb") as handle:
+                if handle.read(len(OLD_MAGIC)) == OLD_MAGIC:
+                    self._convert()
+        self._file = open(path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, self.weeks, self.rows = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a habit history file")
+        self.stride = ROW_HEADER.size + self.weeks
+
+    def _this_week(self) -> int:
+        week = day_index(self.today or date.today()) // 7
+        return min(max(week, 0), self.weeks - 1)
+
+    def _convert(self) -> None:
+        # Rewrite an old file with a ROW_HEADER per row: its first week with
+        # a completion (this week if none) and its longest streak. Runs once.
+        with open(self.path, "rb") as handle:
+            data = handle.read()
+        _, weeks, rows = HEADER.unpack_from(data)
+        self.weeks = weeks
+        this_week = self._this_week()
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "wb") as handle:
+            handle.write(HEADER.pack(MAGIC, weeks, rows))
+            for row in range(rows):
+                start = HEADER.size + row * weeks
+                row_weeks = data[start:start + weeks]
+                done = len(row_weeks) - len(row_weeks.lstrip(b"\0"))
+                first = done if done < weeks else this_week
+                handle.write(ROW_HEADER.pack(first, longest_run(row_weeks)))
+                handle.write(row_weeks)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, self.path)
+
+    def close(self) -> None:
+        self._map.flush()
+        self._map.close()
+        self._file.close()
+
+    def flush(self) -> None:
+        self._map.flush()
+
+    def _row_start(self, row: int) -> int:
+        # Position of a row's ROW_HEADER.
+        return HEADER.size + row * self.stride
+
+    def _offset(self, row: int, week: int = 0) -> int:
+        return self._row_start(row) + ROW_HEADER.size + week
+
+    def ensure_rows(self, count: int) -> None:
+        # Grow the file so rows 0..count-1 exist. New rows start this week
+        # and have no completed days.
+        if count <= self.rows:
+            return
+        size = self._row_start(count)
+        self._map.flush()
+        self._file.truncate(size)
+        self._map.resize(size)
+        this_week = self._this_week()
+        for row in range(self.rows, count):
+            ROW_HEADER.pack_into(self._map, self._row_start(row), this_week, 0)
+        self.rows = count
+        HEADER.pack_into(self._map, 0, MAGIC, self.weeks, self.rows)
+
+    def first_week(self, row: int) -> int:
+        # Week the habit was added (or first done, if that was earlier).
+        return ROW_HEADER.unpack_from(self._map, self._row_start(row))[0]
+
+    def mark(self, row: int, when: date) -> bool:
+        # Record a completed day; return False if it was already recorded.
+        day = day_index(when)
+        week, bit = divmod(day, 7)
+        if not 0 <= week < self.weeks:
+            raise ValueError(f"{when} is outside the history range")
+        offset = self._offset(row, week)
+        mask = self._map[offset]
+        if mask & (1 << bit):
+            return False
+        self._map[offset] = mask | (1 << bit)
+        # The new day joins the runs on either side of it.
+        run = self._run_length(row, day, -1) + self._run_length(row, day + 1, 1)
+        first, longest = ROW_HEADER.unpack_from(self._map, self._row_start(row))
+        ROW_HEADER.pack_into(
+            self._map, self._row_start(row), min(first, week), max(longest, run)
+        )
+        return True
+
+    def _run_length(self, row: int, day: int, step: int) -> int:
+        # Completed days in a row starting at `day` and moving by step (+1/-1).
+        # Fully completed weeks are skipped a whole byte at a time.
+        base = self._offset(row)
+        week_edge = 0 if step > 0 else 6
+        count = 0
+        while 0 <= day < self.weeks * 7:
+            week, bit = divmod(day, 7)
+            mask = self._map[base + week]
+            if mask == 0x7F and bit == week_edge:
+                count += 7
+                day += 7 * step
+            elif mask >> bit & 1:
+                count += 1
+                day += step
+            else:
+                break
+        return count
+
+    def completed_days(self, row: int) -> Iterator[date]:
+        # Every recorded day for one habit, oldest first.
+        base = self._offset(row)
+        for week, mask in enumerate(self._map[base:base + self.weeks]):
+            for bit in range(7):
+                if mask >> bit & 1:
+                    yield HISTORY_START + timedelta(days=week * 7 + bit)
+
+    def current_streak(self, row: int, today: date) -> int:
+        # Run ending today, or yesterday if today is not done yet.
+        day = day_index(today)
+        return self._run_length(row, day, -1) or self._run_length(row, day - 1, -1)
+
+    def longest_streak(self, row: int) -> int:
+        # Stored in the row header, so no scan.
+        return ROW_HEADER.unpack_from(self._map, self._row_start(row))[1]
+
+    def rolling_rate(self, row: int, today: date, days: int = 28) -> float:
+        # Share of the last `days` days (up to today) that were completed,
+        # not counting weeks before the habit's first week.
+        end = day_index(today)
+        first = max(end - days + 1, self.first_week(row) * 7, 0)
+        done = 0
+        for week in range(first // 7, end // 7 + 1):
+            low = max(first - week * 7, 0)
+            high = min(end - week * 7, 6)
+            span = ((1 << (high - low + 1)) - 1) << low
+            done += POPCOUNT[self._map[self._offset(row, week)] & span]
+        return done / (end - first + 1) if end >= first else 0.0
+
+    def _column(self, week: int) -> bytes:
+        # One byte per habit for a given week (a strided slice of the file).
+        return self._map[self._offset(0, week):self._offset(self.rows):self.stride]
+
+    def week_masks(self, when: date) -> bytes:
+        # Every habit's completed days in the week containing `when`, one
+        # mask byte per row.
+        week = day_index(when) // 7
+        if not 0 <= week < self.weeks:
+            return bytes(self.rows)
+        return self._column(week)
+
+    def _first_weeks(self) -> list[int]:
+        # Every row's first week, sorted: bisect_right(result, week) is the
+        # number of habits that existed in that week.
+        return sorted(self.first_week(row) for row in range(self.rows))
+
+    def weekly_rates(self, today: date, count: int) -> list[tuple[date, float]]:
+        # Completion rate across all habits for each of the last `count`
+        # weeks, counting each habit only from its first week.
+        if not self.rows:
+            return []
+        first_weeks = self._first_weeks()
+        this_week = day_index(today) // 7
+        rates = []
+        for week in range(max(this_week - count + 1, 0), this_week + 1):
+            days = 7 if week < this_week else day_index(today) % 7 + 1
+            possible = days * bisect_right(first_weeks, week)
+            done = sum(self._column(week).translate(POPCOUNT))
+            rate = done / possible if possible else 0.0
+            rates.append((HISTORY_START + timedelta(weeks=week), rate))
+        return rates
+
+    def monthly_rates(self, today: date, count: int) -> list[tuple[str, float]]:
+        # Completion rate across all habits for each of the last `count` months.
+        if not self.rows:
+            return []
+        months = []
+        year, month = today.year, today.month
+        for _ in range(count):
+            if date(year, month, 1) < HISTORY_START:
+                break
+            months.append((year, month))
+            year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+
+        first_weeks = self._first_weeks()
+        rates = []
+        for year, month in reversed(months):
+            first = day_index(date(year, month, 1))
+            last = min(
+                day_index(date(year, month, calendar.monthrange(year, month)[1])),
+                day_index(today),
+            )
+            done = possible = 0
+            for week in range(first // 7, last // 7 + 1):
+                low = max(first - week * 7, 0)
+                high = min(last - week * 7, 6)
+                span = ((1 << (high - low + 1)) - 1) << low
+                table = _masked_popcount(span)
+                done += sum(self._column(week).translate(table))
+                possible += (high - low + 1) * bisect_right(first_weeks, week)
+            rates.append((f"{year}-{month:02d}", done / possible if possible else 0.0))
+        return rates
+
+
+_masked_tables: dict[int, bytes] = {}
+
+
+def _masked_popcount(span: int) -> bytes:
+    # Translate table counting only the bits inside span.
+    table = _masked_tables.get(span)
+    if table is None:
+        table = bytes(POPCOUNT[value & span] for value in range(256))
+        _masked_tables[span] = table
+    return table
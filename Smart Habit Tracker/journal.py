@@ -0,0 +1,169 @@
+import json
+import os
+
+
+# Snapshot file plus an append-only log of changes made since that snapshot.
+# Each change is one JSON line with an increasing "seq" number; the snapshot
+# records the last seq it contains, so replay skips anything older.
+class HabitJournal:
+    # The app writes full snapshots to fold the log into habits.json.
+    snapshots = True
+
+    def __init__(self, snapshot_path: str, log_path: str, sync_every: int = 32) -> None:
+        self.snapshot_path = snapshot_path
+        self.log_path = log_path
+        # fsync after this many appends (sync() covers the rest).
+        self.sync_every = sync_every
+        self.seq = 0
+        # Last seq number stored in the snapshot file when it was loaded.
+        self.snapshot_seq = 0
+        self._unsynced = 0
+        self._handle = None
+        # Snapshot text kept between load_index() and load_rest().
+        self._text = ""
+        self._saved: list | None = None
+        self._masks_at = -1
+
+    def load_index(self) -> tuple[list[str], list[int]]:
+        # First pass: only habit names and goals, so the window can show the
+        # list before completions are parsed. load_rest() does the remainder.
+        if not os.path.exists(self.snapshot_path):
+            return [], []
+        with open(self.snapshot_path, "r", encoding="utf-8") as handle:
+            self._text = handle.read()
+
+        if self._text.lstrip().startswith("["):
+            # Older files are a plain list of habits.
+            return self._index_habit_dicts(json.loads(self._text))
+        columns, self._masks_at = _read_columns(self._text, stop_at="masks")
+        self.seq = int(columns["seq"])
+        if "habits" in columns:
+            # Older snapshots kept one dict per habit.
+            return self._index_habit_dicts(columns["habits"])
+        return columns["names"], [int(goal) for goal in columns["goals"]]
+
+    def _index_habit_dicts(self, habits: list[dict]) -> tuple[list[str], list[int]]:
+        self._saved = habits
+        return (
+            [habit["name"] for habit in habits],
+            [int(habit["weekly_goal"]) for habit in habits],
+        )
+
+    def load_rest(self) -> tuple[list, list[dict]]:
+        # Second pass, safe to run on a background thread: the completions
+        # for each habit from load_index() and the newer events from the log.
+        # Completions are masks, or whole habit dicts from older files.
+        if self._saved is not None:
+            saved = self._saved
+        elif self._masks_at >= 0:
+            saved = json.JSONDecoder().raw_decode(self._text, self._masks_at)[0]
+        else:
+            saved = []
+        self._text = ""
+        self._saved = None
+
+        snapshot_seq = self.seq
+        self.snapshot_seq = snapshot_seq
+        events: list[dict] = []
+        if os.path.exists(self.log_path):
+            good_bytes = 0
+            with open(self.log_path, "rb") as handle:
+                for line in handle:
+                    # A crash can leave a half-written last line.
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        break
+                    good_bytes += len(line)
+                    if event["seq"] > snapshot_seq:
+                        events.append(event)
+                        self.seq = event["seq"]
+            if good_bytes < os.path.getsize(self.log_path):
+                # Drop the damaged tail so new appends start on a clean line.
+                os.truncate(self.log_path, good_bytes)
+        return saved, events
+
+    def append(self, event: dict) -> None:
+        # Write one change to the end of the log.
+        if self._handle is None:
+            self._handle = open(self.log_path, "a", encoding="utf-8")
+        self.seq += 1
+        self._handle.write(json.dumps({"seq": self.seq, **event}) + "\n")
+        self._handle.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        # Force appended changes onto the disk.
+        if self._handle is not None and self._unsynced:
+            os.fsync(self._handle.fileno())
+            self._unsynced = 0
+
+    def write_snapshot(self, snapshot: dict) -> None:
+        # Atomically replace the snapshot file. Safe to call from any thread;
+        # it only touches the snapshot file, never the open log.
+        write_atomic(self.snapshot_path, snapshot)
+
+    def snapshot(self, names: list[str], goals: list[int], masks: list[int]) -> dict:
+        # Package habit data with the seq number it is current up to. Masks
+        # go last so load_index() can stop reading before them.
+        return {"seq": self.seq, "names": names, "goals": goals, "masks": masks}
+
+    def truncate_log(self) -> None:
+        # Start an empty log once a snapshot holds every logged change.
+        # If we crash before this, replay skips those events by seq number.
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        open(self.log_path, "w", encoding="utf-8").close()
+        self._unsynced = 0
+
+    def close(self) -> None:
+        self.sync()
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+def write_atomic(path: str, data: object) -> None:
+    # Write JSON to a temp file, fsync it, then rename it over the target.
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(data, handle, separators=(",", ":"))
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temp_path, path)
+
+
+def _read_columns(text: str, stop_at: str) -> tuple[dict, int]:
+    # Decode the top-level object in text one key at a time. Stops before the
+    # value of `stop_at` and returns its position (-1 if the key is missing).
+    decoder = json.JSONDecoder()
+    values: dict = {}
+    pos = _skip(text, 0, "{")
+    while pos < len(text) and text[pos] != "}":
+        key, pos = decoder.raw_decode(text, pos)
+        pos = _skip(text, pos, ":")
+        if key == stop_at:
+            return values, pos
+        values[key], pos = decoder.raw_decode(text, pos)
+        pos = _skip(text, pos, ",}")
+        if text[pos - 1] == "}":
+            break
+    return values, -1
+
+
+def _skip(text: str, pos: int, expected: str) -> int:
+    # Step over whitespace and one of the expected characters, then
+    # whitespace again; return where the next value starts.
+    while pos < len(text) and text[pos].isspace():
+        pos += 1
+    if pos >= len(text) or text[pos] not in expected:
+        raise ValueError(f"expected {expected!r} at position {pos}")
+    pos += 1
+    while pos < len(text) and text[pos].isspace():
+        pos += 1
+    return pos
@@ -1,58 +1,240 @@
+import argparse
 import json
 import os
+import shutil
+import sqlite3
+import sys
+import threading
+import time
 import tkinter as tk
+from datetime import date, timedelta
 from tkinter import messagebox, ttk
 
+from autosave import AutoSaver
+from database import HabitDatabase
+from history import POPCOUNT, HistoryStore
+from journal import HabitJournal
+from virtual_text import VirtualTextView
+
 
 # File used to persist habits between runs.
 DATA_FILE = "habits.json"
+# Append-only log of changes made since DATA_FILE was last written.
+LOG_FILE = "habits.log"
+# Memory-mapped file with every completed day, kept across weekly resets.
+HISTORY_FILE = "habits.history"
+# How far back the History window reports.
+HISTORY_VIEW_WEEKS = 12
+HISTORY_VIEW_MONTHS = 12
+# Save a snapshot this long after the last change (rapid edits coalesce).
+AUTOSAVE_DELAY_MS = 2000
+# Save right away if this many changes pile up without a pause.
+COMPACT_EVERY = 1000
+# How often the UI checks for finished background saves.
+AUTOSAVE_POLL_MS = 200
+# Wait this long after a change before forcing the log to disk.
+SYNC_DELAY_MS = 500
+# How often the UI checks whether completions have finished loading.
+LOAD_POLL_MS = 50
+
+
+# Days of the week in order; day i is bit i of a habit's completion mask.
+DAYS = (
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+)
+DAY_BITS = {day: 1 << index for index, day in enumerate(DAYS)}
+
+
+def date_for_day(day: str, today: date) -> date:
+    # Date of the named weekday in the calendar week containing today.
+    monday = today - timedelta(days=today.weekday())
+    return monday + timedelta(days=DAYS.index(day))
 
 
 # Data model for one habit and its weekly progress.
 class Habit:
+    __slots__ = ("name", "weekly_goal", "mask")
+
     def __init__(self, name: str, weekly_goal: int) -> None:
         # Store the habit name and target goal for the week.
         self.name = name
         self.weekly_goal = weekly_goal
-        # Track completed days (strings like "Monday").
-        self.completions: list[str] = []
+        # Completed days as a 7-bit number (bit 0 = Monday).
+        self.mask = 0
 
     def mark_complete(self, day: str) -> None:
-        # Add a completion day only once.
-        if day not in self.completions:
-            self.completions.append(day)
+        # Set the day's bit; marking twice has no effect.
+        self.mask |= DAY_BITS[day]
+
+    def is_complete(self, day: str) -> bool:
+        return bool(self.mask & DAY_BITS[day])
+
+    def completed_count(self) -> int:
+        return self.mask.bit_count()
+
+    @property
+    def completions(self) -> list[str]:
+        # Completed day names in week order.
+        return [day for day in DAYS if self.mask & DAY_BITS[day]]
+
+    def reset(self) -> None:
+        # Clear every completion for a new week.
+        self.mask = 0
 
     def progress_text(self) -> str:
         # Build a short progress summary with percentage.
-        count = len(self.completions)
+        count = self.completed_count()
         percent = (count / self.weekly_goal) * 100 if self.weekly_goal else 0
         return f"{count}/{self.weekly_goal} ({percent:.0f}%)"
 
     def to_dict(self) -> dict:
         # Convert the habit to a JSON-friendly dictionary.
-        return {
-            "name": self.name,
-            "weekly_goal": self.weekly_goal,
-            "completions": self.completions,
-        }
+        return {"name": self.name, "weekly_goal": self.weekly_goal, "mask": self.mask}
 
     @staticmethod
     def from_dict(data: dict) -> "Habit":
-        # Rebuild a Habit object from saved data.
+        # Rebuild a Habit object from saved data (old files list day names).
         habit = Habit(data["name"], int(data["weekly_goal"]))
-        habit.completions = list(data.get("completions", []))
+        if "mask" in data:
+            habit.mask = int(data["mask"]) & 0x7F
+        else:
+            for day in data.get("completions", []):
+                habit.mark_complete(day)
         return habit
 
 
+def habit_block(habit: Habit, loaded: bool = True) -> str:
+    # Build the multi-line summary text for one habit.
+    if not loaded:
+        days = progress = "loading…"
+    else:
+        days = ", ".join(habit.completions) if habit.mask else "none yet"
+        progress = habit.progress_text()
+    return (
+        f"Habit: {habit.name}\n"
+        f"  Goal: {habit.weekly_goal} times/week\n"
+        f"  Done: {days}\n"
+        f"  Progress: {progress}\n\n"
+    )
+
+
+def apply_loaded(
+    habits: list[Habit], index: dict[str, int], saved: list, events: list[dict]
+) -> None:
+    # Fill in completions from load_rest(), then replay logged changes.
+    # Completions are masks, or whole habit dicts from older files.
+    for habit, item in zip(habits, saved):
+        if isinstance(item, dict):
+            habit.mask = Habit.from_dict(item).mask
+        else:
+            habit.mask = int(item) & 0x7F
+    for event in events:
+        op = event["op"]
+        if op == "add":
+            index[event["name"].lower()] = len(habits)
+            habits.append(Habit(event["name"], int(event["goal"])))
+        elif op == "complete":
+            habits[index[event["name"].lower()]].mark_complete(event["day"])
+        elif op == "reset":
+            for habit in habits:
+                habit.reset()
+
+
+def history_file_for(db_path: str) -> str:
+    # The history file used with a database: beside it, named after it.
+    return os.path.splitext(db_path)[0] + ".history"
+
+
+def migrate(
+    journal: HabitJournal,
+    history_path: str,
+    database: HabitDatabase,
+    today: date | None = None,
+) -> int:
+    # Copy habits (and their dated history, if any) from JSON into SQLite,
+    # and the history file to sit beside the database.
+    today = today or date.today()
+    names, goals = journal.load_index()
+    habits = [Habit(name, goal) for name, goal in zip(names, goals)]
+    index = {name.lower(): position for position, name in enumerate(names)}
+    apply_loaded(habits, index, *journal.load_rest())
+    if database.load_index()[0]:
+        raise ValueError(f"{database.path} already has habits")
+
+    # This week's days are dated from the masks, in case they were marked
+    # before there was a history file; duplicates are ignored.
+    completions = [
+        (row, date_for_day(day, today).isoformat())
+        for row, habit in enumerate(habits)
+        for day in habit.completions
+    ]
+    if os.path.exists(history_path):
+        history = HistoryStore(history_path)
+        try:
+            for row in range(min(history.rows, len(habits))):
+                completions.extend(
+                    (row, day.isoformat()) for day in history.completed_days(row)
+                )
+        finally:
+            history.close()
+    database.add_habits(
+        ((habit.name, habit.weekly_goal, habit.mask) for habit in habits), completions
+    )
+    target = history_file_for(database.path)
+    if os.path.exists(history_path) and os.path.abspath(target) != os.path.abspath(
+        history_path
+    ):
+        # Rows follow habit order, which the database keeps.
+        shutil.copyfile(history_path, target)
+    return len(habits)
+
+
 # Main GUI application class for the habit tracker.
 class HabitTrackerApp:
-    def __init__(self, root: tk.Tk) -> None:
+    def __init__(
+        self,
+        root: tk.Tk,
+        autosave_delay_ms: int = AUTOSAVE_DELAY_MS,
+        store: HabitJournal | HabitDatabase | None = None,
+        history_path: str = HISTORY_FILE,
+    ) -> None:
         # Store root window and initialize state.
         self.root = root
         self.root.title("Smart Habit Tracker")
         self.habits: list[Habit] = []
-
-        # Build UI, load saved data, and show current state.
+        # Lower-case habit name -> position in self.habits.
+        self._index: dict[str, int] = {}
+        # Where changes are saved: the JSON journal unless a database is given.
+        self.journal = store if store is not None else HabitJournal(DATA_FILE, LOG_FILE)
+        # Row i of the history file belongs to self.habits[i].
+        self.history = HistoryStore(history_path)
+        self._sync_job: str | None = None
+        # Snapshots are serialised and written by a background thread.
+        self.autosave_delay_ms = autosave_delay_ms
+        self.autosaver = AutoSaver(self.journal.write_snapshot)
+        self._autosave_job: str | None = None
+        self._saved_seq = 0
+        self._snapshot_ms = 0.0
+        # Completions are read on a background thread after the first paint;
+        # until they arrive the buttons that change habits are disabled.
+        self.loaded = False
+        self._loader: threading.Thread | None = None
+        self._load_result: tuple[list, list[dict]] | None = None
+        self._load_error: Exception | None = None
+        # After a failed load nothing is written (no log appends, history
+        # marks, autosaves or log truncation) until the user confirms a
+        # manual save, so files that could not be read are not overwritten.
+        # Changes made meanwhile wait in _held_events.
+        self._writes_blocked = False
+        self._held_events: list[dict] = []
+
+        # Build UI, show saved habit names, then load the rest in the background.
         self._build_ui()
         self._load_habits()
         self._refresh_views()
@@ -79,9 +261,8 @@ class HabitTrackerApp:
         self.goal_entry = ttk.Entry(add_frame, width=10)
         self.goal_entry.grid(row=0, column=3, sticky="w", padx=6)
 
-        ttk.Button(add_frame, text="Add Habit", command=self.add_habit).grid(
-            row=0, column=4, sticky="e"
-        )
+        add_button = ttk.Button(add_frame, text="Add Habit", command=self.add_habit)
+        add_button.grid(row=0, column=4, sticky="e")
 
         # Section: list existing habits.
         list_frame = ttk.LabelFrame(main, text="Habits", padding=10)
@@ -102,27 +283,21 @@ class HabitTrackerApp:
         self.day_combo = ttk.Combobox(
             complete_frame,
             textvariable=self.day_var,
-            values=[
-                "Monday",
-                "Tuesday",
-                "Wednesday",
-                "Thursday",
-                "Friday",
-                "Saturday",
-                "Sunday",
-            ],
+            values=list(DAYS),
             state="readonly",
             width=14,
         )
         self.day_combo.grid(row=0, column=1, sticky="w", padx=6)
 
-        ttk.Button(
+        mark_button = ttk.Button(
             complete_frame, text="Mark Complete", command=self.mark_complete
-        ).grid(row=0, column=2, sticky="e")
+        )
+        mark_button.grid(row=0, column=2, sticky="e")
 
-        ttk.Button(
+        reset_button = ttk.Button(
             complete_frame, text="Weekly Reset", command=self.reset_week
-        ).grid(row=0, column=3, sticky="e", padx=6)
+        )
+        reset_button.grid(row=0, column=3, sticky="e", padx=6)
 
         # Section: summary of all habits.
         summary_frame = ttk.LabelFrame(main, text="Summary", padding=10)
@@ -130,20 +305,44 @@ class HabitTrackerApp:
         summary_frame.columnconfigure(0, weight=1)
         summary_frame.rowconfigure(0, weight=1)
 
-        self.summary_text = tk.Text(summary_frame, height=10, wrap="word")
-        self.summary_text.grid(row=0, column=0, sticky="nsew")
-        self.summary_text.configure(state="disabled")
+        # Only the habits near the visible area are drawn.
+        self.summary_view = VirtualTextView(
+            summary_frame,
+            count=lambda: len(self.habits),
+            render=lambda index: habit_block(self.habits[index], self.loaded),
+            empty_text="No habits yet. Add one to get started.",
+            height=10,
+        )
+        self.summary_view.grid(row=0, column=0, sticky="nsew")
 
         # Bottom action buttons.
         button_frame = ttk.Frame(main)
         button_frame.grid(row=4, column=0, sticky="ew", pady=6)
         button_frame.columnconfigure(0, weight=1)
-        ttk.Button(
+        save_button = ttk.Button(
             button_frame, text="Save Habits", command=self._save_habits
-        ).grid(row=0, column=0, sticky="w")
+        )
+        save_button.grid(row=0, column=0, sticky="w")
+        self.save_status = ttk.Label(button_frame, text="")
+        self.save_status.grid(row=0, column=1, sticky="e", padx=6)
+        history_button = ttk.Button(
+            button_frame, text="History", command=self._open_history
+        )
+        history_button.grid(row=0, column=2, sticky="e", padx=6)
         ttk.Button(
             button_frame, text="Clear Inputs", command=self._clear_inputs
-        ).grid(row=0, column=1, sticky="e")
+        ).grid(row=0, column=3, sticky="e")
+
+        # Buttons that need completions; enabled once loading finishes.
+        self._load_buttons = (
+            add_button,
+            mark_button,
+            reset_button,
+            save_button,
+            history_button,
+        )
+        for button in self._load_buttons:
+            button.state(["disabled"])
 
     def _clear_inputs(self) -> None:
         # Clear the habit name and goal fields.
@@ -157,7 +356,7 @@ class HabitTrackerApp:
             messagebox.showerror("Invalid Name", "Please enter a habit name.")
             return
 
-        if any(habit.name.lower() == name.lower() for habit in self.habits):
+        if name.lower() in self._index:
             messagebox.showerror("Duplicate Habit", "That habit already exists.")
             return
 
@@ -171,99 +370,390 @@ class HabitTrackerApp:
             messagebox.showerror("Invalid Goal", "Weekly goal must be at least 1.")
             return
 
-        self.habits.append(Habit(name, goal))
+        index = self._append(Habit(name, goal))
+        self._record({"op": "add", "name": name, "goal": goal})
         self._clear_inputs()
-        self._refresh_views()
-
-    def _get_selected_habit(self) -> Habit | None:
-        # Get the habit selected in the listbox, if any.
+        self.habit_listbox.insert(tk.END, self._habit_label(self.habits[index]))
+        self.habit_listbox.see(index)
+        self.summary_view.refresh(changed=[index])
+
+    def _append(self, habit: Habit) -> int:
+        # Add a habit to the list and the name index; return its position.
+        self._index[habit.name.lower()] = len(self.habits)
+        self.habits.append(habit)
+        return len(self.habits) - 1
+
+    def _get_selected_index(self) -> int | None:
+        # Get the position of the habit selected in the listbox, if any.
         selection = self.habit_listbox.curselection()
         if not selection:
             return None
-        return self.habits[selection[0]]
+        return selection[0]
 
     def mark_complete(self) -> None:
         # Mark the selected habit complete for the chosen day.
-        habit = self._get_selected_habit()
-        if not habit:
+        index = self._get_selected_index()
+        if index is None:
             messagebox.showerror("No Habit Selected", "Select a habit first.")
             return
 
+        habit = self.habits[index]
         day = self.day_var.get()
-        habit.mark_complete(day)
-        self._refresh_views()
+        # The history keeps the date and updates the habit's streaks.
+        when = date_for_day(day, date.today())
+        if not self._writes_blocked:
+            self.history.mark(index, when)
+        if not habit.is_complete(day):
+            habit.mark_complete(day)
+            self._record({
+                "op": "complete",
+                "name": habit.name,
+                "day": day,
+                "date": when.isoformat(),
+            })
+            self._refresh_row(index)
+
+    def _refresh_row(self, index: int) -> None:
+        # Redraw one habit's listbox row and summary block, keeping selection.
+        selected = index in self.habit_listbox.curselection()
+        self.habit_listbox.delete(index)
+        self.habit_listbox.insert(index, self._habit_label(self.habits[index]))
+        if selected:
+            self.habit_listbox.selection_set(index)
+            self.habit_listbox.activate(index)
+        self.summary_view.refresh(changed=[index])
+
+    def _habit_label(self, habit: Habit) -> str:
+        progress = habit.progress_text() if self.loaded else "loading…"
+        return f"{habit.name} — {progress}"
 
     def reset_week(self) -> None:
-        # Clear all completion data for every habit.
+        # Clear this week's completions; the history file keeps them.
         if not self.habits:
             messagebox.showinfo("Nothing to Reset", "Add a habit first.")
             return
 
         if not messagebox.askyesno(
-            "Reset Week", "Clear all weekly completions?"
+            "Reset Week",
+            "Clear all weekly completions?\nPast days stay in the history.",
         ):
             return
 
         for habit in self.habits:
-            habit.completions.clear()
+            habit.reset()
+        self._record({"op": "reset"})
         self._refresh_views()
 
     def _refresh_views(self) -> None:
         # Rebuild the listbox and summary area from current data.
+        selection = self.habit_listbox.curselection()
         self.habit_listbox.delete(0, tk.END)
-        for habit in self.habits:
-            label = f"{habit.name} — {habit.progress_text()}"
-            self.habit_listbox.insert(tk.END, label)
-
-        # Update the read-only summary text.
-        self.summary_text.configure(state="normal")
-        self.summary_text.delete("1.0", tk.END)
-        if not self.habits:
-            self.summary_text.insert(
-                tk.END, "No habits yet. Add one to get started."
+        self.habit_listbox.insert(
+            tk.END, *[self._habit_label(habit) for habit in self.habits]
+        )
+        for index in selection:
+            self.habit_listbox.selection_set(index)
+
+        # Update the summary from the habit list.
+        self.summary_view.refresh()
+
+    def _open_history(self) -> None:
+        # Show streaks per habit and completion rates over recent weeks/months.
+        if self._writes_blocked:
+            # The history rows belong to the habits that failed to load.
+            messagebox.showinfo(
+                "History Unavailable", "Save your habits first to use the history."
             )
+            return
+        today = date.today()
+        window = tk.Toplevel(self.root)
+        window.title("Habit History")
+        window.columnconfigure(0, weight=1)
+        window.rowconfigure(0, weight=1)
+
+        columns = ("habit", "current", "longest", "rate")
+        tree = ttk.Treeview(window, columns=columns, show="headings", height=12)
+        for column, heading, width in (
+            ("habit", "Habit", 200),
+            ("current", "Current Streak", 110),
+            ("longest", "Longest Streak", 110),
+            ("rate", "Last 4 Weeks", 100),
+        ):
+            tree.heading(column, text=heading)
+            tree.column(column, width=width, anchor="w" if column == "habit" else "e")
+        for row, habit in enumerate(self.habits):
+            tree.insert(
+                "",
+                tk.END,
+                values=(
+                    habit.name,
+                    f"{self.history.current_streak(row, today)} days",
+                    f"{self.history.longest_streak(row)} days",
+                    f"{self.history.rolling_rate(row, today):.0%}",
+                ),
+            )
+        tree.grid(row=0, column=0, sticky="nsew", padx=8, pady=8)
+        scrollbar = ttk.Scrollbar(window, orient="vertical", command=tree.yview)
+        scrollbar.grid(row=0, column=1, sticky="ns", pady=8)
+        tree.configure(yscrollcommand=scrollbar.set)
+
+        # Completion rates across all habits.
+        lines = ["Week of        Done"]
+        for monday, rate in self.history.weekly_rates(today, HISTORY_VIEW_WEEKS):
+            lines.append(f"{monday.isoformat()}   {rate:5.0%}")
+        lines.append("")
+        lines.append("Month          Done")
+        for month, rate in self.history.monthly_rates(today, HISTORY_VIEW_MONTHS):
+            lines.append(f"{month}        {rate:5.0%}")
+        below, counts = self._week_summary(today)
+        lines.append("")
+        lines.append(f"This week: {len(below)} below goal")
+        for day, count in zip(DAYS, counts):
+            lines.append(f"{day:<12} {count:>6}")
+        rates = tk.Text(window, height=12, width=24)
+        rates.insert("1.0", "\n".join(lines))
+        rates.configure(state="disabled")
+        rates.grid(row=0, column=2, sticky="ns", padx=8, pady=8)
+
+    def _week_summary(self, today: date) -> tuple[list[str], list[int]]:
+        # Habits below goal this calendar week and how many habits were done
+        # each day, from the dated completions (a Weekly Reset does not
+        # change them). The database counts in SQL; otherwise the week's
+        # byte of each history row is used.
+        monday = date_for_day(DAYS[0], today)
+        if isinstance(self.journal, HabitDatabase):
+            below = [name for name, _, _ in self.journal.below_goal(monday)]
+            return below, self.journal.day_counts(monday)
+        masks = self.history.week_masks(monday).ljust(len(self.habits), b"\0")
+        below = [
+            habit.name
+            for habit, mask in zip(self.habits, masks)
+            if POPCOUNT[mask] < habit.weekly_goal
+        ]
+        counts = [sum(1 for mask in masks if mask & bit) for bit in DAY_BITS.values()]
+        return below, counts
+
+    def _record(self, event: dict) -> None:
+        # Append one change to the journal; compact when the log gets long.
+        if self._writes_blocked:
+            self._held_events.append(event)
+            self.save_status.config(text="Not saved: click Save Habits")
+            return
+        if event["op"] == "add":
+            self.history.ensure_rows(len(self.habits))
+        try:
+            self.journal.append(event)
+        except (OSError, sqlite3.Error):
+            messagebox.showerror("Save Failed", "Could not save habits.")
+            return
+        if self._sync_job is None:
+            self._sync_job = self.root.after(SYNC_DELAY_MS, self._sync_journal)
+        self._schedule_autosave()
+
+    def _schedule_autosave(self) -> None:
+        # Restart the debounce timer; save now if too many changes piled up.
+        if not self.journal.snapshots:
+            return
+        if self._autosave_job is not None:
+            self.root.after_cancel(self._autosave_job)
+        if self.journal.seq - self._saved_seq >= COMPACT_EVERY:
+            self._autosave_job = None
+            self._autosave()
         else:
-            for habit in self.habits:
-                self.summary_text.insert(tk.END, f"Habit: {habit.name}\n")
-                self.summary_text.insert(
-                    tk.END, f"  Goal: {habit.weekly_goal} times/week\n"
-                )
-                if habit.completions:
-                    days = ", ".join(habit.completions)
-                    self.summary_text.insert(tk.END, f"  Done: {days}\n")
-                else:
-                    self.summary_text.insert(tk.END, "  Done: none yet\n")
-                self.summary_text.insert(
-                    tk.END, f"  Progress: {habit.progress_text()}\n\n"
-                )
-        self.summary_text.configure(state="disabled")
+            self._autosave_job = self.root.after(
+                self.autosave_delay_ms, self._autosave
+            )
+
+    def _autosave(self) -> None:
+        # Copy habit data on the UI thread and hand it to the background saver.
+        self._autosave_job = None
+        start = time.perf_counter()
+        snapshot = self.journal.snapshot(
+            [habit.name for habit in self.habits],
+            [habit.weekly_goal for habit in self.habits],
+            [habit.mask for habit in self.habits],
+        )
+        self._snapshot_ms = (time.perf_counter() - start) * 1000
+        self.autosaver.submit(snapshot, snapshot["seq"])
+        self.save_status.config(text="Saving…")
+
+    def _poll_autosave(self) -> None:
+        # Pick up finished background saves and show how long they took.
+        self._handle_saved()
+        self.root.after(AUTOSAVE_POLL_MS, self._poll_autosave)
+
+    def _handle_saved(self) -> None:
+        for seq, seconds, error in self.autosaver.results():
+            if error is not None:
+                self.save_status.config(text="Autosave failed!")
+                continue
+            self._saved_seq = max(self._saved_seq, seq)
+            if self.journal.seq == seq:
+                # The snapshot has every change, so the log can start over.
+                try:
+                    self.journal.truncate_log()
+                except OSError:
+                    pass
+            self.save_status.config(
+                text=f"Saved in {seconds * 1000:.1f} ms"
+                f" (UI thread {self._snapshot_ms:.1f} ms)"
+            )
+
+    def _sync_journal(self) -> None:
+        # Flush recent changes to disk in one fsync.
+        self._sync_job = None
+        try:
+            self.journal.sync()
+        except (OSError, sqlite3.Error):
+            messagebox.showerror("Save Failed", "Could not save habits.")
 
     def _save_habits(self) -> None:
-        # Save all habits to a local JSON file.
-        data = [habit.to_dict() for habit in self.habits]
+        # Save a full snapshot now, in the background.
+        if self._writes_blocked and not self._confirm_replace():
+            return
+        if not self.journal.snapshots:
+            # The database only needs its queued rows written.
+            if self._sync_job is not None:
+                self.root.after_cancel(self._sync_job)
+            self._sync_journal()
+            self.save_status.config(text="Saved")
+            return
+        if self._autosave_job is not None:
+            self.root.after_cancel(self._autosave_job)
+        self._autosave()
+
+    def _confirm_replace(self) -> bool:
+        # After a failed load, ask before the first write, then write the
+        # held changes. Returns False if the user cancels.
+        if not messagebox.askyesno(
+            "Replace Saved Habits?",
+            "Your saved habits could not be loaded.\n"
+            "Saving replaces them with the habits shown here. Continue?",
+        ):
+            return False
+        self._writes_blocked = False
+        held, self._held_events = self._held_events, []
+        self.history.ensure_rows(len(self.habits))
+        for event in held:
+            if event["op"] == "complete":
+                row = self._index[event["name"].lower()]
+                self.history.mark(row, date.fromisoformat(event["date"]))
         try:
-            with open(DATA_FILE, "w", encoding="utf-8") as handle:
-                json.dump(data, handle, indent=2)
-            messagebox.showinfo("Saved", "Habits saved successfully.")
-        except OSError:
+            if self.journal.snapshots:
+                # The snapshot written next holds every habit shown; the log
+                # that could not be replayed is dropped.
+                self.journal.truncate_log()
+            else:
+                for event in held:
+                    self.journal.append(event)
+        except (OSError, sqlite3.Error):
             messagebox.showerror("Save Failed", "Could not save habits.")
+            return False
+        return True
 
     def _load_habits(self) -> None:
-        # Load habits from disk if a save file exists.
-        if not os.path.exists(DATA_FILE):
+        # Read only names and goals now, then start the background loader.
+        try:
+            names, goals = self.journal.load_index()
+        except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError) as exc:
+            self._load_error = exc
+            names, goals = [], []
+        self.habits = [Habit(name, goal) for name, goal in zip(names, goals)]
+        self._index = {name.lower(): index for index, name in enumerate(names)}
+        if self._load_error is None:
+            self.save_status.config(text="Loading completions…")
+            self._loader = threading.Thread(target=self._load_rest, daemon=True)
+            self._loader.start()
+        self.root.after(LOAD_POLL_MS, self._poll_load)
+
+    def _load_rest(self) -> None:
+        # Runs on the loader thread; never touches Tk.
+        try:
+            self._load_result = self.journal.load_rest()
+        except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError) as exc:
+            self._load_error = exc
+
+    def _poll_load(self) -> None:
+        # Apply the loader's result on the UI thread once it is done.
+        if self._loader is not None and self._loader.is_alive():
+            self.root.after(LOAD_POLL_MS, self._poll_load)
             return
+        self._loader = None
+        if self._load_result is not None:
+            saved, events = self._load_result
+            self._load_result = None
+            try:
+                apply_loaded(self.habits, self._index, saved, events)
+            except (KeyError, TypeError, ValueError) as exc:
+                self._load_error = exc
+        self.loaded = True
+        self._saved_seq = self.journal.snapshot_seq
+        for button in self._load_buttons:
+            button.state(["!disabled"])
+        self.save_status.config(text="")
+        if self._load_error is not None:
+            self._writes_blocked = True
+            messagebox.showerror(
+                "Load Failed",
+                "Could not load saved habits.\n"
+                "Autosave is off so the saved files are left as they are."
+                " Click Save Habits to replace them with what you see.",
+            )
+        else:
+            self.history.ensure_rows(len(self.habits))
+        self._refresh_views()
+        self.root.after(AUTOSAVE_POLL_MS, self._poll_autosave)
+
+    def close(self) -> None:
+        # Make sure every change is on disk before the window closes.
+        if self._held_events and self._confirm_replace():
+            self._save_habits()
+        if self._autosave_job is not None:
+            self.root.after_cancel(self._autosave_job)
+            self._autosave()
+        self.autosaver.close()
+        self._handle_saved()
         try:
-            with open(DATA_FILE, "r", encoding="utf-8") as handle:
-                data = json.load(handle)
-            self.habits = [Habit.from_dict(item) for item in data]
-        except (OSError, json.JSONDecodeError, KeyError, TypeError):
-            messagebox.showerror("Load Failed", "Could not load saved habits.")
-
+            self.journal.close()
+            self.history.close()
+        except (OSError, sqlite3.Error):
+            messagebox.showerror("Save Failed", "Could not save habits.")
+        self.root.destroy()
+
+
+def main(argv: list[str] | None = None) -> None:
+    # Open the window, or migrate habits.json into a database.
+    parser = argparse.ArgumentParser(description="Smart Habit Tracker")
+    parser.add_argument(
+        "--db", help="keep habits in this SQLite file instead of habits.json"
+    )
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("migrate", help="copy habits.json and its history into --db")
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        if not args.db:
+            parser.error("migrate needs --db")
+        database = HabitDatabase(args.db)
+        try:
+            count = migrate(HabitJournal(DATA_FILE, LOG_FILE), HISTORY_FILE, database)
+        except (OSError, sqlite3.Error, KeyError, TypeError, ValueError) as exc:
+            print(f"Migration failed: {exc}", file=sys.stderr)
+            sys.exit(1)
+        finally:
+            database.close()
+        print(f"Copied {count} habits into {args.db}.")
+        return
 
-def main() -> None:
     # Create the window and start the app.
     root = tk.Tk()
-    app = HabitTrackerApp(root)
+    if args.db:
+        app = HabitTrackerApp(
+            root, store=HabitDatabase(args.db), history_path=history_file_for(args.db)
+        )
+    else:
+        app = HabitTrackerApp(root)
+    root.protocol("WM_DELETE_WINDOW", app.close)
     root.minsize(560, 540)
     root.mainloop()
 
@@ -0,0 +1,18 @@
+import sys
+from pathlib import Path
+
+
+# The app's modules sit one folder up and import each other by plain name.
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+# The three apps reuse module names (main, benchmarks, virtual_text). When
+# several apps' tests run together, forget any module loaded from another app
+# so this app's tests import its own.
+for name, module in list(sys.modules.items()):
+    path = getattr(module, "__file__", None)
+    if path is None:
+        continue
+    folder = Path(path).resolve().parent
+    if folder.parent == APP_DIR.parent and folder != APP_DIR:
+        del sys.modules[name]
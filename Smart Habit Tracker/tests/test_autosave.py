@@ -0,0 +1,65 @@
+import threading
+
+from autosave import AutoSaver
+
+
+def finishes(action, seconds: float = 5.0) -> bool:
+    # Run action on a thread; True if it returns within the time limit.
+    thread = threading.Thread(target=action, daemon=True)
+    thread.start()
+    thread.join(seconds)
+    return not thread.is_alive()
+
+
+def test_snapshots_are_saved_in_the_background():
+    saved = []
+    saver = AutoSaver(saved.append)
+    saver.submit({"seq": 1}, 1)
+    saver.flush()
+    assert saved == [{"seq": 1}]
+    [(tag, seconds, error)] = saver.results()
+    assert (tag, error) == (1, None)
+    assert seconds >= 0
+    assert saver.results() == []
+    saver.close()
+
+
+def test_any_save_error_is_reported_and_does_not_stop_the_worker():
+    saved = []
+
+    def save(data):
+        if data == "bad":
+            raise TypeError("not serialisable")
+        saved.append(data)
+
+    saver = AutoSaver(save)
+    saver.submit("bad", 1)
+    assert finishes(saver.flush)
+    [(tag, _, error)] = saver.results()
+    assert tag == 1
+    assert isinstance(error, TypeError)
+
+    saver.submit("good", 2)
+    assert finishes(saver.close)
+    assert saved == ["good"]
+    assert [(tag, error) for tag, _, error in saver.results()] == [(2, None)]
+
+
+def test_only_the_newest_waiting_snapshot_is_written():
+    started = threading.Event()
+    release = threading.Event()
+    saved = []
+
+    def save(data):
+        started.set()
+        release.wait(5)
+        saved.append(data)
+
+    saver = AutoSaver(save)
+    saver.submit(1, 1)
+    started.wait(5)
+    saver.submit(2, 2)
+    saver.submit(3, 3)
+    release.set()
+    saver.close()
+    assert saved == [1, 3]
@@ -0,0 +1,68 @@
+from datetime import date
+
+from database import HabitDatabase
+from history import HistoryStore
+from journal import HabitJournal
+from main import date_for_day, history_file_for, migrate
+
+TODAY = date(2024, 5, 15)
+MONDAY = date(2024, 5, 13)
+
+
+def test_sqlite_assigns_ids_and_changes_reach_the_right_habit(tmp_path):
+    path = str(tmp_path / "habits.db")
+    database = HabitDatabase(path)
+    database.add_habits([("Read", 2, 0)], [])
+    database.append({"op": "add", "name": "Run", "goal": 1})
+    database.append({"op": "complete", "name": "run", "date": "2024-05-14"})
+    database.close()
+
+    database = HabitDatabase(path)
+    assert database.load_index() == (["Read", "Run"], [2, 1])
+    database.append({"op": "add", "name": "Walk", "goal": 3})
+    database.append({"op": "complete", "name": "Walk", "date": "2024-05-13"})
+    database.flush()
+    assert database.load_rest() == ([0, 0b10, 0b1], [])
+    assert database.below_goal(MONDAY) == [("Read", 2, 0), ("Walk", 3, 1)]
+    assert database.day_counts(MONDAY) == [1, 1, 0, 0, 0, 0, 0]
+    database.append({"op": "reset"})
+    database.flush()
+    assert database.load_rest() == ([0, 0, 0], [])
+    # Completions are dated, so a reset does not change the week's counts.
+    assert database.day_counts(MONDAY) == [1, 1, 0, 0, 0, 0, 0]
+    database.close()
+
+
+def test_migrate_dates_this_weeks_marks_and_moves_the_history(tmp_path):
+    journal = HabitJournal(str(tmp_path / "habits.json"), str(tmp_path / "habits.log"))
+    journal.append({"op": "add", "name": "Read", "goal": 3})
+    journal.append({"op": "complete", "name": "Read", "day": "Monday"})
+    journal.append({"op": "add", "name": "Run", "goal": 2})
+    journal.append({"op": "complete", "name": "Run", "day": "Friday"})
+    journal.close()
+    history_path = str(tmp_path / "habits.history")
+    history = HistoryStore(history_path, today=TODAY)
+    history.ensure_rows(2)
+    history.mark(0, date(2024, 5, 1))
+    history.mark(0, MONDAY)
+    history.close()
+
+    db_path = str(tmp_path / "shared.db")
+    database = HabitDatabase(db_path)
+    reader = HabitJournal(journal.snapshot_path, journal.log_path)
+    assert migrate(reader, history_path, database, TODAY) == 2
+    rows = database.connection.execute(
+        "SELECT habit_id, day FROM completions ORDER BY habit_id, day"
+    ).fetchall()
+    assert rows == [
+        (1, "2024-05-01"),
+        (1, "2024-05-13"),
+        (2, date_for_day("Friday", TODAY).isoformat()),
+    ]
+    assert database.below_goal(MONDAY) == [("Read", 3, 1), ("Run", 2, 1)]
+    database.close()
+
+    copied = HistoryStore(history_file_for(db_path))
+    assert copied.path.endswith("shared.history")
+    assert copied.rows == 2 and copied.longest_streak(0) == 1
+    copied.close()
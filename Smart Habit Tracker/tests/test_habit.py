@@ -0,0 +1,53 @@
+from datetime import date
+
+from main import DAYS, Habit, apply_loaded, date_for_day
+
+
+def test_days_are_bits_and_marking_twice_counts_once():
+    habit = Habit("Read", 3)
+    habit.mark_complete("Friday")
+    habit.mark_complete("Monday")
+    habit.mark_complete("Friday")
+    assert habit.mask == 0b10001
+    assert habit.completed_count() == 2
+    assert habit.completions == ["Monday", "Friday"]
+    assert habit.is_complete("Monday") and not habit.is_complete("Sunday")
+    assert habit.progress_text() == "2/3 (67%)"
+    habit.reset()
+    assert habit.mask == 0 and habit.completions == []
+
+
+def test_saved_dicts_round_trip_and_old_day_lists_load():
+    habit = Habit("Run", 5)
+    for day in DAYS:
+        habit.mark_complete(day)
+    assert Habit.from_dict(habit.to_dict()).mask == 0x7F
+
+    old = Habit.from_dict(
+        {"name": "Walk", "weekly_goal": "4", "completions": ["Sunday", "Tuesday"]}
+    )
+    assert (old.weekly_goal, old.completions) == (4, ["Tuesday", "Sunday"])
+    # Bits above Sunday are ignored.
+    assert Habit.from_dict({"name": "X", "weekly_goal": 1, "mask": 0xFF}).mask == 0x7F
+
+
+def test_date_for_day_stays_in_the_current_week():
+    wednesday = date(2024, 5, 15)
+    assert date_for_day("Monday", wednesday) == date(2024, 5, 13)
+    assert date_for_day("Sunday", wednesday) == date(2024, 5, 19)
+    assert date_for_day("Wednesday", wednesday) == wednesday
+
+
+def test_logged_changes_replay_through_the_name_index():
+    habits = [Habit("Read", 3)]
+    index = {"read": 0}
+    events = [
+        {"op": "complete", "name": "READ", "day": "Monday"},
+        {"op": "add", "name": "Run", "goal": "2"},
+        {"op": "complete", "name": "run", "day": "Sunday"},
+    ]
+    apply_loaded(habits, index, [0b100], events)
+    assert [(habit.name, habit.mask) for habit in habits] == [("Read", 0b101), ("Run", 0x40)]
+    assert index == {"read": 0, "run": 1}
+    apply_loaded(habits, index, [], [{"op": "reset"}])
+    assert [habit.mask for habit in habits] == [0, 0]
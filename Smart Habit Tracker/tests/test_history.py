@@ -0,0 +1,77 @@
+from datetime import date, timedelta
+
+from history import (
+    HEADER,
+    HISTORY_START,
+    MAGIC,
+    OLD_MAGIC,
+    HistoryStore,
+    day_index,
+    longest_run,
+)
+
+TODAY = date(2024, 5, 15)
+
+
+def test_marking_joins_runs_and_the_longest_streak_is_kept_in_the_file(tmp_path):
+    path = str(tmp_path / "habits.history")
+    store = HistoryStore(path, today=TODAY)
+    store.ensure_rows(2)
+    for offset in (0, 1, 2, 4, 5):
+        assert store.mark(0, TODAY - timedelta(days=offset))
+    assert not store.mark(0, TODAY)
+    assert store.longest_streak(0) == 3
+    assert store.current_streak(0, TODAY) == 3
+    # Filling the gap joins the two runs into one.
+    store.mark(0, TODAY - timedelta(days=3))
+    assert store.longest_streak(0) == 6
+    assert store.longest_streak(1) == 0
+    store.close()
+
+    reopened = HistoryStore(path, today=TODAY)
+    assert reopened.longest_streak(0) == 6
+    assert list(reopened.completed_days(0))[0] == TODAY - timedelta(days=5)
+    reopened.close()
+
+
+def test_rates_start_at_each_habits_first_week(tmp_path):
+    store = HistoryStore(str(tmp_path / "habits.history"), today=TODAY - timedelta(weeks=3))
+    store.ensure_rows(1)
+    store.today = TODAY
+    store.ensure_rows(2)
+    monday = TODAY - timedelta(days=TODAY.weekday())
+    for row in range(2):
+        for day in range(3):
+            store.mark(row, monday + timedelta(days=day))
+    # The new habit is done every day since it was added this week.
+    assert store.rolling_rate(1, TODAY) == 1.0
+    assert store.rolling_rate(0, TODAY) == 3 / 24
+
+    rates = store.weekly_rates(TODAY, 4)
+    assert [rate for _, rate in rates] == [0.0, 0.0, 0.0, 1.0]
+    # Marking an earlier day moves the habit's first week back.
+    store.mark(1, monday - timedelta(days=7))
+    assert store.first_week(1) == day_index(monday) // 7 - 1
+    assert store.weekly_rates(TODAY, 2)[0][1] == 1 / 14
+    (month, rate), = store.monthly_rates(TODAY, 1)
+    assert month == "2024-05" and 0 < rate < 1
+    store.close()
+
+
+def test_old_files_are_converted_when_opened(tmp_path):
+    path = tmp_path / "habits.history"
+    weeks = 600
+    done = day_index(TODAY) // 7 - 10
+    rows = [bytearray(weeks), bytearray(weeks)]
+    rows[0][done] = 0b1111110
+    rows[0][done + 1] = 0b0000011
+    path.write_bytes(HEADER.pack(OLD_MAGIC, weeks, 2) + b"".join(rows))
+
+    store = HistoryStore(str(path), weeks, today=TODAY)
+    assert HEADER.unpack_from(path.read_bytes())[0] == MAGIC
+    assert store.longest_streak(0) == longest_run(bytes(rows[0])) == 8
+    assert store.first_week(0) == done
+    # A habit with no completions starts in the week it was converted.
+    assert store.first_week(1) == day_index(TODAY) // 7
+    assert list(store.completed_days(0))[0] == HISTORY_START + timedelta(weeks=done, days=1)
+    store.close()
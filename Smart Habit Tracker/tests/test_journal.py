@@ -0,0 +1,104 @@
+import json
+
+from journal import HabitJournal, _read_columns, write_atomic
+from main import Habit, apply_loaded
+
+
+def _journal(tmp_path) -> HabitJournal:
+    return HabitJournal(str(tmp_path / "habits.json"), str(tmp_path / "habits.log"))
+
+
+def test_replay_skips_events_already_in_the_snapshot(tmp_path):
+    journal = _journal(tmp_path)
+    assert journal.load_index() == ([], [])
+    assert journal.load_rest() == ([], [])
+    journal.append({"op": "add", "name": "Read", "goal": 3})
+    journal.append({"op": "complete", "name": "Read", "day": "Monday", "date": "2024-05-13"})
+    journal.write_snapshot(journal.snapshot(["Read"], [3], [1]))
+    # A crash before the log is truncated leaves both events in it.
+    journal.append({"op": "complete", "name": "Read", "day": "Tuesday", "date": "2024-05-14"})
+    journal.close()
+
+    reopened = _journal(tmp_path)
+    assert reopened.load_index() == (["Read"], [3])
+    saved, events = reopened.load_rest()
+    assert saved == [1]
+    assert [event["seq"] for event in events] == [3]
+    assert events[0]["day"] == "Tuesday"
+    assert (reopened.snapshot_seq, reopened.seq) == (2, 3)
+    # Replaying the same events the app wrote marks Tuesday only once more.
+    habits = [Habit("Read", 3)]
+    apply_loaded(habits, {"read": 0}, saved, events)
+    assert habits[0].completions == ["Monday", "Tuesday"]
+
+
+def test_index_comes_first_and_the_rest_adds_completions_and_the_log_tail(tmp_path):
+    journal = _journal(tmp_path)
+    journal.append({"op": "add", "name": "Read", "goal": 3})
+    journal.append({"op": "add", "name": "Run", "goal": 2})
+    journal.write_snapshot(journal.snapshot(["Read", "Run"], [3, 2], [0b1, 0b100]))
+    journal.truncate_log()
+    # Written after the snapshot, so only the log has them.
+    journal.append({"op": "complete", "name": "Run", "day": "Monday", "date": "2024-05-13"})
+    journal.append({"op": "add", "name": "Walk", "goal": 4})
+    journal.close()
+
+    reopened = _journal(tmp_path)
+    names, goals = reopened.load_index()
+    assert (names, goals) == (["Read", "Run"], [3, 2])
+    # The window lists the habits before any completion is read.
+    habits = [Habit(name, goal) for name, goal in zip(names, goals)]
+    assert [habit.mask for habit in habits] == [0, 0]
+
+    saved, events = reopened.load_rest()
+    assert saved == [0b1, 0b100]
+    assert [event["op"] for event in events] == ["complete", "add"]
+    index = {name.lower(): position for position, name in enumerate(names)}
+    apply_loaded(habits, index, saved, events)
+    assert [(habit.name, habit.mask) for habit in habits] == [
+        ("Read", 0b1),
+        ("Run", 0b101),
+        ("Walk", 0),
+    ]
+
+
+def test_a_half_written_last_line_is_dropped_from_the_log(tmp_path):
+    journal = _journal(tmp_path)
+    journal.append({"op": "add", "name": "Run", "goal": 5})
+    journal.close()
+    log = tmp_path / "habits.log"
+    with open(log, "a", encoding="utf-8") as handle:
+        handle.write('{"seq": 2, "op": "compl')
+
+    reopened = _journal(tmp_path)
+    reopened.load_index()
+    _, events = reopened.load_rest()
+    assert [event["seq"] for event in events] == [1]
+    assert log.read_text(encoding="utf-8").endswith("}\n")
+    # New appends continue the sequence on a clean line.
+    reopened.append({"op": "reset"})
+    reopened.close()
+    lines = log.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["seq"] for line in lines] == [1, 2]
+
+
+def test_older_snapshot_layouts_still_load(tmp_path):
+    habits = [{"name": "Walk", "weekly_goal": 4, "mask": 3}]
+    write_atomic(str(tmp_path / "habits.json"), habits)
+    journal = _journal(tmp_path)
+    assert journal.load_index() == (["Walk"], [4])
+    assert journal.load_rest() == (habits, [])
+
+    write_atomic(str(tmp_path / "habits.json"), {"seq": 7, "habits": habits})
+    journal = _journal(tmp_path)
+    assert journal.load_index() == (["Walk"], [4])
+    assert journal.load_rest() == (habits, [])
+    assert journal.seq == 7
+
+
+def test_columns_are_read_up_to_the_stop_key():
+    text = ' { "seq" : 4, "names": ["A", "B"], "masks": [1, 2] }'
+    values, masks_at = _read_columns(text, stop_at="masks")
+    assert values == {"seq": 4, "names": ["A", "B"]}
+    assert json.JSONDecoder().raw_decode(text, masks_at)[0] == [1, 2]
+    assert _read_columns('{"seq": 1}', stop_at="masks") == ({"seq": 1}, -1)
@@ -0,0 +1,322 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+import tkinter as tk
+from statistics import mean
+
+from gradebook import Gradebook
+from csv_io import write_rows
+from main import Roster, Student, StudentManagerApp, import_grades
+from models import student_label, summary_block
+from ranking import RankIndex
+from reports import write_reports
+from storage import GradeStore
+
+
+def _timed(action) -> float:
+    # Run an action and return how long it took in milliseconds.
+    start = time.perf_counter()
+    action()
+    return (time.perf_counter() - start) * 1000
+
+
+def legacy_refresh(app: StudentManagerApp, text: tk.Text) -> None:
+    # The refresh the app used before incremental updates: repopulate the
+    # whole listbox and rewrite every summary line into one Text widget.
+    app.student_listbox.delete(0, tk.END)
+    for student in app.students:
+        app.student_listbox.insert(tk.END, student_label(student))
+    text.configure(state="normal")
+    text.delete("1.0", tk.END)
+    for student in app.students:
+        for line in summary_block(student).splitlines(keepends=True):
+            text.insert(tk.END, line)
+    text.configure(state="disabled")
+
+
+def bench_refresh(sizes: list[int], tasks_per_student: int) -> None:
+    # Compare the old full repopulation, today's full rebuild, and an
+    # incremental refresh after one new grade.
+    root = tk.Tk()
+    root.withdraw()
+    print(
+        f"{'students':>10} {'old full (ms)':>14} {'rebuild (ms)':>13}"
+        f" {'incremental (ms)':>18}"
+    )
+    for size in sizes:
+        app = StudentManagerApp(root)
+        legacy_text = tk.Text(root)
+        for number in range(size):
+            student = Student(f"Student {number}")
+            for task in range(tasks_per_student):
+                student.add_task(f"Task {task}", (number + task) % 101)
+            app.students.add(student)
+
+        def legacy() -> None:
+            legacy_refresh(app, legacy_text)
+            root.update_idletasks()
+
+        def rebuild() -> None:
+            app._rebuild_views()
+            root.update_idletasks()
+
+        def incremental() -> None:
+            app.students.add_task(size // 2, "Extra", 75.0)
+            app._refresh_views()
+            root.update_idletasks()
+
+        legacy_ms = _timed(legacy)
+        rebuild_ms = _timed(rebuild)
+        incremental_ms = _timed(incremental)
+        print(
+            f"{size:>10} {legacy_ms:>14.1f} {rebuild_ms:>13.1f}"
+            f" {incremental_ms:>18.2f}"
+        )
+        for child in root.winfo_children():
+            child.destroy()
+    root.destroy()
+
+
+def bench_aggregates(students: int, tasks_per_student: int, repeats: int) -> None:
+    # Compare statistics.mean over (task, grade) tuples with running aggregates.
+    rng = random.Random(1)
+    grades = [
+        [rng.uniform(0, 100) for _ in range(tasks_per_student)]
+        for _ in range(students)
+    ]
+    legacy = [[(f"Task {i}", g) for i, g in enumerate(row)] for row in grades]
+    current = []
+    for number, row in enumerate(grades):
+        student = Student(f"Student {number}")
+        for i, grade in enumerate(row):
+            student.add_task(f"Task {i}", grade)
+        current.append(student)
+
+    def old_way() -> None:
+        for _ in range(repeats):
+            for tasks in legacy:
+                mean(grade for _, grade in tasks)
+
+    def new_way() -> None:
+        for _ in range(repeats):
+            for student in current:
+                student.average()
+                student.std_dev()
+
+    old_ms = _timed(old_way)
+    new_ms = _timed(new_way)
+    calls = students * repeats
+    print(f"{calls} averages over {tasks_per_student} tasks each")
+    print(f"statistics.mean:    {old_ms:10.1f} ms")
+    print(f"running aggregates: {new_ms:10.1f} ms  ({old_ms / new_ms:.0f}x faster)")
+
+
+def bench_class_stats(rows: int, students: int) -> None:
+    # Time loading grade rows one by one and as columns, then every
+    # class-wide query.
+    rng = random.Random(2)
+    student_ids = [rng.randrange(students) for _ in range(rows)]
+    tasks = [f"Task {n % 50}" for n in range(rows)]
+    grades = [float(rng.randint(0, 100)) for _ in range(rows)]
+    by_row = Gradebook()
+    row_ms = _timed(lambda: list(map(by_row.add, student_ids, tasks, grades)))
+    gradebook = Gradebook()
+    column_ms = _timed(lambda: gradebook.extend(student_ids, tasks, grades))
+
+    def queries() -> None:
+        gradebook.class_average()
+        gradebook.percentiles([10, 50, 90])
+        gradebook.grade_distribution()
+        gradebook.student_letter_distribution()
+        gradebook.task_averages()
+
+    query_ms = _timed(queries)
+    print(f"{rows} grade rows for {students} students")
+    print(f"load by row:     {row_ms:10.1f} ms")
+    print(f"load by column:  {column_ms:10.1f} ms")
+    print(f"all queries:     {query_ms:10.1f} ms")
+
+
+def bench_search(students: int, prefixes: list[str]) -> None:
+    # Time bulk entry with duplicate checks and prefix searches on the roster.
+    rng = random.Random(3)
+    names = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(8))
+        for _ in range(students)
+    ]
+    roster = Roster()
+
+    def bulk_add() -> None:
+        for name in names:
+            if roster.find(name) is None:
+                roster.add(Student(name))
+
+    print(f"add {students} students: {_timed(bulk_add):10.1f} ms")
+    for prefix in prefixes:
+        matches: list[int] = []
+        ms = _timed(lambda: matches.extend(roster.search(prefix)))
+        print(f"search {prefix!r:>6}: {ms:8.2f} ms  ({len(matches)} matches)")
+
+
+def bench_storage(students: int, tasks_per_student: int) -> None:
+    # Time batched inserts into SQLite and reopening the saved roster.
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "bench.db")
+    store = GradeStore(path)
+    roster = Roster(store)
+
+    def insert_all() -> None:
+        for number in range(students):
+            index = roster.add(Student(f"Student {number}"))
+            for task in range(tasks_per_student):
+                roster.add_task(index, f"Task {task}", (number + task) % 101)
+        store.flush()
+
+    rows = students * tasks_per_student
+    insert_ms = _timed(insert_all)
+    store.close()
+    print(f"insert {rows} grades: {insert_ms:10.1f} ms ({rows / insert_ms * 1000:,.0f} rows/s)")
+
+    store = GradeStore(path)
+    reopened = Roster(store)
+    # Opening reads students and class totals, never the grade rows.
+    print(f"open roster:         {_timed(reopened.load):10.1f} ms ({len(reopened)} students)")
+    print(f"first task list:     {_timed(lambda: reopened[0].tasks):10.2f} ms")
+    # Files from before the saved class totals rebuild them once on open.
+    print(f"rebuild class totals:{_timed(store._build_grade_summary):10.1f} ms")
+    store.close()
+
+
+def bench_csv(rows: int, students: int) -> None:
+    # Time streaming a CSV of grades through validation into running totals.
+    rng = random.Random(4)
+    path = os.path.join(tempfile.mkdtemp(), "grades.csv")
+    chunk = [
+        (f"Student {rng.randrange(students)}", f"Task {n % 40}", rng.randint(0, 100))
+        for n in range(rows)
+    ]
+    write_rows(path, [chunk])
+    roster = Roster(track_grades=False)
+    result: list = []
+    ms = _timed(lambda: result.extend(import_grades(roster, path)))
+    print(f"import {result[0]} rows: {ms:10.1f} ms ({result[0] / ms * 1000:,.0f} rows/s)")
+
+
+def bench_reports(students: int, tasks_per_student: int, workers: list[int]) -> None:
+    # Time report generation with different numbers of worker processes.
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "bench.db")
+    store = GradeStore(path, batch_size=50_000)
+    roster = Roster(store, track_grades=False)
+    for number in range(students):
+        index = roster.add(Student(f"Student {number}"))
+        for task in range(tasks_per_student):
+            roster.add_task(index, f"Task {task}", (number * 7 + task) % 101)
+    store.close()
+
+    print(f"{students} students x {tasks_per_student} tasks (cpus: {os.cpu_count()})")
+    baseline = None
+    for count in workers:
+        out_dir = os.path.join(folder, f"reports_{count}")
+        ms = _timed(lambda: write_reports(path, out_dir, "txt", count))
+        baseline = baseline or ms
+        print(f"{count:>3} workers: {ms:10.1f} ms  ({baseline / ms:.1f}x)")
+
+
+def bench_ranking(students: int, updates: int) -> None:
+    # Compare rank-index queries after each grade with re-sorting everyone.
+    rng = random.Random(6)
+    averages = [rng.uniform(0, 100) for _ in range(students)]
+    index = RankIndex()
+    for student_id, avg in enumerate(averages):
+        index.update(student_id, avg)
+
+    def with_index() -> None:
+        for _ in range(updates):
+            student_id = rng.randrange(students)
+            averages[student_id] = rng.uniform(0, 100)
+            index.update(student_id, averages[student_id])
+            index.top(10)
+            index.rank_of(student_id)
+            index.percentile(90)
+
+    def with_sort() -> None:
+        for _ in range(updates):
+            student_id = rng.randrange(students)
+            averages[student_id] = rng.uniform(0, 100)
+            order = sorted(range(students), key=averages.__getitem__, reverse=True)
+            order[:10]
+            order.index(student_id)
+
+    print(f"{updates} grade updates over {students} students")
+    print(f"rank index: {_timed(with_index):10.1f} ms")
+    print(f"full sort:  {_timed(with_sort):10.1f} ms")
+
+
+def main() -> None:
+    # Pick a benchmark from the command line and run it.
+    parser = argparse.ArgumentParser(description="Grade manager benchmarks")
+    sub = parser.add_subparsers(dest="name", required=True)
+
+    refresh = sub.add_parser("refresh", help="old full refresh vs incremental refresh")
+    refresh.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    refresh.add_argument("--tasks", type=int, default=5)
+
+    aggregates = sub.add_parser("aggregates", help="Student.average() cost")
+    aggregates.add_argument("--students", type=int, default=1_000)
+    aggregates.add_argument("--tasks", type=int, default=20)
+    aggregates.add_argument("--repeats", type=int, default=10)
+
+    stats = sub.add_parser("stats", help="class statistics over many grades")
+    stats.add_argument("--rows", type=int, default=1_000_000)
+    stats.add_argument("--students", type=int, default=10_000)
+
+    search = sub.add_parser("search", help="name index and prefix search")
+    search.add_argument("--students", type=int, default=100_000)
+    search.add_argument("--prefixes", nargs="+", default=["a", "ab", "abc"])
+
+    storage = sub.add_parser("storage", help="SQLite insert and load speed")
+    storage.add_argument("--students", type=int, default=10_000)
+    storage.add_argument("--tasks", type=int, default=20)
+
+    csv_import = sub.add_parser("csv", help="streaming CSV import speed")
+    csv_import.add_argument("--rows", type=int, default=500_000)
+    csv_import.add_argument("--students", type=int, default=20_000)
+
+    reports = sub.add_parser("reports", help="report generation scaling")
+    reports.add_argument("--students", type=int, default=20_000)
+    reports.add_argument("--tasks", type=int, default=20)
+    reports.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1]
+    )
+
+    ranking = sub.add_parser("ranking", help="rank index vs sorting")
+    ranking.add_argument("--students", type=int, default=100_000)
+    ranking.add_argument("--updates", type=int, default=20)
+
+    args = parser.parse_args()
+    if args.name == "refresh":
+        bench_refresh(args.sizes, args.tasks)
+    elif args.name == "aggregates":
+        bench_aggregates(args.students, args.tasks, args.repeats)
+    elif args.name == "stats":
+        bench_class_stats(args.rows, args.students)
+    elif args.name == "search":
+        bench_search(args.students, args.prefixes)
+    elif args.name == "storage":
+        bench_storage(args.students, args.tasks)
+    elif args.name == "csv":
+        bench_csv(args.rows, args.students)
+    elif args.name == "reports":
+        bench_reports(args.students, args.tasks, args.workers)
+    elif args.name == "ranking":
+        bench_ranking(args.students, args.updates)
+
+
+if __name__ == "__main__":
+    # Run benchmarks only when executed directly.
+    main()
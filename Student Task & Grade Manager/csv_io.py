@@ -0,0 +1,25 @@
+import csv
+from collections.abc import Iterable, Iterator
+
+
+# Column names used for grade CSV files.
+HEADER = ["student", "task", "grade"]
+
+
+def read_rows(path: str) -> Iterator[tuple[int, list[str]]]:
+    # Yield (line number, fields) for each row, one at a time, skipping the header.
+    with open(path, newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle)
+        for row in reader:
+            if reader.line_num == 1 and [f.strip().lower() for f in row] == HEADER:
+                continue
+            yield reader.line_num, row
+
+
+def write_rows(path: str, rows: Iterable[Iterable[Iterable]]) -> None:
+    # Write the header and then each chunk of rows as it arrives.
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(HEADER)
+        for chunk in rows:
+            writer.writerows(chunk)
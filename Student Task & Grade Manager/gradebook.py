@@ -0,0 +1,231 @@
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from functools import partial
+from itertools import accumulate, compress
+from math import fsum
+from operator import truediv
+
+
+# Lowest average needed for each letter above "F", in ascending order.
+GRADE_CUTOFFS = (60.0, 70.0, 80.0, 90.0)
+GRADE_LETTERS = "FDCBA"
+
+# Histogram bins per grade point (0.1 resolution, matching the display).
+BINS_PER_POINT = 10
+HISTOGRAM_SIZE = 100 * BINS_PER_POINT + 1
+
+
+def grade_bin(grade: float) -> int:
+    # Histogram bin of a grade: rounded to 0.1 point, halves up. Storage
+    # runs the same arithmetic in SQL, so keep the two in step.
+    return int(grade * BINS_PER_POINT + 0.5)
+
+
+def grade_band(grade: float, cutoffs: tuple[float, ...] = GRADE_CUTOFFS) -> int:
+    # Position of a grade's letter in GRADE_LETTERS (0 = "F").
+    return bisect_right(cutoffs, grade)
+
+
+def letter_grade(
+    avg: float,
+    cutoffs: tuple[float, ...] = GRADE_CUTOFFS,
+    letters: str = GRADE_LETTERS,
+) -> str:
+    # Convert a numeric average to a letter grade.
+    return letters[grade_band(avg, cutoffs)]
+
+
+def letter_grades(
+    values,
+    cutoffs: tuple[float, ...] = GRADE_CUTOFFS,
+    letters: str = GRADE_LETTERS,
+) -> list[str]:
+    # Convert many averages at once; map/bisect run without a Python loop body.
+    positions = map(partial(bisect_right, cutoffs), values)
+    return list(map(letters.__getitem__, positions))
+
+
+# Column store of grades, one row per (student, task, grade), with running
+# totals for class statistics. Saved grades can be merged in as totals only
+# (add_totals), so the columns hold just the grades added since.
+class Gradebook:
+    def __init__(
+        self,
+        cutoffs: tuple[float, ...] = GRADE_CUTOFFS,
+        letters: str = GRADE_LETTERS,
+    ) -> None:
+        # Every grade counted in the statistics, in the columns or not.
+        self._count = 0
+        # Contiguous columns, all the same length.
+        self.student_ids = array("L")
+        self.task_ids = array("L")
+        self.grades = array("d")
+        # Task names are stored once and referred to by id.
+        self.task_names: list[str] = []
+        self._task_lookup: dict[str, int] = {}
+        # Running per-task and per-student totals, indexed by id.
+        self._task_totals = array("d")
+        self._task_counts = array("L")
+        self._student_totals = array("d")
+        self._student_counts = array("L")
+        # Count of grades in each 0.1-point bin, for medians and percentiles.
+        self._histogram = array("L", [0]) * HISTOGRAM_SIZE
+        # Count of grades per letter band, found exactly as letter_grade does
+        # (the 0.1-point bins would put 59.96 in the 60.0 bin, a D).
+        self.cutoffs = cutoffs
+        self.letters = letters
+        self._band_counts = array("L", [0]) * len(letters)
+        # Bumped on every change so views know when to recompute.
+        self.version = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def task_id(self, name: str) -> int:
+        # Return the id for a task name, creating one if needed.
+        task_id = self._task_lookup.get(name)
+        if task_id is None:
+            task_id = len(self.task_names)
+            self._task_lookup[name] = task_id
+            self.task_names.append(name)
+            self._task_totals.append(0.0)
+            self._task_counts.append(0)
+        return task_id
+
+    def add(self, student_id: int, task: str, grade: float) -> None:
+        # Append one grade row and update the running totals.
+        task_id = self.task_id(task)
+        self.student_ids.append(student_id)
+        self.task_ids.append(task_id)
+        self.grades.append(grade)
+
+        self._task_totals[task_id] += grade
+        self._task_counts[task_id] += 1
+        while len(self._student_totals) <= student_id:
+            self._student_totals.append(0.0)
+            self._student_counts.append(0)
+        self._student_totals[student_id] += grade
+        self._student_counts[student_id] += 1
+        self._histogram[grade_bin(grade)] += 1
+        self._band_counts[grade_band(grade, self.cutoffs)] += 1
+        self._count += 1
+        self.version += 1
+
+    def extend(self, student_ids, tasks, grades) -> None:
+        # Append whole columns at once. The arrays grow with one extend each
+        # and the counts come from C-level Counter passes; only the per-id
+        # totals need a loop over rows, with no method call per row.
+        student_ids = array("L", student_ids)
+        tasks = list(tasks)
+        grades = array("d", grades)
+        if not len(student_ids) == len(tasks) == len(grades):
+            raise ValueError("columns must all have the same length")
+        if not grades:
+            return
+        for name in dict.fromkeys(tasks):
+            self.task_id(name)
+        task_ids = array("L", map(self._task_lookup.__getitem__, tasks))
+        self.student_ids.extend(student_ids)
+        self.task_ids.extend(task_ids)
+        self.grades.extend(grades)
+
+        size = max(student_ids) + 1
+        if len(self._student_totals) < size:
+            missing = size - len(self._student_totals)
+            self._student_totals.extend(array("d", [0.0]) * missing)
+            self._student_counts.extend(array("L", [0]) * missing)
+        for task_id, count in Counter(task_ids).items():
+            self._task_counts[task_id] += count
+        for student_id, count in Counter(student_ids).items():
+            self._student_counts[student_id] += count
+        # Lists take item updates about twice as fast as arrays.
+        task_totals = self._task_totals.tolist()
+        student_totals = self._student_totals.tolist()
+        for student_id, task_id, grade in zip(student_ids, task_ids, grades):
+            task_totals[task_id] += grade
+            student_totals[student_id] += grade
+        self._task_totals = array("d", task_totals)
+        self._student_totals = array("d", student_totals)
+
+        # Grades repeat a lot, so bin each distinct value once.
+        for grade, count in Counter(grades).items():
+            self._histogram[grade_bin(grade)] += count
+            self._band_counts[grade_band(grade, self.cutoffs)] += count
+        self._count += len(grades)
+        self.version += 1
+
+    def add_totals(self, tasks, counts, students) -> None:
+        # Merge saved totals without their grade rows: tasks as (name, count,
+        # total), counts as (bin, band, count) and students as (id, count,
+        # total). Bands must have been found with this gradebook's cutoffs.
+        for name, count, total in tasks:
+            task_id = self.task_id(name)
+            self._task_counts[task_id] += count
+            self._task_totals[task_id] += total
+        for position, band, count in counts:
+            self._histogram[position] += count
+            self._band_counts[band] += count
+            self._count += count
+        for student_id, count, total in students:
+            while len(self._student_totals) <= student_id:
+                self._student_totals.append(0.0)
+                self._student_counts.append(0)
+            self._student_counts[student_id] += count
+            self._student_totals[student_id] += total
+        self.version += 1
+
+    def class_average(self) -> float | None:
+        # Mean of every grade in the class.
+        if not self._count:
+            return None
+        return fsum(self._task_totals) / self._count
+
+    def percentiles(self, points: list[float]) -> list[float | None]:
+        # Return grades at the given percentiles (0-100) from the histogram.
+        count = self._count
+        if not count:
+            return [None] * len(points)
+        cumulative = list(accumulate(self._histogram))
+        results = []
+        for point in points:
+            # Nearest-rank position of the percentile among sorted grades.
+            rank = round(point / 100 * (count - 1))
+            results.append(bisect_right(cumulative, rank) / BINS_PER_POINT)
+        return results
+
+    def median(self) -> float | None:
+        return self.percentiles([50])[0]
+
+    def grade_distribution(self) -> dict[str, int]:
+        # Count individual grades per letter band.
+        return dict(zip(self.letters, self._band_counts))
+
+    def student_averages(self) -> list[float]:
+        # Averages of every student with at least one grade, in id order.
+        graded = compress(self._student_totals, self._student_counts)
+        counts = filter(None, self._student_counts)
+        return list(map(truediv, graded, counts))
+
+    def student_letter_distribution(
+        self,
+        cutoffs: tuple[float, ...] | None = None,
+        letters: str | None = None,
+    ) -> dict[str, int]:
+        # Count students per letter grade of their average, with this
+        # gradebook's bands unless others are given.
+        cutoffs = self.cutoffs if cutoffs is None else cutoffs
+        letters = self.letters if letters is None else letters
+        counts = dict.fromkeys(letters, 0)
+        counts.update(Counter(letter_grades(self.student_averages(), cutoffs, letters)))
+        return counts
+
+    def task_averages(self) -> dict[str, float]:
+        # Average grade for each task across all students.
+        return {
+            name: total / count
+            for name, total, count in zip(
+                self.task_names, self._task_totals, self._task_counts
+            )
+            if count
+        }
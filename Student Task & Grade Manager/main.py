@@ -1,50 +1,223 @@
+import argparse
+import csv
+import sqlite3
+import sys
 import tkinter as tk
+from bisect import bisect_left, insort
+from functools import partial
 from tkinter import messagebox, ttk
-from statistics import mean
 
+from csv_io import read_rows, write_rows
+from gradebook import GRADE_CUTOFFS, GRADE_LETTERS, Gradebook, letter_grade
+from models import Student, Task, student_label, summary_block
+from ranking import RankIndex
+from reports import write_reports
+from storage import GradeStore
+from virtual_text import VirtualTextView
+
+
+# SQLite file used to keep students and grades between runs.
+DB_FILE = "grades.db"
+# Wait this long after the last edit before writing queued rows to disk.
+FLUSH_DELAY_MS = 1000
+
+
+# Collection of students that remembers which ones changed since the last refresh.
+class Roster:
+    def __init__(
+        self,
+        store: GradeStore | None = None,
+        track_grades: bool = True,
+        letters: str = GRADE_LETTERS,
+    ) -> None:
+        # Optional storage that receives every new student and grade.
+        self.store = store
+        # When False, keep only running totals (no task lists or gradebook),
+        # so streaming imports use memory per student rather than per grade.
+        self.track_grades = track_grades
+        # Keep students in display order plus the indexes that need redrawing.
+        self.students: list[Student] = []
+        self.dirty: set[int] = set()
+        # Column copy of every grade for class-wide statistics.
+        # Its cutoffs match the store's, since saved band counts are merged in;
+        # `letters` names the bands and needs one letter more than the cutoffs.
+        self.gradebook = None
+        if track_grades:
+            cutoffs = store.cutoffs if store else GRADE_CUTOFFS
+            self.gradebook = Gradebook(cutoffs, letters)
+        # Students ordered by average for rank and top-N queries.
+        self.ranking = RankIndex()
+        # Case-folded name -> index, plus (name, index) pairs kept sorted
+        # so duplicate checks are O(1) and prefix searches are a bisect.
+        self._by_name: dict[str, int] = {}
+        self._sorted_names: list[tuple[str, int]] = []
+        # Storage id of the student at each position. Ids come from SQLite
+        # and can have gaps, so positions are never written as ids.
+        self._ids: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.students)
+
+    def __iter__(self):
+        return iter(self.students)
+
+    def __getitem__(self, index: int) -> Student:
+        return self.students[index]
+
+    def add(self, student: Student) -> int:
+        # Append a student, index its name, and flag its new row as changed.
+        key = student.name.casefold()
+        if key in self._by_name:
+            raise ValueError(f"Duplicate student: {student.name}")
+        if self.store is not None:
+            # Saved first, so a student the store rejects is not shown.
+            student_id = self.store.add_student(student.name)
+            self._ids.append(student_id)
+            index = self._append(student)
+            if student.count == 0:
+                # Storage keeps the task rows; load them back only if asked.
+                student.detach_tasks(partial(self._load_tasks, student_id))
+            return index
+        index = self._append(student)
+        if not self.track_grades:
+            student.detach_tasks()
+        return index
+
+    def _append(self, student: Student) -> int:
+        # Add a student to the list and name indexes.
+        self.students.append(student)
+        index = len(self.students) - 1
+        key = student.name.casefold()
+        self._by_name[key] = index
+        insort(self._sorted_names, (key, index))
+        self.ranking.update(index, student.average())
+        self.dirty.add(index)
+        return index
+
+    def load(self) -> None:
+        # Read saved students (not their tasks) and the saved class totals;
+        # no grade rows are read.
+        if self.store is None:
+            return
+        for student_id, name, aggregates in self.store.load_students():
+            loader = partial(self._load_tasks, student_id)
+            self._ids.append(student_id)
+            self._append(Student.from_saved(name, aggregates, loader))
+        if self.gradebook is not None:
+            tasks, counts = self.store.load_grade_summary()
+            students = (
+                (index, student.count, student.total)
+                for index, student in enumerate(self.students)
+            )
+            self.gradebook.add_totals(tasks, counts, students)
 
-# Data model for a student and their work.
-class Student:
-    def __init__(self, name: str) -> None:
-        # Store the student's name and task list.
-        self.name = name
-        self.tasks: list[tuple[str, float]] = []
-
-    def add_task(self, task: str, grade: float) -> None:
-        # Add a (task, grade) pair to the student record.
-        self.tasks.append((task, grade))
+    def _load_tasks(self, student_id: int) -> list[Task]:
+        return [Task(name, grade) for name, grade in self.store.load_tasks(student_id)]
 
-    def average(self) -> float | None:
-        # Return the average grade or None if no tasks exist.
-        if not self.tasks:
-            return None
-        return mean(grade for _, grade in self.tasks)
+    def find(self, name: str) -> int | None:
+        # Return the index of a student by name, ignoring case.
+        return self._by_name.get(name.casefold())
 
+    def search(self, prefix: str) -> list[int]:
+        # Return indexes of students whose name starts with prefix, by name.
+        key = prefix.casefold()
+        start = bisect_left(self._sorted_names, (key,))
+        end = bisect_left(self._sorted_names, (key + "\U0010ffff",), start)
+        return [index for _, index in self._sorted_names[start:end]]
 
-def letter_grade(avg: float) -> str:
-    # Convert a numeric average to a letter grade.
-    if avg >= 90:
-        return "A"
-    if avg >= 80:
-        return "B"
-    if avg >= 70:
-        return "C"
-    if avg >= 60:
-        return "D"
-    return "F"
+    def add_task(self, index: int, task: str, grade: float) -> None:
+        # Record a grade for one student and flag only that student.
+        student = self.students[index]
+        student.add_task(task, grade)
+        if self.gradebook is not None:
+            self.gradebook.add(index, task, grade)
+        if self.store is not None:
+            self.store.add_task(self._ids[index], task, grade, student.aggregates())
+        self.ranking.update(index, student.average())
+        self.dirty.add(index)
+
+    def mark_all_dirty(self) -> None:
+        # Flag every student, e.g. before a full redraw.
+        self.dirty.update(range(len(self.students)))
+
+    def take_dirty(self) -> list[int]:
+        # Return changed indexes in display order and reset the set.
+        changed = sorted(self.dirty)
+        self.dirty.clear()
+        return changed
+
+
+def validate_task(task: str, grade_text: str) -> tuple[str, float]:
+    # Check a task name and grade; raise ValueError(title, message) if invalid.
+    task = task.strip()
+    if not task:
+        raise ValueError("Invalid Task", "Please enter a task name.")
+    try:
+        grade = float(grade_text.strip())
+    except ValueError:
+        raise ValueError("Invalid Grade", "Grade must be a number.") from None
+    if not 0 <= grade <= 100:
+        raise ValueError("Invalid Grade", "Grade must be between 0 and 100.")
+    return task, grade
+
+
+def import_grades(roster: Roster, path: str) -> tuple[int, list[tuple[int, str]]]:
+    # Stream student,task,grade rows from a CSV file into the roster.
+    # Bad rows are skipped and returned as (line number, message).
+    imported = 0
+    errors: list[tuple[int, str]] = []
+    # Exact-name cache so repeated students skip the case-folded lookup.
+    seen: dict[str, int] = {}
+    for line, row in read_rows(path):
+        if len(row) != 3:
+            errors.append((line, "Expected student, task, grade."))
+            continue
+        name = row[0].strip()
+        if not name:
+            errors.append((line, "Please enter a student name."))
+            continue
+        try:
+            task, grade = validate_task(row[1], row[2])
+        except ValueError as error:
+            errors.append((line, error.args[-1]))
+            continue
+
+        index = seen.get(name)
+        if index is None:
+            index = roster.find(name)
+            if index is None:
+                index = roster.add(Student(name))
+            seen[name] = index
+        roster.add_task(index, task, grade)
+        imported += 1
+    return imported, errors
 
 
 # Main GUI application for managing students and grades.
 class StudentManagerApp:
-    def __init__(self, root: tk.Tk) -> None:
+    def __init__(self, root: tk.Tk, store: GradeStore | None = None) -> None:
         # Store root window and initialize state.
         self.root = root
         self.root.title("Student Task & Grade Manager")
-        self.students: list[Student] = []
+        self.students = Roster(store)
+        self.students.load()
+        # Pending timer that writes queued rows to storage.
+        self._flush_job: str | None = None
+        # Roster indexes shown in the listbox while a search is active.
+        self._visible: list[int] | None = None
+        self._row_of: dict[int, int] = {}
+        self._filter_key = ""
+        # Rankings window (if open): sort column, direction, and rows shown.
+        self._ranking_window: tk.Toplevel | None = None
+        self._rank_sort = "rank"
+        self._rank_descending = False
+        # Gradebook version shown in the stats panel, and any pending redraw.
+        self._stats_version = -1
+        self._stats_job: str | None = None
 
         # Build UI and show initial summary.
         self._build_ui()
-        self._refresh_views()
+        self._rebuild_views()
 
     def _build_ui(self) -> None:
         # Build the full GUI layout.
@@ -90,12 +263,19 @@ class StudentManagerApp:
         # Students list
         list_frame = ttk.LabelFrame(main, text="Students", padding=10)
         list_frame.grid(row=2, column=0, sticky="nsew", padx=4, pady=4)
-        list_frame.columnconfigure(0, weight=1)
-        list_frame.rowconfigure(0, weight=1)
+        list_frame.columnconfigure(1, weight=1)
+        list_frame.rowconfigure(1, weight=1)
+
+        ttk.Label(list_frame, text="Search:").grid(row=0, column=0, sticky="w")
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *_: self._apply_filter())
+        ttk.Entry(list_frame, textvariable=self.search_var).grid(
+            row=0, column=1, sticky="ew", padx=6, pady=(0, 6)
+        )
 
         self.student_listbox = tk.Listbox(list_frame, height=6)
-        self.student_listbox.grid(row=0, column=0, sticky="nsew")
-        self.student_listbox.bind("<<ListboxSelect>>", self._refresh_views)
+        self.student_listbox.grid(row=1, column=0, columnspan=2, sticky="nsew")
+        self.student_listbox.bind("<<ListboxSelect>>", self._on_select)
 
         # Summary display
         summary_frame = ttk.LabelFrame(main, text="Summary", padding=10)
@@ -103,20 +283,196 @@ class StudentManagerApp:
         summary_frame.columnconfigure(0, weight=1)
         summary_frame.rowconfigure(0, weight=1)
 
-        self.summary_text = tk.Text(summary_frame, height=12, wrap="word")
-        self.summary_text.grid(row=0, column=0, sticky="nsew")
-        self.summary_text.configure(state="disabled")
+        # Only the students near the visible area are drawn.
+        self.summary_view = VirtualTextView(
+            summary_frame,
+            count=lambda: len(self.students),
+            render=lambda index: summary_block(self.students[index]),
+            empty_text="No students yet. Add a student to get started.",
+        )
+        self.summary_view.grid(row=0, column=0, sticky="nsew")
+
+        # Class statistics
+        stats_frame = ttk.LabelFrame(main, text="Class Statistics", padding=10)
+        stats_frame.grid(row=4, column=0, sticky="nsew", padx=4, pady=4)
+        stats_frame.columnconfigure(0, weight=1)
+
+        self.stats_label = ttk.Label(stats_frame, justify="left")
+        self.stats_label.grid(row=0, column=0, sticky="w")
+        self.task_avg_listbox = tk.Listbox(stats_frame, height=4)
+        self.task_avg_listbox.grid(row=1, column=0, sticky="ew", pady=(6, 0))
 
         # Bottom buttons
         button_frame = ttk.Frame(main)
-        button_frame.grid(row=4, column=0, sticky="ew", pady=6)
+        button_frame.grid(row=5, column=0, sticky="ew", pady=6)
         button_frame.columnconfigure(0, weight=1)
-        ttk.Button(button_frame, text="Refresh Summary", command=self._refresh_views).grid(
+        ttk.Button(button_frame, text="Refresh Summary", command=self._rebuild_views).grid(
             row=0, column=0, sticky="w"
         )
+        ttk.Button(button_frame, text="Rankings", command=self._open_rankings).grid(
+            row=0, column=1, sticky="e", padx=6
+        )
         ttk.Button(button_frame, text="Clear Inputs", command=self._clear_inputs).grid(
-            row=0, column=1, sticky="e"
+            row=0, column=2, sticky="e"
+        )
+
+    def _open_rankings(self) -> None:
+        # Show (or focus) a window listing students by average.
+        if self._ranking_window is not None:
+            self._ranking_window.lift()
+            return
+
+        window = tk.Toplevel(self.root)
+        window.title("Rankings")
+        window.columnconfigure(0, weight=1)
+        window.rowconfigure(1, weight=1)
+        window.protocol("WM_DELETE_WINDOW", self._close_rankings)
+        self._ranking_window = window
+
+        controls = ttk.Frame(window, padding=8)
+        controls.grid(row=0, column=0, sticky="ew")
+        ttk.Label(controls, text="Show top:").grid(row=0, column=0, sticky="w")
+        self.top_n_var = tk.IntVar(value=50)
+        ttk.Spinbox(
+            controls,
+            from_=10,
+            to=1000,
+            increment=10,
+            width=6,
+            textvariable=self.top_n_var,
+            command=self._refresh_rankings,
+        ).grid(row=0, column=1, sticky="w", padx=6)
+        self.selected_rank_label = ttk.Label(controls)
+        self.selected_rank_label.grid(row=0, column=2, sticky="w", padx=12)
+
+        columns = ("rank", "name", "average", "letter")
+        self.ranking_tree = ttk.Treeview(
+            window, columns=columns, show="headings", height=15
         )
+        for column in columns:
+            self.ranking_tree.heading(
+                column,
+                text=column.title(),
+                command=lambda c=column: self._sort_rankings(c),
+            )
+            self.ranking_tree.column(column, width=80 if column != "name" else 200)
+        self.ranking_tree.grid(row=1, column=0, sticky="nsew", padx=8)
+
+        self.percentile_label = ttk.Label(window, padding=8)
+        self.percentile_label.grid(row=2, column=0, sticky="w")
+        self._refresh_rankings()
+
+    def _close_rankings(self) -> None:
+        self._ranking_window.destroy()
+        self._ranking_window = None
+
+    def _sort_rankings(self, column: str) -> None:
+        # Clicking a heading sorts by it; clicking again reverses the order.
+        if column == "letter":
+            column = "average"
+        if column == self._rank_sort:
+            self._rank_descending = not self._rank_descending
+        else:
+            self._rank_sort = column
+            # Averages read naturally from highest to lowest.
+            self._rank_descending = column == "average"
+        self._refresh_rankings()
+
+    def _refresh_rankings(self) -> None:
+        # Fill the rankings window from the rank index.
+        if self._ranking_window is None:
+            return
+        ranking = self.students.ranking
+        try:
+            count = max(1, int(self.top_n_var.get()))
+        except (tk.TclError, ValueError):
+            count = 50
+
+        # Rank ascending and average descending both mean "best first".
+        if self._rank_sort == "rank":
+            best_first = not self._rank_descending
+        elif self._rank_sort == "average":
+            best_first = self._rank_descending
+        else:
+            best_first = True
+        ids = ranking.top(count, best_first=best_first)
+        if self._rank_sort == "name":
+            ids.sort(
+                key=lambda i: self.students[i].name.casefold(),
+                reverse=self._rank_descending,
+            )
+
+        self.ranking_tree.delete(*self.ranking_tree.get_children())
+        for student_id in ids:
+            student = self.students[student_id]
+            avg = student.average()
+            self.ranking_tree.insert(
+                "",
+                tk.END,
+                values=(
+                    ranking.rank_of(student_id),
+                    student.name,
+                    f"{avg:.1f}",
+                    letter_grade(avg),
+                ),
+            )
+
+        points = (25, 50, 75, 90)
+        thresholds = [ranking.percentile(p) for p in points]
+        if thresholds[0] is None:
+            self.percentile_label.config(text="No graded students yet.")
+        else:
+            self.percentile_label.config(
+                text="Percentiles:  "
+                + "   ".join(f"P{p}: {t:.1f}" for p, t in zip(points, thresholds))
+            )
+        self._update_selected_rank()
+
+    def _update_selected_rank(self) -> None:
+        # Show the selected student's rank in the rankings window.
+        if self._ranking_window is None:
+            return
+        index = self._get_selected_index()
+        rank = None if index is None else self.students.ranking.rank_of(index)
+        if rank is None:
+            self.selected_rank_label.config(text="")
+        else:
+            total = len(self.students.ranking)
+            self.selected_rank_label.config(
+                text=f"{self.students[index].name}: rank {rank} of {total}"
+            )
+
+    def _on_select(self, _event: object | None = None) -> None:
+        self._refresh_views()
+        self._update_selected_rank()
+
+    def _schedule_flush(self) -> None:
+        # Write queued rows shortly after the last edit.
+        if self.students.store is None:
+            return
+        if self._flush_job is not None:
+            self.root.after_cancel(self._flush_job)
+        self._flush_job = self.root.after(FLUSH_DELAY_MS, self._flush_store)
+
+    def _flush_store(self) -> None:
+        self._flush_job = None
+        try:
+            self.students.store.flush()
+        except sqlite3.Error as error:
+            messagebox.showerror(
+                "Save Failed", f"Could not save the latest changes: {error}"
+            )
+
+    def close(self) -> None:
+        # Save pending grades and close the window.
+        if self.students.store is not None:
+            try:
+                self.students.store.close()
+            except sqlite3.Error as error:
+                messagebox.showerror(
+                    "Save Failed", f"Could not save the latest changes: {error}"
+                )
+        self.root.destroy()
 
     def _clear_inputs(self) -> None:
         # Clear all input fields.
@@ -131,92 +487,259 @@ class StudentManagerApp:
             messagebox.showerror("Invalid Name", "Please enter a student name.")
             return
 
-        if any(s.name.lower() == name.lower() for s in self.students):
+        if self.students.find(name) is not None:
             messagebox.showerror("Duplicate Student", "That student already exists.")
             return
 
-        self.students.append(Student(name))
+        index = self.students.add(Student(name))
+        if self._visible is not None and name.casefold().startswith(self._filter_key):
+            # Show the new student under the current search too.
+            self._row_of[index] = len(self._visible)
+            self._visible.append(index)
         self.student_name_entry.delete(0, tk.END)
+        self._schedule_flush()
         self._refresh_views()
 
-    def _get_selected_student(self) -> Student | None:
-        # Return the selected student, if any.
+    def _get_selected_index(self) -> int | None:
+        # Return the roster index of the selected student, if any.
         selection = self.student_listbox.curselection()
         if not selection:
             return None
-        return self.students[selection[0]]
+        if self._visible is None:
+            return selection[0]
+        return self._visible[selection[0]]
+
+    def _row_for(self, index: int) -> int | None:
+        # Return the listbox row showing a roster index, if it is visible.
+        if self._visible is None:
+            return index
+        return self._row_of.get(index)
+
+    def _apply_filter(self) -> None:
+        # Narrow the listbox to students whose name starts with the search text.
+        selected = self._get_selected_index()
+        self._filter_key = self.search_var.get().strip().casefold()
+        if self._filter_key:
+            self._visible = self.students.search(self._filter_key)
+            self._row_of = {index: row for row, index in enumerate(self._visible)}
+        else:
+            self._visible = None
+            self._row_of = {}
+        self._fill_listbox(selected)
+
+    def _fill_listbox(self, selected: int | None) -> None:
+        # Redraw every listbox row and reselect a student if still shown.
+        self.student_listbox.delete(0, tk.END)
+        if self._visible is None:
+            indexes = range(len(self.students))
+        else:
+            indexes = self._visible
+        if indexes:
+            self.student_listbox.insert(
+                tk.END, *(student_label(self.students[i]) for i in indexes)
+            )
+        row = None if selected is None else self._row_for(selected)
+        if row is not None:
+            self.student_listbox.selection_set(row)
+            self.student_listbox.see(row)
+
+    def _get_selected_student(self) -> Student | None:
+        # Return the selected student, if any.
+        index = self._get_selected_index()
+        if index is None:
+            return None
+        return self.students[index]
 
     def add_task(self) -> None:
         # Validate input and add a task to the selected student.
-        student = self._get_selected_student()
-        if not student:
+        index = self._get_selected_index()
+        if index is None:
             messagebox.showerror("No Student Selected", "Select a student first.")
             return
 
-        task = self.task_name_entry.get().strip()
-        if not task:
-            messagebox.showerror("Invalid Task", "Please enter a task name.")
-            return
-
         try:
-            grade = float(self.grade_entry.get().strip())
-        except ValueError:
-            messagebox.showerror("Invalid Grade", "Grade must be a number.")
-            return
-
-        if grade < 0 or grade > 100:
-            messagebox.showerror("Invalid Grade", "Grade must be between 0 and 100.")
+            task, grade = validate_task(
+                self.task_name_entry.get(), self.grade_entry.get()
+            )
+        except ValueError as error:
+            messagebox.showerror(*error.args)
             return
 
-        student.add_task(task, grade)
+        self.students.add_task(index, task, grade)
         self.task_name_entry.delete(0, tk.END)
         self.grade_entry.delete(0, tk.END)
+        self._schedule_flush()
         self._refresh_views()
 
     def _refresh_views(self, _event: object | None = None) -> None:
-        # Refresh the listbox and summary display.
-        # Update listbox
-        self.student_listbox.delete(0, tk.END)
-        for student in self.students:
-            avg = student.average()
-            if avg is None:
-                label = f"{student.name} — No grades yet"
+        # Redraw only the listbox rows and summary blocks that changed.
+        changed = self.students.take_dirty()
+        if not changed:
+            return
+
+        # Remember selection and scroll so the user keeps their place.
+        selection = self.student_listbox.curselection()
+        list_view = self.student_listbox.yview()[0]
+
+        row_count = self.student_listbox.size()
+        for index in changed:
+            row = self._row_for(index)
+            if row is None:
+                continue
+            label = student_label(self.students[index])
+            if row < row_count:
+                self.student_listbox.delete(row)
+                self.student_listbox.insert(row, label)
             else:
-                label = f"{student.name} — Avg: {avg:.1f} ({letter_grade(avg)})"
-            self.student_listbox.insert(tk.END, label)
+                self.student_listbox.insert(tk.END, label)
+
+        self.summary_view.refresh(changed)
 
-        # Update summary text
-        self.summary_text.configure(state="normal")
-        self.summary_text.delete("1.0", tk.END)
+        for row in selection:
+            self.student_listbox.selection_set(row)
+        self.student_listbox.yview_moveto(list_view)
+        self._schedule_stats()
 
-        if not self.students:
-            self.summary_text.insert(
-                tk.END, "No students yet. Add a student to get started."
+    def _schedule_stats(self) -> None:
+        # Recompute class statistics once the UI is idle, coalescing bursts.
+        if self._stats_job is None:
+            self._stats_job = self.root.after_idle(self._refresh_stats)
+
+    def _refresh_stats(self) -> None:
+        # Redraw the class statistics panel if the gradebook changed.
+        self._stats_job = None
+        gradebook = self.students.gradebook
+        if gradebook.version == self._stats_version:
+            return
+        self._stats_version = gradebook.version
+        self._refresh_rankings()
+
+        if not len(gradebook):
+            self.stats_label.config(text="No grades yet.")
+            self.task_avg_listbox.delete(0, tk.END)
+            return
+
+        p10, median, p90 = gradebook.percentiles([10, 50, 90])
+        bands = gradebook.grade_distribution()
+        letters = gradebook.student_letter_distribution()
+        self.stats_label.config(
+            text=(
+                f"Grades: {len(gradebook)}   "
+                f"Average: {gradebook.class_average():.1f}   "
+                f"Median: {median:.1f}   P10: {p10:.1f}   P90: {p90:.1f}\n"
+                "Grades by band: "
+                + "  ".join(f"{k}: {v}" for k, v in bands.items())
+                + "\nStudents by letter: "
+                + "  ".join(f"{k}: {v}" for k, v in letters.items())
             )
+        )
+        self.task_avg_listbox.delete(0, tk.END)
+        self.task_avg_listbox.insert(
+            tk.END,
+            *(
+                f"{name} — class avg {avg:.1f}"
+                for name, avg in gradebook.task_averages().items()
+            ),
+        )
+
+    def _rebuild_views(self) -> None:
+        # Rebuild the listbox and summary display from scratch.
+        self.students.dirty.clear()
+        self._fill_listbox(self._get_selected_index())
+        self.summary_view.refresh()
+        self._stats_version = -1
+        self._schedule_stats()
+
+
+def print_report(students) -> None:
+    # Write per-student averages and letter grades to stdout as CSV.
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["student", "tasks", "average", "letter"])
+    for student in students:
+        avg = student.average()
+        if avg is None:
+            writer.writerow([student.name, 0, "", ""])
         else:
-            for student in self.students:
-                self.summary_text.insert(tk.END, f"Student: {student.name}\n")
-                if not student.tasks:
-                    self.summary_text.insert(tk.END, "  - No tasks yet\n\n")
-                else:
-                    for task, grade in student.tasks:
-                        self.summary_text.insert(
-                            tk.END, f"  - {task}: {grade:.1f}\n"
-                        )
-                    avg = student.average()
-                    if avg is not None:
-                        self.summary_text.insert(
-                            tk.END,
-                            f"  Average: {avg:.1f} ({letter_grade(avg)})\n\n",
-                        )
-
-        self.summary_text.configure(state="disabled")
-
-
-def main() -> None:
+            writer.writerow([student.name, student.count, f"{avg:.1f}", letter_grade(avg)])
+
+
+def positive_int(text: str) -> int:
+    # argparse type for counts that must be at least 1.
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+def run_cli(args: argparse.Namespace) -> int:
+    # Handle a command-line request without opening a window.
+    if args.command == "report" and args.csv:
+        # Report straight from a CSV file; nothing is saved.
+        roster = Roster(track_grades=False)
+        _, errors = import_grades(roster, args.csv)
+        for line, message in errors:
+            print(f"{args.csv}:{line}: {message}", file=sys.stderr)
+        print_report(roster)
+        return 1 if errors else 0
+
+    store = GradeStore(args.db)
+    try:
+        if args.command == "import":
+            # Bigger transactions make bulk loads much faster.
+            store.batch_size = 50_000
+            roster = Roster(store, track_grades=False)
+            roster.load()
+            imported, errors = import_grades(roster, args.csv)
+            for line, message in errors:
+                print(f"{args.csv}:{line}: {message}", file=sys.stderr)
+            print(f"Imported {imported} grades, skipped {len(errors)} rows.")
+            return 1 if errors else 0
+        if args.command == "export":
+            write_rows(args.csv, store.iter_named_grades())
+            return 0
+        if args.command == "reports":
+            store.flush()
+            count = write_reports(args.db, args.out_dir, args.format, args.workers)
+            print(f"Wrote {count} reports to {args.out_dir}.")
+            return 0
+        roster = Roster(store, track_grades=False)
+        roster.load()
+        print_report(roster)
+        return 0
+    finally:
+        store.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    # Run a headless command, or open the window when none is given.
+    parser = argparse.ArgumentParser(description="Student Task & Grade Manager")
+    parser.add_argument("--db", default=DB_FILE, help="SQLite file to use")
+    sub = parser.add_subparsers(dest="command")
+    import_cmd = sub.add_parser("import", help="add grades from a CSV file")
+    import_cmd.add_argument("csv")
+    export_cmd = sub.add_parser("export", help="write all grades to a CSV file")
+    export_cmd.add_argument("csv")
+    report_cmd = sub.add_parser("report", help="print averages and letter grades")
+    report_cmd.add_argument("--csv", help="read grades from a CSV file instead")
+    reports_cmd = sub.add_parser("reports", help="write one summary file per student")
+    reports_cmd.add_argument("out_dir")
+    reports_cmd.add_argument("--format", choices=["txt", "html"], default="txt")
+    reports_cmd.add_argument(
+        "--workers",
+        type=positive_int,
+        default=None,
+        help="processes to use (default: all cores)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command is not None:
+        # Headless mode: no Tk window.
+        sys.exit(run_cli(args))
+
     # Create the window and start the app.
     root = tk.Tk()
-    app = StudentManagerApp(root)
+    app = StudentManagerApp(root, GradeStore(args.db))
+    root.protocol("WM_DELETE_WINDOW", app.close)
     root.minsize(560, 520)
     root.mainloop()
 
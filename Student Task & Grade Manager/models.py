@@ -0,0 +1,123 @@
+from collections.abc import Callable
+
+from gradebook import letter_grade
+from storage import Aggregates
+
+
+# One graded piece of work. Slots keep each task small in memory.
+class Task:
+    __slots__ = ("name", "grade")
+
+    def __init__(self, name: str, grade: float) -> None:
+        self.name = name
+        self.grade = grade
+
+
+# Data model for a student and their work.
+class Student:
+    __slots__ = (
+        "name", "_tasks", "_loader", "count", "total", "minimum", "maximum", "_m2"
+    )
+
+    def __init__(self, name: str) -> None:
+        # Store the student's name and task list.
+        self.name = name
+        self._tasks: list[Task] | None = []
+        # Fetches saved tasks on first use when the student came from storage.
+        self._loader: Callable[[], list[Task]] | None = None
+        # Running aggregates, updated on every new grade.
+        self.count = 0
+        self.total = 0.0
+        self.minimum: float | None = None
+        self.maximum: float | None = None
+        # Sum of squared differences from the mean (Welford's method).
+        self._m2 = 0.0
+
+    @classmethod
+    def from_saved(
+        cls, name: str, aggregates: Aggregates, loader: Callable[[], list[Task]]
+    ) -> "Student":
+        # Rebuild a saved student whose tasks load lazily.
+        student = cls(name)
+        student.count, student.total, student.minimum, student.maximum, student._m2 = (
+            aggregates
+        )
+        student.detach_tasks(loader)
+        return student
+
+    def detach_tasks(self, loader: Callable[[], list[Task]] | None = None) -> None:
+        # Forget the in-memory task list; reload it with loader if asked for.
+        self._tasks = None
+        self._loader = loader
+
+    @property
+    def tasks(self) -> list[Task]:
+        # Load the task list from storage the first time it is needed.
+        if self._tasks is None:
+            self._tasks = self._loader() if self._loader else []
+            self._loader = None
+        return self._tasks
+
+    def aggregates(self) -> Aggregates:
+        # Running totals in the order the storage layer saves them.
+        return self.count, self.total, self.minimum, self.maximum, self._m2
+
+    def add_task(self, task: str, grade: float) -> None:
+        # Add a task and update the running aggregates in O(1).
+        # Unloaded task lists are left alone; storage has the new row.
+        if self._tasks is not None:
+            self._tasks.append(Task(task, grade))
+        old_mean = self.total / self.count if self.count else 0.0
+        self.count += 1
+        self.total += grade
+        new_mean = self.total / self.count
+        self._m2 += (grade - old_mean) * (grade - new_mean)
+        if self.minimum is None or grade < self.minimum:
+            self.minimum = grade
+        if self.maximum is None or grade > self.maximum:
+            self.maximum = grade
+
+    def average(self) -> float | None:
+        # Return the average grade or None if no tasks exist.
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    def variance(self) -> float | None:
+        # Return the population variance of the grades, if any.
+        if not self.count:
+            return None
+        return self._m2 / self.count
+
+    def std_dev(self) -> float | None:
+        # Return the standard deviation of the grades, if any.
+        variance = self.variance()
+        if variance is None:
+            return None
+        return variance ** 0.5
+
+
+def student_label(student: Student) -> str:
+    # Build the one-line listbox label for a student.
+    avg = student.average()
+    if avg is None:
+        return f"{student.name} — No grades yet"
+    return f"{student.name} — Avg: {avg:.1f} ({letter_grade(avg)})"
+
+
+def summary_block(student: Student) -> str:
+    # Build the multi-line summary text for a student.
+    lines = [f"Student: {student.name}\n"]
+    if not student.tasks:
+        lines.append("  - No tasks yet\n\n")
+        return "".join(lines)
+    for task in student.tasks:
+        lines.append(f"  - {task.name}: {task.grade:.1f}\n")
+    avg = student.average()
+    if avg is not None:
+        lines.append(
+            f"  Range: {student.minimum:.1f}-{student.maximum:.1f}"
+            f" (std dev {student.std_dev():.1f})\n"
+        )
+        lines.append(f"  Average: {avg:.1f} ({letter_grade(avg)})\n\n")
+    return "".join(lines)
@@ -0,0 +1,93 @@
+from math import ceil
+
+
+# Averages are ranked in 0.01-point buckets (0.00 to 100.00).
+BUCKETS_PER_POINT = 100
+BUCKET_COUNT = 100 * BUCKETS_PER_POINT + 1
+
+
+def _bucket(avg: float) -> int:
+    return round(avg * BUCKETS_PER_POINT)
+
+
+# Order-maintained index of student averages.
+# A Fenwick (binary indexed) tree counts students per bucket, so updates,
+# rank lookups and percentile lookups all take O(log buckets).
+class RankIndex:
+    def __init__(self) -> None:
+        self._tree = [0] * (BUCKET_COUNT + 1)
+        self._members: dict[int, set[int]] = {}
+        self._bucket_of: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._bucket_of)
+
+    def _add(self, bucket: int, delta: int) -> None:
+        position = bucket + 1
+        while position <= BUCKET_COUNT:
+            self._tree[position] += delta
+            position += position & -position
+
+    def _count_up_to(self, bucket: int) -> int:
+        # Number of students in buckets 0..bucket.
+        total = 0
+        position = bucket + 1
+        while position > 0:
+            total += self._tree[position]
+            position -= position & -position
+        return total
+
+    def _bucket_at(self, order: int) -> int:
+        # Bucket holding the order-th lowest student (1-based).
+        position = 0
+        step = 1 << BUCKET_COUNT.bit_length()
+        while step:
+            nxt = position + step
+            if nxt <= BUCKET_COUNT and self._tree[nxt] < order:
+                position = nxt
+                order -= self._tree[nxt]
+            step >>= 1
+        return position
+
+    def update(self, student_id: int, avg: float | None) -> None:
+        # Move a student to the bucket for their new average (None removes them).
+        old = self._bucket_of.pop(student_id, None)
+        if old is not None:
+            self._add(old, -1)
+            members = self._members[old]
+            members.discard(student_id)
+            if not members:
+                del self._members[old]
+        if avg is None:
+            return
+        bucket = _bucket(avg)
+        self._bucket_of[student_id] = bucket
+        self._members.setdefault(bucket, set()).add(student_id)
+        self._add(bucket, 1)
+
+    def rank_of(self, student_id: int) -> int | None:
+        # 1-based class rank (ties share a rank), or None if ungraded.
+        bucket = self._bucket_of.get(student_id)
+        if bucket is None:
+            return None
+        return len(self) - self._count_up_to(bucket) + 1
+
+    def top(self, k: int, best_first: bool = True) -> list[int]:
+        # Student ids of the k best (or worst) averages, without a full sort.
+        result: list[int] = []
+        count = len(self)
+        seen = 0
+        while len(result) < k and seen < count:
+            order = count - seen if best_first else seen + 1
+            bucket = self._bucket_at(order)
+            members = sorted(self._members[bucket])
+            result.extend(members[: k - len(result)])
+            seen += len(members)
+        return result
+
+    def percentile(self, point: float) -> float | None:
+        # Lowest average at or above the given percentile (0-100) of students.
+        if not self._bucket_of:
+            return None
+        order = max(1, ceil(point / 100 * len(self)))
+        return self._bucket_at(order) / BUCKETS_PER_POINT
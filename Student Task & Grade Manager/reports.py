@@ -0,0 +1,118 @@
+import html
+import os
+import pathlib
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+
+from gradebook import letter_grade
+from models import Student, summary_block
+
+
+# Students handed to a worker at a time.
+CHUNK_SIZE = 200
+
+# Read-only connection opened once in each worker process.
+_connection: sqlite3.Connection | None = None
+
+
+def _open_worker(db_path: str) -> None:
+    # Give each worker process its own connection to the grade database.
+    # as_uri percent-encodes the path, so names with ?, # or % still work.
+    global _connection
+    uri = pathlib.Path(db_path).resolve().as_uri() + "?mode=ro"
+    _connection = sqlite3.connect(uri, uri=True)
+
+
+def _close_worker() -> None:
+    # Close the connection opened by _open_worker in this process.
+    global _connection
+    if _connection is not None:
+        _connection.close()
+        _connection = None
+
+
+def summary_html(student: Student) -> str:
+    # Build an HTML page with the same content as the text summary.
+    name = html.escape(student.name)
+    rows = "".join(
+        f"<tr><td>{html.escape(task.name)}</td><td>{task.grade:.1f}</td></tr>\n"
+        for task in student.tasks
+    )
+    avg = student.average()
+    if avg is None:
+        result = "<p>No tasks yet</p>"
+    else:
+        result = (
+            f"<p>Range: {student.minimum:.1f}-{student.maximum:.1f}"
+            f" (std dev {student.std_dev():.1f})</p>\n"
+            f"<p>Average: {avg:.1f} ({letter_grade(avg)})</p>"
+        )
+    return (
+        f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+        f"<title>{name}</title></head><body>\n"
+        f"<h1>Student: {name}</h1>\n"
+        f"<table><tr><th>Task</th><th>Grade</th></tr>\n{rows}</table>\n"
+        f"{result}\n</body></html>\n"
+    )
+
+
+def report_filename(student_id: int, name: str, fmt: str) -> str:
+    # Safe, unique file name for one student's report.
+    safe = re.sub(r"[^\w-]+", "_", name).strip("_") or "student"
+    return f"{student_id:06d}_{safe}.{fmt}"
+
+
+def _write_chunk(
+    students: list[tuple[int, str]], out_dir: str, fmt: str
+) -> int:
+    # Stream each student's tasks, then write their report file.
+    for student_id, name in students:
+        student = Student(name)
+        cursor = _connection.execute(
+            "SELECT name, grade FROM tasks WHERE student_id = ? ORDER BY id",
+            (student_id,),
+        )
+        for task, grade in cursor:
+            student.add_task(task, grade)
+        text = summary_html(student) if fmt == "html" else summary_block(student)
+        path = os.path.join(out_dir, report_filename(student_id, name, fmt))
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(text)
+    return len(students)
+
+
+def write_reports(
+    db_path: str, out_dir: str, fmt: str = "txt", workers: int | None = None
+) -> int:
+    # Write one summary file per student using a pool of worker processes.
+    if workers is not None and workers < 1:
+        raise ValueError(f"workers must be at least 1, not {workers}")
+    os.makedirs(out_dir, exist_ok=True)
+    connection = sqlite3.connect(db_path)
+    students = connection.execute("SELECT id, name FROM students ORDER BY id").fetchall()
+    connection.close()
+    chunks = [
+        students[start:start + CHUNK_SIZE]
+        for start in range(0, len(students), CHUNK_SIZE)
+    ]
+
+    if workers == 1:
+        # Skip the pool overhead when only one process is wanted.
+        _open_worker(db_path)
+        try:
+            return sum(_write_chunk(chunk, out_dir, fmt) for chunk in chunks)
+        finally:
+            _close_worker()
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_open_worker, initargs=(db_path,)
+    ) as pool:
+        return sum(
+            pool.map(
+                _write_chunk,
+                chunks,
+                [out_dir] * len(chunks),
+                [fmt] * len(chunks),
+            )
+        )
@@ -0,0 +1,239 @@
+import sqlite3
+from collections import Counter
+from collections.abc import Iterator
+
+from gradebook import BINS_PER_POINT, GRADE_CUTOFFS, grade_band, grade_bin
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL UNIQUE,
+    count INTEGER NOT NULL DEFAULT 0,
+    total REAL NOT NULL DEFAULT 0,
+    minimum REAL,
+    maximum REAL,
+    m2 REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    student_id INTEGER NOT NULL REFERENCES students(id),
+    name TEXT NOT NULL,
+    grade REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_by_student ON tasks(student_id, id);
+CREATE TABLE IF NOT EXISTS task_totals (
+    name TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    total REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS grade_counts (
+    bin INTEGER NOT NULL,
+    band INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (bin, band)
+);
+CREATE TABLE IF NOT EXISTS band_cutoffs (
+    position INTEGER PRIMARY KEY,
+    cutoff REAL NOT NULL
+);
+"""
+# Stored in PRAGMA user_version. Version 1 added task_totals and
+# grade_counts, version 2 the band_cutoffs that grade_counts was counted
+# with; older files get them filled from their tasks on open.
+SCHEMA_VERSION = 2
+# The same bin as grade_bin, in SQL.
+GRADE_BIN_SQL = f"CAST(grade * {BINS_PER_POINT} + 0.5 AS INTEGER)"
+
+
+def grade_band_sql(cutoffs: tuple[float, ...]) -> str:
+    # The same band as grade_band, in SQL.
+    return " + ".join(f"(grade >= {cutoff!r})" for cutoff in cutoffs) or "0"
+
+# Running aggregates saved with each student: count, total, min, max, m2.
+Aggregates = tuple[int, float, float | None, float | None, float]
+
+
+# SQLite file that stores students and grades between runs.
+class GradeStore:
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 1000,
+        cutoffs: tuple[float, ...] = GRADE_CUTOFFS,
+    ) -> None:
+        # Open the database in WAL mode and create tables if needed. Grade
+        # bands are counted with `cutoffs`; saved counts made with other
+        # cutoffs are counted again from the grades.
+        self.path = path
+        self.batch_size = batch_size
+        self.cutoffs = tuple(cutoffs)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        (version,) = self.connection.execute("PRAGMA user_version").fetchone()
+        saved_cutoffs = tuple(
+            cutoff
+            for (cutoff,) in self.connection.execute(
+                "SELECT cutoff FROM band_cutoffs ORDER BY position"
+            )
+        )
+        if version < SCHEMA_VERSION or saved_cutoffs != self.cutoffs:
+            self._build_grade_summary()
+        # Grade writes wait here until the next flush, which runs one
+        # transaction. Students are written at once (see add_student).
+        self._pending_tasks: list[tuple[int, str, float]] = []
+        self._pending_aggregates: dict[int, Aggregates] = {}
+        # Rows lost because the transaction that wrote them failed.
+        self.dropped = 0
+
+    def _build_grade_summary(self) -> None:
+        # Fill the per-task and per-bin totals from every saved grade, and
+        # record the cutoffs the bands were counted with.
+        with self.connection:
+            self.connection.execute("DELETE FROM task_totals")
+            self.connection.execute("DELETE FROM grade_counts")
+            self.connection.execute("DELETE FROM band_cutoffs")
+            self.connection.executemany(
+                "INSERT INTO band_cutoffs (position, cutoff) VALUES (?, ?)",
+                enumerate(self.cutoffs),
+            )
+            self.connection.execute(
+                "INSERT INTO task_totals (name, count, total)"
+                " SELECT name, COUNT(*), SUM(grade) FROM tasks GROUP BY name"
+            )
+            self.connection.execute(
+                "INSERT INTO grade_counts (bin, band, count)"
+                f" SELECT {GRADE_BIN_SQL}, {grade_band_sql(self.cutoffs)}, COUNT(*)"
+                " FROM tasks GROUP BY 1, 2"
+            )
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        # Save anything pending and close the file.
+        try:
+            self.flush()
+        finally:
+            self.connection.close()
+
+    def add_student(self, name: str) -> int:
+        # Save a new student row now and return the id SQLite gave it. It is
+        # not queued, so a failed batch can never drop a student the roster
+        # already shows.
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO students (name, name_key) VALUES (?, ?)",
+                (name, name.casefold()),
+            )
+        return cursor.lastrowid
+
+    def add_task(
+        self, student_id: int, task: str, grade: float, aggregates: Aggregates
+    ) -> None:
+        # Queue a grade row and the student's updated running totals.
+        self._pending_tasks.append((student_id, task, grade))
+        self._pending_aggregates[student_id] = aggregates
+        self._flush_if_full()
+
+    def has_pending(self) -> bool:
+        return bool(self._pending_tasks)
+
+    def _flush_if_full(self) -> None:
+        if len(self._pending_tasks) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        # Write every queued grade, and the totals they change, in a single
+        # transaction. A batch that fails is dropped (and counted in
+        # `dropped`) before the error is raised, so it cannot block every
+        # later write.
+        if not self.has_pending():
+            return
+        tasks, self._pending_tasks = self._pending_tasks, []
+        aggregates, self._pending_aggregates = self._pending_aggregates, {}
+        task_totals: dict[str, list] = {}
+        grade_counts: Counter = Counter()
+        for _, task, grade in tasks:
+            totals = task_totals.setdefault(task, [0, 0.0])
+            totals[0] += 1
+            totals[1] += grade
+            grade_counts[grade_bin(grade), grade_band(grade, self.cutoffs)] += 1
+        try:
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT INTO tasks (student_id, name, grade) VALUES (?, ?, ?)",
+                    tasks,
+                )
+                self.connection.executemany(
+                    "UPDATE students SET count = ?, total = ?, minimum = ?,"
+                    " maximum = ?, m2 = ? WHERE id = ?",
+                    [
+                        (*totals, student_id)
+                        for student_id, totals in aggregates.items()
+                    ],
+                )
+                self.connection.executemany(
+                    "INSERT INTO task_totals (name, count, total) VALUES (?, ?, ?)"
+                    " ON CONFLICT (name) DO UPDATE SET count = count + excluded.count,"
+                    " total = total + excluded.total",
+                    [(name, *totals) for name, totals in task_totals.items()],
+                )
+                self.connection.executemany(
+                    "INSERT INTO grade_counts (bin, band, count) VALUES (?, ?, ?)"
+                    " ON CONFLICT (bin, band) DO UPDATE SET"
+                    " count = count + excluded.count",
+                    [(*key, count) for key, count in grade_counts.items()],
+                )
+        except sqlite3.Error:
+            self.dropped += len(tasks)
+            raise
+
+    def load_students(self) -> Iterator[tuple[int, str, Aggregates]]:
+        # Yield (id, name, aggregates) for every student without their tasks.
+        self.flush()
+        cursor = self.connection.execute(
+            "SELECT id, name, count, total, minimum, maximum, m2"
+            " FROM students ORDER BY id"
+        )
+        for row in cursor:
+            yield row[0], row[1], row[2:]
+
+    def load_tasks(self, student_id: int) -> list[tuple[str, float]]:
+        # Return one student's (task, grade) rows in the order they were added.
+        self.flush()
+        cursor = self.connection.execute(
+            "SELECT name, grade FROM tasks WHERE student_id = ? ORDER BY id",
+            (student_id,),
+        )
+        return cursor.fetchall()
+
+    def load_grade_summary(
+        self,
+    ) -> tuple[list[tuple[str, int, float]], list[tuple[int, int, int]]]:
+        # Class totals without reading any grade rows: (task, count, total)
+        # per task and (bin, band, count) per histogram bin and letter band.
+        self.flush()
+        tasks = self.connection.execute(
+            "SELECT name, count, total FROM task_totals ORDER BY rowid"
+        ).fetchall()
+        counts = self.connection.execute(
+            "SELECT bin, band, count FROM grade_counts"
+        ).fetchall()
+        return tasks, counts
+
+    def iter_named_grades(
+        self, chunk_size: int = 50_000
+    ) -> Iterator[list[tuple[str, str, float]]]:
+        # Yield (student name, task, grade) rows in chunks, oldest first.
+        self.flush()
+        cursor = self.connection.execute(
+            "SELECT students.name, tasks.name, tasks.grade FROM tasks"
+            " JOIN students ON students.id = tasks.student_id ORDER BY tasks.id"
+        )
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield rows
@@ -0,0 +1,63 @@
+import csv
+
+from csv_io import read_rows, write_rows
+from main import Roster, import_grades, main
+
+
+def write_csv(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_import_skips_bad_rows_with_line_numbers(tmp_path):
+    path = write_csv(
+        tmp_path / "grades.csv",
+        [
+            "student,task,grade",
+            "Ada,Quiz,90",
+            "ada,Essay,70",
+            ",Quiz,50",
+            "Bo,Quiz",
+            "Bo,Quiz,abc",
+            "Bo,Lab,101",
+            "Bo, Lab ,65.5",
+        ],
+    )
+    roster = Roster(track_grades=False)
+    imported, errors = import_grades(roster, path)
+    assert imported == 3
+    assert [line for line, _ in errors] == [4, 5, 6, 7]
+    assert [student.name for student in roster] == ["Ada", "Bo"]
+    assert roster[0].average() == 80.0
+    assert roster[1].average() == 65.5
+
+
+def test_write_rows_round_trips_through_read_rows(tmp_path):
+    path = str(tmp_path / "out.csv")
+    chunks = [[("Ada", "Quiz, part 1", 90.0)], [("Bo", 'The "Lab"', 65.5)]]
+    write_rows(path, chunks)
+    assert list(read_rows(path)) == [
+        (2, ["Ada", "Quiz, part 1", "90.0"]),
+        (3, ["Bo", 'The "Lab"', "65.5"]),
+    ]
+
+
+def test_import_then_export_from_the_command_line(tmp_path, capsys):
+    db = str(tmp_path / "grades.db")
+    source = write_csv(tmp_path / "in.csv", ["Ada,Quiz,90", "Bo,Quiz,60", "Ada,Lab,70"])
+    exported = str(tmp_path / "out.csv")
+    for argv in (["import", source], ["export", exported], ["report"]):
+        try:
+            main(["--db", db, *argv])
+        except SystemExit as done:
+            assert done.code == 0
+    with open(exported, newline="", encoding="utf-8") as handle:
+        assert list(csv.reader(handle)) == [
+            ["student", "task", "grade"],
+            ["Ada", "Quiz", "90.0"],
+            ["Bo", "Quiz", "60.0"],
+            ["Ada", "Lab", "70.0"],
+        ]
+    report = capsys.readouterr().out
+    assert "Ada,2,80.0,B" in report
+    assert "Bo,1,60.0,D" in report
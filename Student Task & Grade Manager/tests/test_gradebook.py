@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from gradebook import Gradebook, letter_grade
+
+
+def test_extend_matches_add_row_by_row():
+    rng = random.Random(5)
+    rows = [
+        (rng.randrange(30), f"Task {rng.randrange(7)}", round(rng.uniform(0, 100), 2))
+        for _ in range(2_000)
+    ]
+    by_row = Gradebook()
+    for row in rows:
+        by_row.add(*row)
+    by_column = Gradebook()
+    by_column.extend(*zip(*rows[:500]))
+    by_column.extend(*zip(*rows[500:]))
+
+    assert list(by_column.grades) == list(by_row.grades)
+    assert by_column.task_names == by_row.task_names
+    assert by_column.class_average() == pytest.approx(by_row.class_average())
+    assert by_column.task_averages() == pytest.approx(by_row.task_averages())
+    assert by_column.student_averages() == pytest.approx(by_row.student_averages())
+    assert by_column.percentiles([10, 50, 90]) == by_row.percentiles([10, 50, 90])
+    assert by_column.grade_distribution() == by_row.grade_distribution()
+
+
+def test_extend_rejects_uneven_columns():
+    gradebook = Gradebook()
+    with pytest.raises(ValueError):
+        gradebook.extend([1, 2], ["Quiz"], [50.0, 60.0])
+    assert len(gradebook) == 0
+    assert gradebook.task_names == []
+
+
+def test_bands_agree_with_letter_grade_at_cutoffs():
+    grades = [59.96, 59.999, 60.0, 69.95, 70.0, 89.99, 90.0, 100.0, 0.0]
+    gradebook = Gradebook()
+    gradebook.extend([0] * len(grades), ["Quiz"] * len(grades), grades)
+    gradebook.add(1, "Quiz", 59.96)
+
+    expected = dict.fromkeys("FDCBA", 0)
+    for grade in grades + [59.96]:
+        expected[letter_grade(grade)] += 1
+    assert gradebook.grade_distribution() == expected
+    assert expected["F"] == 4
+
+
+def test_custom_cutoffs_are_used_for_bands():
+    gradebook = Gradebook(cutoffs=(50.0,), letters="NP")
+    gradebook.extend([0, 0, 0], ["A", "B", "C"], [49.9, 50.0, 75.0])
+    assert gradebook.grade_distribution() == {"N": 1, "P": 2}
+    assert gradebook.student_letter_distribution() == {"N": 0, "P": 1}
+
+
+def test_percentiles_and_median():
+    gradebook = Gradebook()
+    gradebook.extend(range(5), ["Quiz"] * 5, [10.0, 20.0, 30.0, 40.0, 50.0])
+    assert gradebook.median() == 30.0
+    assert gradebook.percentiles([0, 100]) == [10.0, 50.0]
+    assert Gradebook().percentiles([50]) == [None]
+
+
+def test_student_letter_distribution_uses_averages():
+    gradebook = Gradebook()
+    gradebook.extend([0, 0, 1, 3], ["A", "B", "A", "A"], [95.0, 85.0, 50.0, 72.0])
+    assert gradebook.student_averages() == [90.0, 50.0, 72.0]
+    assert gradebook.student_letter_distribution() == {
+        "F": 1, "D": 0, "C": 1, "B": 0, "A": 1
+    }
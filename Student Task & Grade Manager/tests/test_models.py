@@ -0,0 +1,52 @@
+import random
+import statistics
+
+import pytest
+
+from models import Student, Task, student_label, summary_block
+
+
+def test_running_aggregates_match_statistics():
+    rng = random.Random(11)
+    grades = [rng.uniform(0, 100) for _ in range(500)]
+    student = Student("Ada")
+    for number, grade in enumerate(grades):
+        student.add_task(f"Task {number}", grade)
+    assert student.count == len(grades)
+    assert student.average() == pytest.approx(statistics.fmean(grades))
+    assert student.variance() == pytest.approx(statistics.pvariance(grades))
+    assert student.std_dev() == pytest.approx(statistics.pstdev(grades))
+    assert (student.minimum, student.maximum) == (min(grades), max(grades))
+
+
+def test_empty_student_has_no_aggregates():
+    student = Student("Bo")
+    assert student.average() is None
+    assert student.variance() is None
+    assert student.std_dev() is None
+    assert student_label(student) == "Bo — No grades yet"
+
+
+def test_single_grade_has_zero_spread():
+    student = Student("Cy")
+    student.add_task("Quiz", 72.5)
+    assert student.variance() == 0.0
+    assert student_label(student) == "Cy — Avg: 72.5 (C)"
+
+
+def test_saved_student_loads_tasks_lazily_and_keeps_adding():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return [Task("Quiz", 80.0), Task("Essay", 90.0)]
+
+    student = Student.from_saved("Di", (2, 170.0, 80.0, 90.0, 50.0), loader)
+    assert student.average() == 85.0
+    assert calls == []
+    student.add_task("Lab", 100.0)
+    assert calls == []
+    assert student.variance() == pytest.approx(statistics.pvariance([80, 90, 100]))
+    assert [task.name for task in student.tasks] == ["Quiz", "Essay"]
+    assert calls == [1]
+    assert "Average: 90.0 (A)" in summary_block(student)
@@ -0,0 +1,53 @@
+import random
+
+from ranking import RankIndex
+
+
+def sorted_ranks(averages: dict[int, float]) -> dict[int, int]:
+    # Competition ranks (ties share a rank) from a full sort, at 0.01 points.
+    rounded = {sid: round(avg, 2) for sid, avg in averages.items()}
+    return {
+        sid: 1 + sum(other > value for other in rounded.values())
+        for sid, value in rounded.items()
+    }
+
+
+def test_ranks_match_a_full_sort_through_updates():
+    rng = random.Random(8)
+    index = RankIndex()
+    averages: dict[int, float] = {}
+    for _ in range(400):
+        student_id = rng.randrange(60)
+        if rng.random() < 0.1:
+            averages.pop(student_id, None)
+            index.update(student_id, None)
+        else:
+            averages[student_id] = round(rng.uniform(0, 100), 2)
+            index.update(student_id, averages[student_id])
+    assert len(index) == len(averages)
+    expected = sorted_ranks(averages)
+    for student_id in range(60):
+        assert index.rank_of(student_id) == expected.get(student_id)
+
+
+def test_top_and_bottom():
+    index = RankIndex()
+    for student_id, avg in enumerate([55.0, 91.0, 78.5, 91.0, 12.0]):
+        index.update(student_id, avg)
+    assert index.top(3) == [1, 3, 2]
+    assert index.top(2, best_first=False) == [4, 0]
+    assert index.top(10) == [1, 3, 2, 0, 4]
+    assert index.rank_of(3) == 1
+    assert index.rank_of(2) == 3
+
+
+def test_percentiles_and_empty_index():
+    index = RankIndex()
+    assert index.percentile(50) is None
+    assert index.top(5) == []
+    for student_id in range(100):
+        index.update(student_id, student_id + 0.5)
+    assert index.percentile(50) == 49.5
+    assert index.percentile(90) == 89.5
+    assert index.percentile(0) == 0.5
+    assert index.percentile(100) == 99.5
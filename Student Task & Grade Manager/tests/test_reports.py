@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+import reports
+from main import Roster, main
+from models import Student
+from reports import report_filename, write_reports
+from storage import GradeStore
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    # ?, # and % would end or escape a hand-built file: URI.
+    folder = tmp_path / "term?1#a%20b"
+    folder.mkdir()
+    path = str(folder / "grades.db")
+    store = GradeStore(path)
+    roster = Roster(store, track_grades=False)
+    for number, name in enumerate(["Ada Lovelace", "Bo & Chen", "Cy"]):
+        index = roster.add(Student(name))
+        for task in range(3):
+            roster.add_task(index, f"Task {task}", 60.0 + number * 10 + task)
+    store.close()
+    return path
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_one_report_per_student(db_path, tmp_path, workers):
+    out_dir = str(tmp_path / f"out_{workers}")
+    assert write_reports(db_path, out_dir, "txt", workers) == 3
+    assert sorted(os.listdir(out_dir)) == [
+        "000001_Ada_Lovelace.txt",
+        "000002_Bo_Chen.txt",
+        "000003_Cy.txt",
+    ]
+    with open(os.path.join(out_dir, "000002_Bo_Chen.txt"), encoding="utf-8") as handle:
+        text = handle.read()
+    assert "Student: Bo & Chen" in text
+    assert "Average: 71.0 (C)" in text
+    # The in-process run closes its connection when it is done.
+    assert reports._connection is None
+
+
+def test_html_reports_escape_names(db_path, tmp_path):
+    out_dir = str(tmp_path / "html")
+    write_reports(db_path, out_dir, "html", 1)
+    path = os.path.join(out_dir, report_filename(2, "Bo & Chen", "html"))
+    with open(path, encoding="utf-8") as handle:
+        assert "<h1>Student: Bo &amp; Chen</h1>" in handle.read()
+
+
+@pytest.mark.parametrize("workers", [0, -2])
+def test_worker_count_must_be_positive(db_path, tmp_path, workers):
+    with pytest.raises(ValueError):
+        write_reports(db_path, str(tmp_path / "out"), "txt", workers)
+    with pytest.raises(SystemExit):
+        main(["--db", db_path, "reports", str(tmp_path), "--workers", str(workers)])
@@ -0,0 +1,57 @@
+import pytest
+
+from main import Roster, validate_task
+from models import Student
+
+
+@pytest.fixture
+def roster():
+    roster = Roster()
+    for name in ["Ada", "adam", "Bo", "Abe", "Zed"]:
+        roster.add(Student(name))
+    return roster
+
+
+def names(roster, indexes):
+    return [roster[index].name for index in indexes]
+
+
+def test_prefix_search_ignores_case_and_sorts_by_name(roster):
+    assert names(roster, roster.search("ad")) == ["Ada", "adam"]
+    assert names(roster, roster.search("A")) == ["Abe", "Ada", "adam"]
+    assert names(roster, roster.search("")) == ["Abe", "Ada", "adam", "Bo", "Zed"]
+    assert roster.search("q") == []
+
+
+def test_find_and_duplicates_ignore_case(roster):
+    assert roster.find("BO") == 2
+    assert roster.find("Nobody") is None
+    with pytest.raises(ValueError):
+        roster.add(Student("ZED"))
+    assert len(roster) == 5
+
+
+def test_only_changed_students_are_dirty(roster):
+    assert roster.take_dirty() == [0, 1, 2, 3, 4]
+    assert roster.take_dirty() == []
+    roster.add_task(3, "Quiz", 90.0)
+    roster.add_task(1, "Quiz", 70.0)
+    assert roster.take_dirty() == [1, 3]
+
+
+@pytest.mark.parametrize(
+    "task, grade, title",
+    [
+        (" ", "50", "Invalid Task"),
+        ("Quiz", "ten", "Invalid Grade"),
+        ("Quiz", "101", "Invalid Grade"),
+    ],
+)
+def test_validate_task_rejects_bad_input(task, grade, title):
+    with pytest.raises(ValueError) as error:
+        validate_task(task, grade)
+    assert error.value.args[0] == title
+
+
+def test_validate_task_strips_input():
+    assert validate_task("  Quiz ", " 88.5 ") == ("Quiz", 88.5)
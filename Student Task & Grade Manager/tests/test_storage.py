@@ -0,0 +1,190 @@
+import sqlite3
+
+import pytest
+
+from main import Roster
+from models import Student
+from storage import GradeStore
+
+
+GRADES = [
+    ("Ada", "Essay", 59.96),
+    ("Ada", "Quiz", 88.0),
+    ("Bo", "Essay", 72.25),
+    ("Bo", "Lab", 100.0),
+    ("Cy", "Quiz", 41.5),
+]
+
+
+def fill(roster: Roster) -> None:
+    for name, task, grade in GRADES:
+        index = roster.find(name)
+        if index is None:
+            index = roster.add(Student(name))
+        roster.add_task(index, task, grade)
+
+
+def class_stats(roster: Roster) -> tuple:
+    gradebook = roster.gradebook
+    return (
+        len(gradebook),
+        gradebook.class_average(),
+        gradebook.percentiles([10, 50, 90]),
+        gradebook.grade_distribution(),
+        gradebook.student_letter_distribution(),
+        gradebook.task_averages(),
+    )
+
+
+def test_reopened_roster_has_the_same_class_statistics(tmp_path):
+    path = str(tmp_path / "grades.db")
+    in_memory = Roster()
+    fill(in_memory)
+    store = GradeStore(path)
+    fill(Roster(store))
+    store.close()
+
+    store = GradeStore(path)
+    reopened = Roster(store)
+    reopened.load()
+    assert len(reopened.gradebook.grades) == 0
+    saved = class_stats(reopened)
+    expected = class_stats(in_memory)
+    assert saved[0] == expected[0]
+    assert saved[1] == pytest.approx(expected[1])
+    assert saved[2:5] == expected[2:5]
+    assert saved[5] == pytest.approx(expected[5])
+    assert [student.name for student in reopened] == ["Ada", "Bo", "Cy"]
+    assert [(task.name, task.grade) for task in reopened[1].tasks] == [
+        ("Essay", 72.25),
+        ("Lab", 100.0),
+    ]
+    store.close()
+
+
+def test_new_grades_add_to_saved_totals(tmp_path):
+    path = str(tmp_path / "grades.db")
+    store = GradeStore(path)
+    fill(Roster(store))
+    store.close()
+
+    store = GradeStore(path)
+    roster = Roster(store)
+    roster.load()
+    roster.add_task(roster.find("Cy"), "Quiz", 91.5)
+    store.close()
+
+    store = GradeStore(path)
+    reopened = Roster(store)
+    reopened.load()
+    assert len(reopened.gradebook) == len(GRADES) + 1
+    assert reopened.gradebook.task_averages()["Quiz"] == pytest.approx(
+        (88.0 + 41.5 + 91.5) / 3
+    )
+    store.close()
+
+
+def test_totals_are_rebuilt_for_files_saved_without_them(tmp_path):
+    path = str(tmp_path / "grades.db")
+    store = GradeStore(path)
+    fill(Roster(store))
+    store.close()
+    with sqlite3.connect(path) as connection:
+        connection.execute("DELETE FROM task_totals")
+        connection.execute("DELETE FROM grade_counts")
+        connection.execute("PRAGMA user_version = 0")
+    connection.close()
+
+    store = GradeStore(path)
+    roster = Roster(store)
+    roster.load()
+    expected = Roster()
+    fill(expected)
+    assert class_stats(roster)[:5] == class_stats(expected)[:5]
+    store.close()
+
+
+def test_saved_bands_are_counted_again_when_the_cutoffs_change(tmp_path):
+    path = str(tmp_path / "grades.db")
+    store = GradeStore(path)
+    fill(Roster(store))
+    store.close()
+
+    store = GradeStore(path, cutoffs=(50.0,))
+    roster = Roster(store, letters="NP")
+    roster.load()
+    assert roster.gradebook.grade_distribution() == {"N": 1, "P": 4}
+    store.close()
+
+    # Going back to the default cutoffs counts them once more.
+    store = GradeStore(path)
+    roster = Roster(store)
+    roster.load()
+    expected = Roster()
+    fill(expected)
+    assert class_stats(roster)[:5] == class_stats(expected)[:5]
+    store.close()
+
+
+def reject_task(store: GradeStore, name: str) -> None:
+    # Make every batch that writes a task with this name fail.
+    store.connection.execute(
+        "CREATE TRIGGER reject BEFORE INSERT ON tasks"
+        f" WHEN NEW.name = '{name}' BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+    )
+
+
+def test_failed_batch_is_dropped_and_later_writes_succeed(tmp_path):
+    store = GradeStore(str(tmp_path / "grades.db"))
+    reject_task(store, "Bad")
+    ada = store.add_student("Ada")
+    store.add_task(ada, "Quiz", 50.0, (1, 50.0, 50.0, 50.0, 0.0))
+    store.add_task(ada, "Bad", 10.0, (2, 60.0, 10.0, 50.0, 800.0))
+    with pytest.raises(sqlite3.IntegrityError):
+        store.flush()
+    assert store.dropped == 2
+    assert not store.has_pending()
+
+    store.add_task(ada, "Essay", 80.0, (1, 80.0, 80.0, 80.0, 0.0))
+    store.flush()
+    assert store.load_tasks(ada) == [("Essay", 80.0)]
+    tasks, _ = store.load_grade_summary()
+    assert tasks == [("Essay", 1, 80.0)]
+    store.close()
+
+
+def test_grades_reach_the_right_student_after_a_failed_batch_and_a_reload(tmp_path):
+    path = str(tmp_path / "grades.db")
+    store = GradeStore(path)
+    reject_task(store, "Bad")
+    roster = Roster(store)
+    roster.add_task(roster.add(Student("Ada")), "Essay", 70.0)
+    store.flush()
+    roster.add_task(roster.add(Student("Bo")), "Bad", 10.0)
+    with pytest.raises(sqlite3.IntegrityError):
+        store.flush()
+    roster.add_task(roster.add(Student("Cy")), "Lab", 60.0)
+    store.close()
+    # A gap in the saved ids, as a student removed outside the app leaves.
+    with sqlite3.connect(path) as connection:
+        connection.execute("DELETE FROM students WHERE name = 'Bo'")
+    connection.close()
+
+    store = GradeStore(path)
+    roster = Roster(store)
+    roster.load()
+    assert [student.name for student in roster] == ["Ada", "Cy"]
+    roster.add_task(roster.find("Cy"), "Quiz", 90.0)
+    roster.add_task(roster.add(Student("Di")), "Quiz", 80.0)
+    store.close()
+
+    store = GradeStore(path)
+    roster = Roster(store)
+    roster.load()
+    tasks = {student.name: [(task.name, task.grade) for task in student.tasks] for student in roster}
+    assert tasks == {
+        "Ada": [("Essay", 70.0)],
+        "Cy": [("Lab", 60.0), ("Quiz", 90.0)],
+        "Di": [("Quiz", 80.0)],
+    }
+    store.close()
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+from virtual_text import (
+    needs_redraw,
+    record_at,
+    record_for_fraction,
+    window_bounds,
+    window_start,
+)
+
+
+def test_both_trackers_ship_the_same_virtual_text():
+    apps = Path(__file__).resolve().parent.parent.parent
+    here = apps / "Student Task & Grade Manager" / "virtual_text.py"
+    other = apps / "Smart Habit Tracker" / "virtual_text.py"
+    assert here.read_bytes() == other.read_bytes()
+
+
+def scroll_to(fraction: float, total: int, size: int = 60) -> tuple[int, int]:
+    # The records drawn after dragging the scrollbar thumb to `fraction`.
+    record = record_for_fraction(fraction, total)
+    return window_bounds(window_start(record, 0, size, False), total, size)
+
+
+def test_dragging_the_scrollbar_draws_a_window_around_the_record():
+    assert scroll_to(0.0, 1000) == (0, 60)
+    # A quarter window of context is drawn above the record scrolled to.
+    assert scroll_to(0.5, 1000) == (485, 545)
+    assert scroll_to(1.0, 1000) == (984, 1000)
+    assert scroll_to(0.5, 10) == (0, 10)
+    assert record_at([1, 4, 6], 485, 5) == (486, 1)
+    assert record_at([1, 4, 6], 485, 9) == (487, 3)
+
+
+def test_only_changes_to_drawn_records_redraw():
+    first, last = scroll_to(0.5, 1000)
+    assert not needs_redraw(first, last, 1000, 60, [10, 999])
+    assert needs_redraw(first, last, 1000, 60, [10, 500])
+    # A short window redraws to take in records added after it.
+    assert needs_redraw(0, 10, 11, 60, [10])
+    assert not needs_redraw(0, 10, 10, 60, [])
+
+
+def test_a_shrunken_model_redraws_and_moves_the_window_back():
+    first, last = scroll_to(0.5, 1000)
+    assert needs_redraw(first, last, 100, 60, [])
+    # refresh keeps the top record in range, then draws back from it.
+    record = min(first, 100 - 1)
+    assert window_bounds(window_start(record, first, 60, True), 100, 60) == (84, 100)
+    assert window_bounds(first, 0, 60) == (0, 0)
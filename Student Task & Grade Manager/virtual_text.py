@@ -0,0 +1,176 @@
+import tkinter as tk
+from bisect import bisect_right
+from collections.abc import Callable, Iterable
+from tkinter import ttk
+
+
+# Each app folder runs on its own with no shared package, so this file is
+# kept as an identical copy in "Smart Habit Tracker" and "Student Task & Grade
+# Manager". Change both copies together; the test in
+# "Student Task & Grade Manager/tests/test_virtual_text.py" checks they match.
+
+
+def window_bounds(first: int, total: int, size: int) -> tuple[int, int]:
+    # Records [first, last) drawn for a window of `size` asked to start at
+    # `first`, kept inside a model of `total` records.
+    first = min(first, max(total - 1, 0))
+    return first, min(total, first + size)
+
+
+def window_start(record: int, first: int, size: int, keep_first: bool) -> int:
+    # Where to start the window that shows `record`: keep the current start
+    # if asked and the record is not above it, otherwise draw a quarter
+    # window of context above the record.
+    if keep_first and first <= record:
+        return first
+    return max(0, record - size // 4)
+
+
+def needs_redraw(
+    first: int, last: int, total: int, size: int, changed: Iterable[int]
+) -> bool:
+    # Whether the drawn records [first, last) go stale when the records in
+    # `changed` change and the model now holds `total`: a changed record is
+    # drawn, the window has room for new records, or the model shrank under it.
+    if last > total:
+        return True
+    if last < total and last - first < size:
+        return True
+    return any(first <= index < last for index in changed)
+
+
+def record_for_fraction(fraction: float, total: int) -> int:
+    # Record the scrollbar thumb points at when dragged to `fraction`.
+    return max(0, min(int(fraction * total), total - 1))
+
+
+def record_at(starts: list[int], first: int, line: int) -> tuple[int, int]:
+    # Record drawn at a Text line and how many lines into it the line is,
+    # where starts[k] is the line record first + k begins on.
+    if not starts:
+        return 0, 0
+    k = max(bisect_right(starts, line) - 1, 0)
+    return first + k, line - starts[k]
+
+
+# Read-only Text pane that only draws the records near the visible area.
+# The model supplies how many records exist and the text for one record;
+# scrolling past either edge of the drawn window redraws a new window.
+class VirtualTextView:
+    def __init__(
+        self,
+        parent: tk.Misc,
+        count: Callable[[], int],
+        render: Callable[[int], str],
+        empty_text: str,
+        height: int = 12,
+        window_records: int = 60,
+    ) -> None:
+        self._count = count
+        self._render = render
+        self._empty_text = empty_text
+        self._window = window_records
+        # Records [first, last) are drawn; starts[k] is the Text line where
+        # record first + k begins.
+        self._first = 0
+        self._last = 0
+        self._starts: list[int] = []
+
+        self.frame = ttk.Frame(parent)
+        self.frame.columnconfigure(0, weight=1)
+        self.frame.rowconfigure(0, weight=1)
+        self.text = tk.Text(self.frame, height=height, wrap="word")
+        self.text.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ttk.Scrollbar(
+            self.frame, orient="vertical", command=self._on_scrollbar
+        )
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.text.configure(yscrollcommand=self._on_text_scrolled, state="disabled")
+
+    def grid(self, **options) -> None:
+        self.frame.grid(**options)
+
+    def refresh(self, changed: Iterable[int] | None = None) -> None:
+        # Redraw the window if any changed record is in it (None = always).
+        total = self._count()
+        if changed is not None and not needs_redraw(
+            self._first, self._last, total, self._window, changed
+        ):
+            self._update_scrollbar()
+            return
+        record, offset = self._top_position()
+        self._show(min(record, max(total - 1, 0)), offset, keep_first=True)
+
+    def _top_position(self) -> tuple[int, int]:
+        # Record at the top of the pane and how many lines into it we are.
+        if not self._starts:
+            return 0, 0
+        line = int(self.text.index("@0,0").split(".")[0])
+        return record_at(self._starts, self._first, line)
+
+    def _show(self, record: int, offset: int = 0, keep_first: bool = False) -> None:
+        # Draw a window around a record and scroll so it sits at the top.
+        first = window_start(record, self._first, self._window, keep_first)
+        self._draw(first)
+        if self._starts:
+            k = min(record - first, len(self._starts) - 1)
+            self.text.yview(f"{self._starts[k] + offset}.0")
+        self._update_scrollbar()
+
+    def _draw(self, first: int) -> None:
+        # Replace the Text content with records [first, first + window).
+        self._first, self._last = window_bounds(first, self._count(), self._window)
+        self._starts = []
+        blocks = []
+        line = 1
+        for index in range(self._first, self._last):
+            block = self._render(index)
+            self._starts.append(line)
+            blocks.append(block)
+            line += block.count("\n")
+
+        self.text.configure(state="normal")
+        self.text.delete("1.0", tk.END)
+        self.text.insert(tk.END, "".join(blocks) if blocks else self._empty_text)
+        self.text.configure(state="disabled")
+
+    def _on_text_scrolled(self, low: str, high: str) -> None:
+        # The Text scrolled itself (wheel, keys, drag); slide the window at edges.
+        total = self._count()
+        if float(high) >= 1.0 and self._last < total:
+            record, offset = self._top_position()
+            # Only slide when it moves the window forward, so a short window
+            # that already fits the pane cannot redraw forever.
+            if record - self._window // 4 > self._first:
+                self._show(record, offset)
+                return
+        if float(low) <= 0.0 and self._first > 0:
+            record, offset = self._top_position()
+            self._first = max(0, self._first - self._window // 2)
+            self._show(record, offset, keep_first=True)
+            return
+        self._update_scrollbar(float(low), float(high))
+
+    def _on_scrollbar(self, *args: str) -> None:
+        # Dragging jumps to a record; arrows and paging scroll the Text.
+        if args[0] == tk.MOVETO:
+            total = self._count()
+            if total:
+                self._show(record_for_fraction(float(args[1]), total))
+        else:
+            self.text.yview(*args)
+
+    def _update_scrollbar(
+        self, low: float | None = None, high: float | None = None
+    ) -> None:
+        # Place the thumb by record position across the whole model.
+        total = self._count()
+        if not total:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        if low is None or high is None:
+            low, high = self.text.yview()
+        drawn = self._last - self._first
+        self.scrollbar.set(
+            (self._first + low * drawn) / total, (self._first + high * drawn) / total
+        )